@@ -0,0 +1,187 @@
+"""Batched online backfills for data migrations.
+
+Rewriting a large table with a single UPDATE holds locks for the whole
+statement and produces one huge transaction. ``Backfill`` walks the primary
+key in ranges instead, commits after every chunk, sleeps between chunks so
+the service keeps its share of the database, and records progress so an
+interrupted migration resumes where it stopped.
+
+Usage inside a migration (``alembic/`` is on ``sys.path`` via env.py)::
+
+    from backfill import Backfill
+
+    def upgrade() -> None:
+        Backfill(
+            "books_description_default",
+            table="books",
+            work="UPDATE books SET description = '' "
+                 "WHERE id > :start AND id <= :end AND description IS NULL",
+            batch_size=5000,
+        ).run_in_migration()
+
+``work`` is either a SQL string with ``:start`` (exclusive) and ``:end``
+(inclusive) primary key bounds, or a callable ``work(connection, start, end)``
+that returns the number of rows it changed. Chunks may be replayed after a
+crash, so the work must be idempotent.
+"""
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger("alembic.backfill")
+
+PROGRESS_TABLE = "alembic_backfill_progress"
+
+_metadata = sa.MetaData()
+progress_table = sa.Table(
+    PROGRESS_TABLE,
+    _metadata,
+    sa.Column("name", sa.String(200), primary_key=True),
+    sa.Column("last_pk", sa.BigInteger, nullable=False),
+    sa.Column("rows_done", sa.BigInteger, nullable=False),
+    sa.Column("updated_at", sa.Float, nullable=False),
+)
+
+Work = Union[str, Callable[[Connection, int, int], int]]
+
+
+@dataclass
+class BackfillResult:
+    name: str
+    rows: int
+    chunks: int
+    elapsed: float
+    resumed_from: Optional[int]
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else float(self.rows)
+
+
+class Backfill:
+    def __init__(
+        self,
+        name: str,
+        table: str,
+        work: Work,
+        *,
+        pk: str = "id",
+        batch_size: int = 1000,
+        pause: float = 0.05,
+        report_every: float = 5.0,
+    ):
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        self.name = name
+        self.table = sa.table(table, sa.column(pk))
+        self.pk = self.table.c[pk]
+        self.work = sa.text(work) if isinstance(work, str) else work
+        self.batch_size = batch_size
+        self.pause = pause
+        self.report_every = report_every
+
+    def run_in_migration(self) -> BackfillResult:
+        """Run on the migration's connection, outside its DDL transaction"""
+        from alembic import op
+
+        migration_context = op.get_context()
+        if migration_context.as_sql:
+            raise RuntimeError(f"Backfill {self.name!r} needs a live database and cannot run in --sql mode")
+        with migration_context.autocommit_block():
+            return self.run(op.get_bind())
+
+    def run(self, connection: Connection) -> BackfillResult:
+        """Process every chunk after the recorded checkpoint, committing each one"""
+        # In AUTOCOMMIT mode (alembic's autocommit_block) every statement
+        # commits on its own; otherwise commit explicitly after each chunk.
+        autocommit = connection.get_execution_options().get("isolation_level") == "AUTOCOMMIT"
+        commit = (lambda: None) if autocommit else connection.commit
+
+        progress_table.create(connection, checkfirst=True)
+        commit()
+
+        checkpoint = self._load_checkpoint(connection)
+        if checkpoint is None:
+            resumed_from = None
+            last_pk, rows = self._initial_pk(connection), 0
+        else:
+            resumed_from, rows = checkpoint
+            last_pk = resumed_from
+            logger.info("%s: resuming after %s=%s (%d rows already done)", self.name, self.pk.name, last_pk, rows)
+
+        started = last_report = time.perf_counter()
+        rows_this_run = chunks = 0
+        while last_pk is not None:
+            end = self._chunk_end(connection, last_pk)
+            if end is None:
+                break
+
+            changed = self._run_chunk(connection, last_pk, end)
+            rows += changed
+            rows_this_run += changed
+            chunks += 1
+            last_pk = end
+            self._save_checkpoint(connection, last_pk, rows)
+            commit()
+
+            now = time.perf_counter()
+            if now - last_report >= self.report_every:
+                last_report = now
+                logger.info(
+                    "%s: %d rows through %s=%s, %.0f rows/s",
+                    self.name, rows, self.pk.name, last_pk, rows_this_run / (now - started),
+                )
+            if self.pause:
+                time.sleep(self.pause)
+
+        self._clear_checkpoint(connection)
+        commit()
+
+        result = BackfillResult(self.name, rows_this_run, chunks, time.perf_counter() - started, resumed_from)
+        logger.info(
+            "%s: done, %d rows in %d chunks, %.1fs (%.0f rows/s)",
+            self.name, result.rows, result.chunks, result.elapsed, result.rows_per_second,
+        )
+        return result
+
+    def _initial_pk(self, connection: Connection) -> Optional[int]:
+        first = connection.execute(sa.select(sa.func.min(self.pk))).scalar()
+        return None if first is None else first - 1
+
+    def _chunk_end(self, connection: Connection, start: int) -> Optional[int]:
+        """Primary key that closes the chunk after ``start``, None when the table is exhausted"""
+        window = (
+            sa.select(self.pk)
+            .where(self.pk > start)
+            .order_by(self.pk)
+            .limit(self.batch_size)
+            .subquery()
+        )
+        return connection.execute(sa.select(sa.func.max(window.c[self.pk.name]))).scalar()
+
+    def _run_chunk(self, connection: Connection, start: int, end: int) -> int:
+        if callable(self.work):
+            return self.work(connection, start, end) or 0
+        return connection.execute(self.work, {"start": start, "end": end}).rowcount
+
+    def _load_checkpoint(self, connection: Connection):
+        row = connection.execute(
+            sa.select(progress_table.c.last_pk, progress_table.c.rows_done)
+            .where(progress_table.c.name == self.name)
+        ).first()
+        return None if row is None else (row.last_pk, row.rows_done)
+
+    def _save_checkpoint(self, connection: Connection, last_pk: int, rows: int) -> None:
+        values = {"last_pk": last_pk, "rows_done": rows, "updated_at": time.time()}
+        updated = connection.execute(
+            progress_table.update().where(progress_table.c.name == self.name).values(**values)
+        ).rowcount
+        if not updated:
+            connection.execute(progress_table.insert().values(name=self.name, **values))
+
+    def _clear_checkpoint(self, connection: Connection) -> None:
+        connection.execute(progress_table.delete().where(progress_table.c.name == self.name))
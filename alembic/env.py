@@ -4,6 +4,8 @@ import os
 
 # Add the workspace directory to Python path so we can import from app
 sys.path.insert(0, os.path.abspath('.'))
+# Make migration helpers in this directory (e.g. backfill.py) importable
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
@@ -0,0 +1,35 @@
+"""Add lower(name) and lower(email) indexes for reader search
+
+Revision ID: 5e9a1d3c7b20
+Revises: 8c4f2b7d1e63
+Create Date: 2026-10-19 11:03:27.904615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9a1d3c7b20'
+down_revision: Union[str, None] = '8c4f2b7d1e63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    'ix_readers_name_lower': 'name',
+    'ix_readers_email_lower': 'email',
+}
+
+
+def upgrade() -> None:
+    # text_pattern_ops on PostgreSQL, so LIKE 'prefix%' can use the index
+    opclass = ' text_pattern_ops' if op.get_bind().dialect.name == 'postgresql' else ''
+    for name, column in INDEXES.items():
+        op.create_index(name, 'readers', [sa.text(f'lower({column}){opclass}')])
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name='readers')
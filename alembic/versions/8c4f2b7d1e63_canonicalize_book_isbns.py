@@ -0,0 +1,68 @@
+"""Canonicalize book ISBNs to bare ISBN-13
+
+Revision ID: 8c4f2b7d1e63
+Revises: 3a700a9f753a
+Create Date: 2026-10-19 10:12:40.518203
+
+"""
+import logging
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+
+from app.isbn import to_isbn13
+from backfill import Backfill
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4f2b7d1e63'
+down_revision: Union[str, None] = '3a700a9f753a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+books = sa.table('books', sa.column('id'), sa.column('isbn'))
+
+
+def canonicalize_chunk(connection: Connection, start: int, end: int) -> int:
+    """Rewrite the ISBNs of books in (start, end]; invalid ones and collisions are logged and kept"""
+    rows = connection.execute(
+        sa.select(books.c.id, books.c.isbn)
+        .where(books.c.id > start, books.c.id <= end, books.c.isbn.is_not(None))
+    ).all()
+    changes = {}
+    for book_id, isbn in rows:
+        try:
+            canonical = to_isbn13(isbn)
+        except ValueError as exc:
+            logger.warning("books.id=%s: keeping invalid ISBN %r (%s)", book_id, isbn, exc)
+            continue
+        if canonical != isbn:
+            changes[book_id] = canonical
+    if not changes:
+        return 0
+
+    # The unique constraint on books.isbn: two spellings of one ISBN keep the first
+    taken = set(connection.execute(
+        sa.select(books.c.isbn).where(books.c.isbn.in_(set(changes.values())))
+    ).scalars())
+    changed = 0
+    for book_id, canonical in changes.items():
+        if canonical in taken:
+            logger.warning("books.id=%s: ISBN %s already belongs to another book, not rewritten", book_id, canonical)
+            continue
+        connection.execute(books.update().where(books.c.id == book_id).values(isbn=canonical))
+        taken.add(canonical)
+        changed += 1
+    return changed
+
+
+def upgrade() -> None:
+    Backfill("books_isbn_isbn13", table="books", work=canonicalize_chunk).run_in_migration()
+
+
+def downgrade() -> None:
+    # Canonical ISBNs are valid input for the previous revision; the original spelling is not kept
+    pass
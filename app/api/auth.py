@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from typing import Annotated
 
 from .. import models, schemas
-from ..database import get_db
+from ..database import get_db, is_unique_violation
 from ..auth.jwt_handler import (
     get_password_hash, 
     authenticate_user, 
@@ -28,17 +29,6 @@ def register_user(
     - **email**: валидный email адрес
     - **password**: минимум 8 символов, должен содержать буквы и цифры
     """
-    # Проверка существующего пользователя
-    existing_user = db.query(models.User).filter(
-        models.User.email == user.email
-    ).first()
-    
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
     # Создание нового пользователя
     hashed_password = get_password_hash(user.password)
     db_user = models.User(
@@ -46,11 +36,25 @@ def register_user(
         hashed_password=hashed_password
     )
     
+    # Дубликат определяет уникальный индекс на email: проверка перед вставкой
+    # была бы лишним запросом и не спасала от параллельной регистрации
     db.add(db_user)
+    try:
+        db.flush()
+    except IntegrityError as exc:
+        db.rollback()
+        if not is_unique_violation(exc):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+    
+    # id получен из INSERT; сериализуем до commit, который сбрасывает атрибуты
+    created = schemas.User.model_validate(db_user)
     db.commit()
-    db.refresh(db_user)
     
-    return db_user
+    return created
 
 
 @router.post("/login", response_model=schemas.Token)
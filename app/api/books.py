@@ -1,17 +1,60 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List
 from .. import models, schemas
-from ..database import get_db
+from ..database import get_db, is_unique_violation
 from ..auth.jwt_handler import get_current_active_user
+from ..isbn import to_isbn13
+from ..responses import trusted_rows
+from ..middleware.cache import BOOKS_LIST_KEY, book_key, response_cache
 
 router = APIRouter()
 
+# Columns of schemas.Book - list pages fetch plain rows instead of ORM instances
+BOOK_COLUMNS = tuple(getattr(models.Book, name) for name in schemas.Book.model_fields)
+
 @router.get("/", response_model=List[schemas.Book])
 def get_books(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """Get all books - can be public or protected based on requirements"""
-    books = db.query(models.Book).offset(skip).limit(limit).all()
-    return books
+    books = db.execute(
+        select(*BOOK_COLUMNS).order_by(models.Book.id).offset(skip).limit(limit)
+    ).mappings()
+    return trusted_rows(schemas.Book, books)
+
+@router.get("/isbn/{isbn}", response_model=schemas.Book)
+def get_book_by_isbn(isbn: str, db: Session = Depends(get_db)):
+    """Get a book by ISBN-10 or ISBN-13, with or without hyphens"""
+    try:
+        isbn = to_isbn13(isbn)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    book = db.execute(select(*BOOK_COLUMNS).where(models.Book.isbn == isbn)).mappings().first()
+    if book is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return dict(book)
+
+@router.post("/isbn:lookup", response_model=schemas.IsbnLookupResponse)
+def lookup_books_by_isbn(lookup: schemas.IsbnLookup, db: Session = Depends(get_db)):
+    """Resolve a batch of scanned ISBNs in one query; results follow the request order"""
+    canonical = {}
+    for isbn in lookup.isbns:
+        try:
+            canonical[isbn] = to_isbn13(isbn)
+        except ValueError:
+            canonical[isbn] = None
+    wanted = {value for value in canonical.values() if value is not None}
+    books = {}
+    if wanted:
+        rows = db.execute(select(*BOOK_COLUMNS).where(models.Book.isbn.in_(wanted))).mappings()
+        books = {row["isbn"]: dict(row) for row in rows}
+    return {
+        "results": [
+            {"isbn": isbn, "canonical": canonical[isbn], "book": books.get(canonical[isbn])}
+            for isbn in lookup.isbns
+        ]
+    }
 
 @router.get("/{book_id}", response_model=schemas.Book)
 def get_book(book_id: int, db: Session = Depends(get_db)):
@@ -24,17 +67,21 @@ def get_book(book_id: int, db: Session = Depends(get_db)):
 @router.post("/", response_model=schemas.Book, dependencies=[Depends(get_current_active_user)])
 def create_book(book: schemas.BookCreate, db: Session = Depends(get_db)):
     """Create a new book - requires authentication"""
-    # Check if ISBN already exists (if provided)
-    if book.isbn:
-        existing_book = db.query(models.Book).filter(models.Book.isbn == book.isbn).first()
-        if existing_book:
-            raise HTTPException(status_code=400, detail="Book with this ISBN already exists")
-    
     db_book = models.Book(**book.model_dump())
     db.add(db_book)
+    # The unique ISBN constraint decides duplicates: no check-then-insert race
+    try:
+        db.flush()
+    except IntegrityError as exc:
+        db.rollback()
+        if not is_unique_violation(exc):
+            raise
+        raise HTTPException(status_code=400, detail="Book with this ISBN already exists")
+    # The INSERT returned the id; serialize before commit expires the instance
+    created = schemas.Book.model_validate(db_book)
     db.commit()
-    db.refresh(db_book)
-    return db_book
+    response_cache.purge(BOOKS_LIST_KEY)
+    return created
 
 @router.put("/{book_id}", response_model=schemas.Book, dependencies=[Depends(get_current_active_user)])
 def update_book(book_id: int, book_update: schemas.BookUpdate, db: Session = Depends(get_db)):
@@ -53,6 +100,7 @@ def update_book(book_id: int, book_update: schemas.BookUpdate, db: Session = Dep
         setattr(db_book, field, value)
     
     db.commit()
+    response_cache.purge(book_key(book_id), BOOKS_LIST_KEY)
     db.refresh(db_book)
     return db_book
 
@@ -77,4 +125,5 @@ def delete_book(book_id: int, db: Session = Depends(get_db)):
     
     db.delete(book)
     db.commit()
+    response_cache.purge(book_key(book_id), BOOKS_LIST_KEY)
     return {"message": "Book deleted successfully"}
\ No newline at end of file
@@ -1,27 +1,48 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime
 from .. import models, schemas
 from ..database import get_db
 from ..auth.jwt_handler import get_current_active_user
+from ..middleware.cache import BOOKS_LIST_KEY, book_key, response_cache
+from ..monitoring.metrics import record_borrow, record_return
+from ..responses import trusted_rows
 
 router = APIRouter()
 
+# Columns of schemas.Borrow - list endpoints fetch plain rows instead of ORM instances
+BORROW_COLUMNS = tuple(getattr(models.Borrow, name) for name in schemas.Borrow.model_fields)
+
 @router.post("/borrow", dependencies=[Depends(get_current_active_user)])
 def borrow_book(borrow_data: schemas.BorrowCreate, db: Session = Depends(get_db)):
     """Borrow a book - requires authentication and implements business rules"""
-    # Check if book exists and has available copies
-    book = db.query(models.Book).filter(models.Book.id == borrow_data.book_id).first()
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
-    
-    if book.copies <= 0:
+    # Lock the reader row so concurrent borrows by one reader are checked
+    # against each other's loans (FOR UPDATE is skipped on SQLite, where the
+    # write below serializes the rest of the transaction instead)
+    reader = db.execute(
+        select(models.Reader.id).where(models.Reader.id == borrow_data.reader_id).with_for_update()
+    ).first()
+
+    # Take a copy atomically: a read-then-decrement could hand the last copy out twice
+    taken = db.execute(
+        update(models.Book)
+        .where(models.Book.id == borrow_data.book_id, models.Book.copies > 0)
+        .values(copies=models.Book.copies - 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not taken:
+        book_exists = db.execute(
+            select(models.Book.id).where(models.Book.id == borrow_data.book_id)
+        ).first()
+        db.rollback()
+        if not book_exists:
+            raise HTTPException(status_code=404, detail="Book not found")
         raise HTTPException(status_code=400, detail="No available copies of this book")
-    
-    # Check if reader exists
-    reader = db.query(models.Reader).filter(models.Reader.id == borrow_data.reader_id).first()
+
     if not reader:
+        db.rollback()
         raise HTTPException(status_code=404, detail="Reader not found")
     
     # Check if reader already has 3 books borrowed
@@ -31,19 +52,21 @@ def borrow_book(borrow_data: schemas.BorrowCreate, db: Session = Depends(get_db)
     ).count()
     
     if active_borrows_count >= 3:
+        db.rollback()
         raise HTTPException(
             status_code=400, 
             detail="Reader cannot borrow more than 3 books simultaneously"
         )
     
     # Check if this specific book is already borrowed by this reader
-    existing_borrow = db.query(models.Borrow).filter(
+    existing_borrow = db.query(models.Borrow.id).filter(
         models.Borrow.book_id == borrow_data.book_id,
         models.Borrow.reader_id == borrow_data.reader_id,
         models.Borrow.is_returned == False
     ).first()
     
     if existing_borrow:
+        db.rollback()
         raise HTTPException(
             status_code=400,
             detail="This book is already borrowed by this reader"
@@ -55,42 +78,51 @@ def borrow_book(borrow_data: schemas.BorrowCreate, db: Session = Depends(get_db)
         reader_id=borrow_data.reader_id
     )
     db.add(db_borrow)
-    
-    # Decrease book copies
-    book.copies -= 1
+    db.flush()
+    borrow_id = db_borrow.id
     
     db.commit()
-    db.refresh(db_borrow)
+    # Available copies changed
+    response_cache.purge(book_key(borrow_data.book_id), BOOKS_LIST_KEY)
+    record_borrow()
     
-    return {"message": "Book borrowed successfully", "borrow_id": db_borrow.id}
+    return {"message": "Book borrowed successfully", "borrow_id": borrow_id}
 
 
 @router.post("/return", dependencies=[Depends(get_current_active_user)])
 def return_book(return_data: schemas.BorrowReturn, db: Session = Depends(get_db)):
     """Return a book - requires authentication and implements business rules"""
-    # Find the borrow record
-    borrow_record = db.query(models.Borrow).filter(
-        models.Borrow.book_id == return_data.book_id,
-        models.Borrow.reader_id == return_data.reader_id,
-        models.Borrow.is_returned == False
-    ).first()
+    # Close the loan only if it is still open, so a concurrent second return
+    # of the same loan matches no row instead of adding a copy twice
+    returned = db.execute(
+        update(models.Borrow)
+        .where(
+            models.Borrow.book_id == return_data.book_id,
+            models.Borrow.reader_id == return_data.reader_id,
+            models.Borrow.is_returned == False
+        )
+        .values(return_date=datetime.utcnow(), is_returned=True)
+        .execution_options(synchronize_session=False)
+    ).rowcount
     
-    if not borrow_record:
+    if not returned:
+        db.rollback()
         raise HTTPException(
             status_code=400,
             detail="This book was not borrowed by this reader or already returned"
         )
     
-    # Update the borrow record
-    borrow_record.return_date = datetime.utcnow()
-    borrow_record.is_returned = True
-    
     # Increase book copies
-    book = db.query(models.Book).filter(models.Book.id == return_data.book_id).first()
-    if book:
-        book.copies += 1
+    db.execute(
+        update(models.Book)
+        .where(models.Book.id == return_data.book_id)
+        .values(copies=models.Book.copies + 1)
+        .execution_options(synchronize_session=False)
+    )
     
     db.commit()
+    response_cache.purge(book_key(return_data.book_id), BOOKS_LIST_KEY)
+    record_return()
     
     return {"message": "Book returned successfully"}
 
@@ -102,16 +134,18 @@ def get_reader_borrowed_books(reader_id: int, db: Session = Depends(get_db)):
     if not reader:
         raise HTTPException(status_code=404, detail="Reader not found")
     
-    borrowed_books = db.query(models.Borrow).filter(
-        models.Borrow.reader_id == reader_id,
-        models.Borrow.is_returned == False
-    ).all()
+    borrowed_books = db.execute(
+        select(*BORROW_COLUMNS).where(
+            models.Borrow.reader_id == reader_id,
+            models.Borrow.is_returned == False
+        )
+    ).mappings()
     
-    return borrowed_books
+    return trusted_rows(schemas.Borrow, borrowed_books)
 
 
 @router.get("/", response_model=List[schemas.Borrow])
 def get_all_borrows(db: Session = Depends(get_db)):
     """Get all borrow records - requires authentication"""
-    borrows = db.query(models.Borrow).all()
-    return borrows
\ No newline at end of file
+    borrows = db.execute(select(*BORROW_COLUMNS)).mappings()
+    return trusted_rows(schemas.Borrow, borrows)
\ No newline at end of file
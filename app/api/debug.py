@@ -0,0 +1,52 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+from ..auth.jwt_handler import get_current_active_user
+from ..monitoring import sql
+from ..monitoring.profiling import profile_store
+
+router = APIRouter(dependencies=[Depends(get_current_active_user)])
+
+
+class SQLInstrumentationState(BaseModel):
+    enabled: bool
+
+
+class ProfileInfo(BaseModel):
+    id: str
+    created: float
+    method: str
+    path: str
+    size: int
+
+
+@router.get("/sql-instrumentation", response_model=SQLInstrumentationState)
+def get_sql_instrumentation():
+    """Report whether per-request SQL instrumentation is on - requires authentication"""
+    return SQLInstrumentationState(enabled=sql.is_enabled())
+
+
+@router.put("/sql-instrumentation", response_model=SQLInstrumentationState)
+def set_sql_instrumentation(state: SQLInstrumentationState):
+    """Turn per-request SQL instrumentation on or off at runtime - requires authentication"""
+    if state.enabled:
+        sql.enable()
+    else:
+        sql.disable()
+    return SQLInstrumentationState(enabled=sql.is_enabled())
+
+
+@router.get("/profiles", response_model=List[ProfileInfo])
+def list_profiles():
+    """Stored request profiles, newest first - requires authentication"""
+    return profile_store.list()
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+def get_profile(profile_id: str):
+    """Folded stacks of a profile, ready for flamegraph.pl or speedscope - requires authentication"""
+    folded = profile_store.read(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(folded)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from ..monitoring.health import readiness
+from ..responses import FastJSONResponse
+
+router = APIRouter()
+
+
+@router.get("/healthz")
+async def liveness():
+    """Liveness probe - the process is up and serving; performs no I/O"""
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readiness_probe():
+    """Readiness probe - database reachable (cached SELECT 1) and not draining"""
+    status = await readiness.status()
+    return FastJSONResponse(status, status_code=200 if status["status"] == "ready" else 503)
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+from ..monitoring.metrics import CONTENT_TYPE, registry
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus text exposition of request, pool and business metrics"""
+    # async so threadpool gauges are sampled on the event loop without using a worker thread
+    return Response(registry.render(), media_type=CONTENT_TYPE)
@@ -1,17 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import string
+import sys
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 from typing import List
 from .. import models, schemas
-from ..database import get_db
+from ..database import get_db, is_unique_violation
 from ..auth.jwt_handler import get_current_active_user
+from ..config import READER_IMPORT_CHUNK_SIZE
+from ..reader_import import CSV_TYPES, NDJSON_TYPES, ImportFormatError, ReaderImport, read_records
+from ..responses import trusted_rows
 
 router = APIRouter()
 
+# Columns of schemas.Reader - list pages fetch plain rows instead of ORM instances
+READER_COLUMNS = tuple(getattr(models.Reader, name) for name in schemas.Reader.model_fields)
+
 @router.get("/", response_model=List[schemas.Reader])
 def get_readers(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """Get all readers - requires authentication"""
-    readers = db.query(models.Reader).offset(skip).limit(limit).all()
-    return readers
+    readers = db.execute(
+        select(*READER_COLUMNS).order_by(models.Reader.id).offset(skip).limit(limit)
+    ).mappings()
+    return trusted_rows(schemas.Reader, readers)
+
+# SQLite's lower() only folds ASCII letters
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+def prefix_match(column, prefix: str, dialect: str):
+    """Case-insensitive prefix filter that the lower() indexes on readers can serve"""
+    lowered = func.lower(column)
+    if dialect == "postgresql":
+        # A constant 'prefix%' pattern is served by the text_pattern_ops indexes
+        prefix = prefix.lower()
+        pattern = prefix.replace("/", "//").replace("%", "/%").replace("_", "/_") + "%"
+        return lowered.like(pattern, escape="/")
+    # Binary collation: a range scan over the expression index, up to the
+    # first string past the prefix (none if it is all U+10FFFF)
+    prefix = prefix.translate(_ASCII_LOWER)
+    stem = prefix.rstrip(chr(sys.maxunicode))
+    if not stem:
+        return lowered >= prefix
+    return and_(lowered >= prefix, lowered < stem[:-1] + chr(ord(stem[-1]) + 1))
+
+@router.get("/search", response_model=List[schemas.Reader], dependencies=[Depends(get_current_active_user)])
+def search_readers(
+    q: str = Query(..., min_length=2, max_length=254),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Find readers whose name or email starts with q (case-insensitive) - requires authentication"""
+    prefix = q.strip()
+    if len(prefix) < 2:
+        raise HTTPException(status_code=422, detail="Search query must be at least 2 characters")
+    dialect = db.get_bind().dialect.name
+    readers = db.execute(
+        select(*READER_COLUMNS)
+        .where(or_(prefix_match(models.Reader.name, prefix, dialect), prefix_match(models.Reader.email, prefix, dialect)))
+        .order_by(func.lower(models.Reader.name), models.Reader.id)
+        .offset(skip)
+        .limit(limit)
+    ).mappings()
+    return trusted_rows(schemas.Reader, readers)
 
 @router.get("/{reader_id}", response_model=schemas.Reader)
 def get_reader(reader_id: int, db: Session = Depends(get_db)):
@@ -21,19 +74,58 @@ def get_reader(reader_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Reader not found")
     return reader
 
+@router.get("/{reader_id}/profile", response_model=schemas.ReaderProfile)
+def get_reader_profile(reader_id: int, db: Session = Depends(get_db)):
+    """Reader card: the reader, their open loans and the borrowed books, in two queries"""
+    open_loans = models.Reader.borrows.and_(models.Borrow.is_returned == False)
+    reader = db.execute(
+        select(models.Reader)
+        .where(models.Reader.id == reader_id)
+        .options(selectinload(open_loans).joinedload(models.Borrow.book, innerjoin=True))
+    ).scalar_one_or_none()
+    if reader is None:
+        raise HTTPException(status_code=404, detail="Reader not found")
+    loans = sorted(reader.borrows, key=lambda borrow: (borrow.borrow_date, borrow.id))
+    return {"id": reader.id, "name": reader.name, "email": reader.email, "loans": loans}
+
 @router.post("/", response_model=schemas.Reader, dependencies=[Depends(get_current_active_user)])
 def create_reader(reader: schemas.ReaderCreate, db: Session = Depends(get_db)):
     """Create a new reader - requires authentication"""
-    # Check if email already exists
-    existing_reader = db.query(models.Reader).filter(models.Reader.email == reader.email).first()
-    if existing_reader:
-        raise HTTPException(status_code=400, detail="Reader with this email already exists")
-    
     db_reader = models.Reader(**reader.model_dump())
     db.add(db_reader)
+    # The unique email constraint decides duplicates: no check-then-insert race
+    try:
+        db.flush()
+    except IntegrityError as exc:
+        db.rollback()
+        if not is_unique_violation(exc):
+            raise
+        raise HTTPException(status_code=400, detail="Reader with this email already exists")
+    # The INSERT returned the id; serialize before commit expires the instance
+    created = schemas.Reader.model_validate(db_reader)
     db.commit()
-    db.refresh(db_reader)
-    return db_reader
+    return created
+
+@router.post("/bulk", response_model=schemas.ReaderImportResult, dependencies=[Depends(get_current_active_user)])
+async def import_readers(request: Request, mode: schemas.ImportMode = "skip", db: Session = Depends(get_db)):
+    """Import readers from NDJSON or CSV, upserting on email - requires authentication"""
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type not in NDJSON_TYPES + CSV_TYPES:
+        raise HTTPException(status_code=415, detail="Send application/x-ndjson or text/csv")
+
+    try:
+        importer = ReaderImport(db, mode)
+        chunk = []
+        async for record in read_records(request.stream(), media_type):
+            chunk.append(record)
+            if len(chunk) >= READER_IMPORT_CHUNK_SIZE:
+                # Validation and the upsert run off the event loop
+                await run_in_threadpool(importer.process, chunk)
+                chunk = []
+        await run_in_threadpool(importer.process, chunk)
+    except ImportFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return importer.result()
 
 @router.put("/{reader_id}", response_model=schemas.Reader, dependencies=[Depends(get_current_active_user)])
 def update_reader(reader_id: int, reader_update: schemas.ReaderUpdate, db: Session = Depends(get_db)):
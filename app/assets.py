@@ -0,0 +1,139 @@
+"""
+In-memory serving of the dashboard and static assets.
+
+Every file under the assets directory is read once at startup together with
+its gzip and brotli variants (compressed at the highest level, since this
+happens only once) and a strong ETag per variant. Requests are then answered
+from memory, with ``304 Not Modified`` for matching ``If-None-Match``
+headers. An app started without its lifespan (mounted in another app, or a
+``TestClient`` used outside a ``with`` block) loads them on the first
+request instead. With ``ASSETS_RELOAD`` enabled, a file is re-read whenever its
+modification time changes, which is meant for development only.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import stat
+from typing import Dict, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .config import ASSETS_DIRECTORY, ASSETS_MAX_AGE, ASSETS_RELOAD
+from .middleware.compression import brotli, choose_encoding, is_compressible
+
+
+class Asset:
+    __slots__ = ("path", "mtime", "media_type", "variants", "etags")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mtime = os.stat(path).st_mtime_ns
+        with open(path, "rb") as file:
+            body = file.read()
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if media_type.startswith("text/") or media_type == "application/javascript":
+            media_type += "; charset=utf-8"
+        self.media_type = media_type
+
+        # coding -> body; None is the identity encoding
+        self.variants: Dict[Optional[str], bytes] = {None: body}
+        if is_compressible(media_type):
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(compressed) < len(body):
+                self.variants["gzip"] = compressed
+            if brotli is not None:
+                compressed = brotli.compress(body, quality=11, mode=brotli.MODE_TEXT)
+                if len(compressed) < len(body):
+                    self.variants["br"] = compressed
+
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        # Strong validators must differ between encodings of the same file
+        self.etags = {
+            coding: f'"{digest}-{coding}"' if coding else f'"{digest}"'
+            for coding in self.variants
+        }
+
+    def select(self, accept_encoding: str) -> Optional[str]:
+        precompressed = [coding for coding in self.variants if coding]
+        if not precompressed:
+            return None
+        return choose_encoding(accept_encoding, precompressed)
+
+    def matches(self, if_none_match: str) -> bool:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or not tags.isdisjoint(self.etags.values())
+
+
+class AssetStore:
+    def __init__(self, directory: str, reload: bool = False):
+        self.directory = os.path.abspath(directory)
+        self.reload = reload
+        self.assets: Dict[str, Asset] = {}
+        self.loaded = False
+
+    def load(self) -> None:
+        assets = {}
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, self.directory).replace(os.sep, "/")
+                assets[name] = Asset(path)
+        self.assets = assets
+        self.loaded = True
+
+    def get(self, name: str) -> Optional[Asset]:
+        if not self.loaded:
+            self.load()
+        asset = self.assets.get(name)
+        if not self.reload:
+            return asset
+        return self._refresh(name, asset)
+
+    def _refresh(self, name: str, asset: Optional[Asset]) -> Optional[Asset]:
+        path = os.path.abspath(os.path.join(self.directory, name))
+        if not path.startswith(self.directory + os.sep):
+            return None
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            stat_result = None
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            # Gone, or a directory such as /static/js
+            self.assets.pop(name, None)
+            return None
+        mtime = stat_result.st_mtime_ns
+        if asset is None or asset.mtime != mtime:
+            asset = self.assets[name] = Asset(path)
+        return asset
+
+    def response(self, request: Request, name: str, cache_control: str) -> Response:
+        asset = self.get(name)
+        if asset is None:
+            return Response(status_code=404)
+
+        coding = asset.select(request.headers.get("accept-encoding", ""))
+        headers = {
+            "ETag": asset.etags[coding],
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if asset.matches(request.headers.get("if-none-match", "")):
+            return Response(status_code=304, headers=headers)
+
+        if coding:
+            headers["Content-Encoding"] = coding
+        body = asset.variants[coding]
+        if request.method == "HEAD":
+            headers["Content-Length"] = str(len(body))
+            body = b""
+        return Response(body, headers=headers, media_type=asset.media_type)
+
+
+assets = AssetStore(ASSETS_DIRECTORY, reload=ASSETS_RELOAD)
+
+# The dashboard URL is fixed, so browsers revalidate it on every load (a 304
+# when unchanged). Other assets may be cached for ASSETS_MAX_AGE.
+DASHBOARD_CACHE_CONTROL = "no-cache"
+STATIC_CACHE_CONTROL = f"public, max-age={ASSETS_MAX_AGE}"
@@ -1,5 +1,7 @@
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
@@ -7,14 +9,30 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from .. import models, schemas
 from ..database import get_db
-from ..config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from ..monitoring.access_log import add_timing
+from ..config import (
+    SECRET_KEY,
+    ALGORITHM,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    BCRYPT_ROUNDS,
+    PRINCIPAL_CACHE_TTL_SECONDS,
+    PRINCIPAL_CACHE_MAX_ENTRIES,
+)
 
 # Password hashing context with explicit bcrypt backend
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__ident="2b", bcrypt__rounds=12)
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__ident="2b", bcrypt__rounds=BCRYPT_ROUNDS)
 
 # Security scheme for API documentation
 security = HTTPBearer()
 
+# Verified tokens -> (cache expiry, user snapshot). A hit skips both the JWT
+# signature check and the users query, so get_current_user needs no database
+# connection. Entries live for PRINCIPAL_CACHE_TTL_SECONDS, never past the
+# token's own expiry.
+_principal_cache: Dict[str, Tuple[float, models.User]] = {}
+# get_current_user runs in threadpool threads; eviction iterates the dict
+_principal_cache_lock = threading.Lock()
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     # Bcrypt has a maximum password length of 72 bytes
     # Truncate if necessary to avoid ValueError
@@ -47,17 +65,65 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def _snapshot_user(user: models.User) -> models.User:
+    # Detached copy that is safe to share between requests and sessions
+    return models.User(
+        id=user.id,
+        email=user.email,
+        hashed_password=user.hashed_password,
+        is_active=user.is_active,
+    )
+
+def _cached_principal(token: str) -> Optional[models.User]:
+    with _principal_cache_lock:
+        entry = _principal_cache.get(token)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at <= time.time():
+            _principal_cache.pop(token, None)
+            return None
+        return user
+
+def _cache_principal(token: str, user: models.User, token_expires_at: Optional[float]) -> None:
+    if PRINCIPAL_CACHE_TTL_SECONDS <= 0:
+        return
+    expires_at = time.time() + PRINCIPAL_CACHE_TTL_SECONDS
+    if token_expires_at is not None:
+        expires_at = min(expires_at, token_expires_at)
+    with _principal_cache_lock:
+        if len(_principal_cache) >= PRINCIPAL_CACHE_MAX_ENTRIES:
+            # Drop the oldest entry (dicts keep insertion order)
+            _principal_cache.pop(next(iter(_principal_cache)), None)
+        _principal_cache[token] = (expires_at, user)
+
+def clear_principal_cache() -> None:
+    with _principal_cache_lock:
+        _principal_cache.clear()
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> models.User:
+    started = time.perf_counter()
+    try:
+        return _authenticate(credentials.credentials, db)
+    finally:
+        # Reported as auth_ms in the access log
+        add_timing("auth", time.perf_counter() - started)
+
+def _authenticate(token: str, db: Session) -> models.User:
+    cached_user = _cached_principal(token)
+    if cached_user is not None:
+        return cached_user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
@@ -67,6 +133,8 @@ def get_current_user(
     user = db.query(models.User).filter(models.User.email == email).first()
     if user is None:
         raise credentials_exception
+    user = _snapshot_user(user)
+    _cache_principal(token, user, payload.get("exp"))
     return user
 
 def get_current_active_user(current_user: models.User = Depends(get_current_user)) -> models.User:
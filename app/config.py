@@ -9,4 +9,88 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./library.db")
 # JWT configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
\ No newline at end of file
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+# bcrypt cost factor for new hashes; the test suite lowers it to the minimum (4)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# How long a verified token -> user mapping is reused without a DB lookup (0 disables)
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+
+# SQL instrumentation (per-request statement count, DB time, N+1 detection)
+SQL_INSTRUMENTATION_ENABLED = os.getenv("SQL_INSTRUMENTATION_ENABLED", "false").lower() in ("1", "true", "yes")
+SQL_LOG_THRESHOLD_MS = float(os.getenv("SQL_LOG_THRESHOLD_MS", "100"))
+SQL_LOG_THRESHOLD_QUERIES = int(os.getenv("SQL_LOG_THRESHOLD_QUERIES", "20"))
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+
+# Structured JSON access log (slow, 4xx/5xx and failed requests are always logged)
+ACCESS_LOG_ENABLED = os.getenv("ACCESS_LOG_ENABLED", "true").lower() in ("1", "true", "yes")
+ACCESS_LOG_SAMPLE_PERCENT = float(os.getenv("ACCESS_LOG_SAMPLE_PERCENT", "100"))
+ACCESS_LOG_SLOW_MS = float(os.getenv("ACCESS_LOG_SLOW_MS", "500"))
+
+# Request profiling (?__profile=1 or X-Profile: 1 for active users, plus random sampling)
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+PROFILING_SAMPLE_PERCENT = float(os.getenv("PROFILING_SAMPLE_PERCENT", "0"))
+PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+PROFILING_DIRECTORY = os.getenv("PROFILING_DIRECTORY", "profiles")
+PROFILING_MAX_FILES = int(os.getenv("PROFILING_MAX_FILES", "100"))
+
+# Response compression (gzip, and brotli when the "brotli" package is installed)
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+# Shared caching of public GET endpoints (CDN via Cache-Control/Surrogate-Key, plus an in-process store)
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+RESPONSE_CACHE_BROWSER_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_BROWSER_TTL_SECONDS", "5"))
+# s-maxage; nothing purges the CDN automatically, so keep it short
+RESPONSE_CACHE_CDN_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_CDN_TTL_SECONDS", "10"))
+# Purges only reach the worker that handled the write; app.server turns this off for workers > 1
+RESPONSE_CACHE_STORE_ENABLED = os.getenv("RESPONSE_CACHE_STORE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+RESPONSE_CACHE_MAX_BODY_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BODY_BYTES", "1048576"))
+
+# Dashboard and static assets, served from memory
+ASSETS_DIRECTORY = os.getenv("ASSETS_DIRECTORY", "templates")
+# Re-read an asset when its file changes (development only: costs a stat per request)
+ASSETS_RELOAD = os.getenv("ASSETS_RELOAD", "false").lower() in ("1", "true", "yes")
+ASSETS_MAX_AGE = int(os.getenv("ASSETS_MAX_AGE", "3600"))
+
+# Prometheus metrics at /metrics
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# /readyz: how long a SELECT 1 result is reused, and how long it may take
+READINESS_CACHE_SECONDS = float(os.getenv("READINESS_CACHE_SECONDS", "2"))
+READINESS_DB_TIMEOUT_SECONDS = float(os.getenv("READINESS_DB_TIMEOUT_SECONDS", "2"))
+
+# Most ISBNs one POST /books/isbn:lookup request may resolve
+ISBN_LOOKUP_MAX_BATCH = int(os.getenv("ISBN_LOOKUP_MAX_BATCH", "100"))
+
+# POST /readers/bulk: rows per upsert and transaction, and how many rejected lines are reported
+READER_IMPORT_CHUNK_SIZE = int(os.getenv("READER_IMPORT_CHUNK_SIZE", "1000"))
+READER_IMPORT_MAX_ERRORS = int(os.getenv("READER_IMPORT_MAX_ERRORS", "100"))
+
+# Production server (python -m app.server)
+SERVER_HOST = os.getenv("HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("PORT", "8000"))
+SERVER_WORKERS = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+# Connections per worker beyond which new requests get 503 instead of queueing
+SERVER_LIMIT_CONCURRENCY = int(os.getenv("SERVER_LIMIT_CONCURRENCY", "1000"))
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
+# Longer than the load balancer's idle timeout, so the balancer closes idle connections first
+SERVER_KEEPALIVE_SECONDS = int(os.getenv("SERVER_KEEPALIVE_SECONDS", "65"))
+# Recycle a worker after this many requests (plus up to the jitter, so workers don't restart together); 0 disables
+SERVER_MAX_REQUESTS = int(os.getenv("SERVER_MAX_REQUESTS", "10000"))
+SERVER_MAX_REQUESTS_JITTER = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", "1000"))
+# Seconds /readyz reports draining after SIGTERM before the worker stops accepting connections
+SERVER_DRAIN_SECONDS = float(os.getenv("SERVER_DRAIN_SECONDS", "5"))
+SERVER_GRACEFUL_TIMEOUT = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+# A worker that exits sooner than this after starting is treated as a failed start:
+# it is respawned with exponential backoff, and the supervisor gives up after
+# SERVER_MAX_FAILED_STARTS in a row
+SERVER_MIN_WORKER_UPTIME_SECONDS = float(os.getenv("SERVER_MIN_WORKER_UPTIME_SECONDS", "5"))
+SERVER_MAX_FAILED_STARTS = int(os.getenv("SERVER_MAX_FAILED_STARTS", "5"))
+SERVER_RESPAWN_BACKOFF_MAX_SECONDS = float(os.getenv("SERVER_RESPAWN_BACKOFF_MAX_SECONDS", "30"))
+# Worker threads per process for sync handlers and dependencies
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "40"))
@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import DATABASE_URL
@@ -12,8 +13,43 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base class for models
 Base = declarative_base()
 
+def is_unique_violation(exc: IntegrityError) -> bool:
+    """Whether a write failed on a unique constraint (SQLite or PostgreSQL)"""
+    # psycopg2 exposes the SQLSTATE; sqlite3 only has the message
+    return getattr(exc.orig, "pgcode", None) == "23505" or "UNIQUE constraint failed" in str(exc.orig)
+
+class LazySession:
+    """
+    Session proxy that creates the real Session on first attribute access.
+
+    Requests that never touch the database (validation errors, cached
+    principals) don't construct a Session at all, and the pool connection is
+    only checked out by the first statement the Session runs.
+    """
+
+    __slots__ = ("_session",)
+
+    def __init__(self):
+        self._session = None
+
+    def __getattr__(self, name):
+        session = self._session
+        if session is None:
+            session = self._session = SessionLocal()
+        return getattr(session, name)
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
 def get_db():
-    db = SessionLocal()
+    db = LazySession()
     try:
         yield db
     finally:
@@ -0,0 +1,41 @@
+"""
+ISBN normalization.
+
+Books store ISBNs in one canonical form: 13 digits, no hyphens or spaces.
+ISBN-10s are converted (``0-306-40615-2`` -> ``9780306406157``), so every
+spelling of a book's ISBN hits the same row of the unique index on
+``books.isbn``.
+"""
+import re
+
+_ISBN10 = re.compile(r"[0-9]{9}[0-9X]")
+_ISBN13 = re.compile(r"97[89][0-9]{10}")
+_ISBN10_WEIGHTS = range(10, 1, -1)
+
+
+def check_digit13(first12: str) -> str:
+    """ISBN-13 (EAN-13) check digit for the first 12 digits"""
+    total = sum(map(int, first12[0::2])) + 3 * sum(map(int, first12[1::2]))
+    return str(-total % 10)
+
+
+def to_isbn13(value: str) -> str:
+    """Canonical ISBN-13 for an ISBN-10 or ISBN-13; raises ValueError if invalid"""
+    # Hyphens and whitespace are separators
+    digits = "".join(value.split()).replace("-", "").upper()
+    if len(digits) == 10:
+        if not _ISBN10.fullmatch(digits):
+            raise ValueError("Invalid ISBN format")
+        total = sum(map(int.__mul__, _ISBN10_WEIGHTS, map(int, digits[:9])))
+        total += 10 if digits[9] == "X" else int(digits[9])
+        if total % 11:
+            raise ValueError("Invalid ISBN checksum")
+        first12 = "978" + digits[:9]
+        return first12 + check_digit13(first12)
+    if len(digits) == 13:
+        if not _ISBN13.fullmatch(digits):
+            raise ValueError("Invalid ISBN format")
+        if digits[12] != check_digit13(digits[:12]):
+            raise ValueError("Invalid ISBN checksum")
+        return digits
+    raise ValueError("ISBN must be either 10 or 13 characters long")
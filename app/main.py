@@ -1,11 +1,48 @@
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-import os
-from .api import auth, books, readers, borrows
+from .api import auth, books, readers, borrows, debug, health, metrics
+from .assets import DASHBOARD_CACHE_CONTROL, STATIC_CACHE_CONTROL, assets
+from .config import (
+    ACCESS_LOG_ENABLED,
+    COMPRESSION_ENABLED,
+    METRICS_ENABLED,
+    PROFILING_ENABLED,
+    RESPONSE_CACHE_ENABLED,
+    THREADPOOL_SIZE,
+)
+from .middleware.cache import ResponseCacheMiddleware
+from .middleware.compression import CompressionMiddleware
+from .monitoring.access_log import AccessLogMiddleware, access_log
+from .monitoring.health import readiness
+from .monitoring.metrics import MetricsMiddleware
+from .monitoring.profiling import ProfilingMiddleware
+from .monitoring.sql import SQLTimingMiddleware
+from .responses import FastJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    # Read the dashboard and static assets (and their compressed variants) once
+    assets.load()
+    readiness.draining = False
+    if ACCESS_LOG_ENABLED:
+        access_log.start()
+    yield
+    # Draining has to start before uvicorn stops accepting connections, which
+    # is already over by now: app.server.DrainingServer does it on SIGTERM
+    access_log.stop()
 
-app = FastAPI(title="Library Management API", version="1.0.0")
+
+app = FastAPI(
+    title="Library Management API",
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
+)
 
 # Add CORS middleware to handle frontend requests
 app.add_middleware(
@@ -16,21 +53,48 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Per-request SQL statement count and DB time (no-op unless enabled)
+app.add_middleware(SQLTimingMiddleware)
+
+# Compress large responses for clients that accept gzip or brotli
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Serve public GET endpoints from the in-process cache (outside compression, so hits skip it)
+if RESPONSE_CACHE_ENABLED:
+    app.add_middleware(ResponseCacheMiddleware)
+
+# Opt-in sampling profiler for requests asked for by active users or picked at random
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Request count, latency and in-flight requests per route (outermost, so it times everything)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# One JSON line per request, written from a background thread
+if ACCESS_LOG_ENABLED:
+    app.add_middleware(AccessLogMiddleware)
+
 # Include API routers
 app.include_router(auth.router, prefix="/auth", tags=["authentication"])
 app.include_router(books.router, prefix="/books", tags=["books"])
 app.include_router(readers.router, prefix="/readers", tags=["readers"])
 app.include_router(borrows.router, prefix="/borrows", tags=["borrows"])
-
-# Mount the templates directory to serve static files
-app.mount("/static", StaticFiles(directory="templates"), name="static")
+app.include_router(debug.router, prefix="/debug", tags=["debug"])
+app.include_router(health.router, tags=["health"])
+if METRICS_ENABLED:
+    app.include_router(metrics.router, tags=["monitoring"])
 
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Library Management API"}
 
-@app.get("/dashboard", response_class=HTMLResponse)
-def get_dashboard():
-    with open("templates/index.html", "r", encoding="utf-8") as file:
-        content = file.read()
-    return HTMLResponse(content=content)
\ No newline at end of file
+# Files from the templates directory, served from memory
+@app.api_route("/static/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def get_static(path: str, request: Request):
+    return assets.response(request, path, STATIC_CACHE_CONTROL)
+
+@app.api_route("/dashboard", methods=["GET", "HEAD"], include_in_schema=False)
+async def get_dashboard(request: Request):
+    return assets.response(request, "index.html", DASHBOARD_CACHE_CONTROL)
@@ -0,0 +1,285 @@
+"""
+Shared HTTP caching for public GET endpoints.
+
+Routes listed in ``CACHE_RULES`` get ``Cache-Control`` (a short ``max-age``
+for browsers, ``s-maxage`` for the CDN) and a ``Surrogate-Key`` header so a
+CDN can purge by key. Their 200 responses are also kept in an in-process
+LRU store until the TTL expires or a write handler purges one of their keys:
+
+    response_cache.purge(book_key(book.id), BOOKS_LIST_KEY)
+
+Entries are stored per negotiated content encoding, so a hit skips the
+handler, the database and compression. Requests carrying cookies bypass the
+store, since CORS echoes the origin back for them, and so do profiled requests.
+
+Purges only reach the process that handled the write, so the store is off
+(``RESPONSE_CACHE_STORE_ENABLED=false``) when ``app.server`` runs more than
+one worker; the headers are still sent.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import Match
+
+from ..config import (
+    RESPONSE_CACHE_BROWSER_TTL_SECONDS,
+    RESPONSE_CACHE_CDN_TTL_SECONDS,
+    RESPONSE_CACHE_MAX_BODY_BYTES,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_STORE_ENABLED,
+    RESPONSE_CACHE_TTL_SECONDS,
+)
+from ..monitoring.metrics import Counter, Gauge, registry
+from .compression import choose_encoding
+
+BOOKS_LIST_KEY = "books:list"
+
+
+def book_key(book_id) -> str:
+    return f"book:{book_id}"
+
+
+@dataclass(frozen=True)
+class CacheRule:
+    ttl: float
+    browser_ttl: float
+    cdn_ttl: float
+    keys: Callable[[dict], List[str]]
+
+    @property
+    def cache_control(self) -> str:
+        return f"public, max-age={int(self.browser_ttl)}, s-maxage={int(self.cdn_ttl)}"
+
+
+# Route template -> rule. Only public endpoints whose response doesn't depend
+# on the caller belong here.
+CACHE_RULES: Dict[str, CacheRule] = {
+    "/books/": CacheRule(
+        RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_BROWSER_TTL_SECONDS, RESPONSE_CACHE_CDN_TTL_SECONDS,
+        lambda params: [BOOKS_LIST_KEY],
+    ),
+    "/books/{book_id}": CacheRule(
+        RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_BROWSER_TTL_SECONDS, RESPONSE_CACHE_CDN_TTL_SECONDS,
+        lambda params: [book_key(params["book_id"])],
+    ),
+}
+
+
+class CachedResponse:
+    __slots__ = ("expires_at", "stored_at", "status", "headers", "body", "keys")
+
+    def __init__(self, expires_at, status, headers, body, keys):
+        self.stored_at = time.monotonic()
+        self.expires_at = expires_at
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.keys = keys
+
+
+class ResponseCache:
+    """LRU response store with surrogate-key purging"""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, CachedResponse]" = OrderedDict()
+        self._by_key: Dict[str, Set[Tuple]] = {}
+        # Purged by write handlers in worker threads, read on the event loop
+        self._lock = threading.Lock()
+        # Bumped on every purge; a miss that started before a purge must not be stored
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, cache_key: Tuple) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove(cache_key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return entry
+
+    def set(self, cache_key: Tuple, entry: CachedResponse, generation: int) -> bool:
+        with self._lock:
+            if generation != self.generation:
+                return False
+            if cache_key in self._entries:
+                self._remove(cache_key)
+            self._entries[cache_key] = entry
+            for key in entry.keys:
+                self._by_key.setdefault(key, set()).add(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+            return True
+
+    def purge(self, *keys: str) -> int:
+        """Drop every response tagged with any of ``keys``; returns how many were dropped"""
+        with self._lock:
+            self.generation += 1
+            purged = 0
+            for key in keys:
+                for cache_key in list(self._by_key.get(key, ())):
+                    self._remove(cache_key)
+                    purged += 1
+            return purged
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._by_key.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, cache_key: Tuple) -> None:
+        entry = self._entries.pop(cache_key, None)
+        if entry is None:
+            return
+        for key in entry.keys:
+            tagged = self._by_key.get(key)
+            if tagged is not None:
+                tagged.discard(cache_key)
+                if not tagged:
+                    del self._by_key[key]
+
+
+response_cache = ResponseCache()
+
+HITS = registry.register(Counter("response_cache_hits_total", "Responses served from the in-process cache"))
+MISSES = registry.register(Counter("response_cache_misses_total", "Cacheable requests that missed the in-process cache"))
+registry.register(Gauge("response_cache_hit_ratio", "Hit ratio of the in-process response cache",
+                        sample=lambda: response_cache.hit_ratio))
+registry.register(Gauge("response_cache_entries", "Responses held in the in-process cache",
+                        sample=lambda: len(response_cache)))
+
+
+def match_rule(scope) -> Optional[Tuple[CacheRule, dict]]:
+    """Cache rule and routing scope (endpoint, path params) for the route the request will hit"""
+    app = scope.get("app")
+    if app is None:
+        return None
+    for route in app.router.routes:
+        path = getattr(route, "path", None)
+        if path not in CACHE_RULES:
+            continue
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            return CACHE_RULES[path], child_scope
+    return None
+
+
+class ResponseCacheMiddleware:
+    # Off: only add the caching headers
+    store = RESPONSE_CACHE_STORE_ENABLED
+
+    def __init__(self, app, cache: ResponseCache = response_cache):
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or scope.get("profiling"):
+            await self.app(scope, receive, send)
+            return
+        matched = match_rule(scope)
+        if matched is None:
+            await self.app(scope, receive, send)
+            return
+        rule, child_scope = matched
+        keys = rule.keys(child_scope["path_params"])
+
+        request_headers = Headers(scope=scope)
+        if not self.store or "cookie" in request_headers:
+            await self.app(scope, receive, self.tagging(send, rule, keys))
+            return
+
+        cache_key = (
+            scope["path"],
+            scope.get("query_string", b""),
+            choose_encoding(request_headers.get("accept-encoding", "")),
+            "origin" in request_headers,
+        )
+        entry = self.cache.get(cache_key)
+        if entry is not None:
+            HITS.inc()
+            # The router never runs for a hit; record the route as it would have
+            scope.update(child_scope)
+            await self.send_cached(send, entry)
+            return
+        MISSES.inc()
+
+        generation = self.cache.generation
+        start_message = None
+        chunks: Optional[List[bytes]] = []
+        size = 0
+
+        async def send_and_store(message):
+            nonlocal start_message, chunks, size
+            if message["type"] == "http.response.start":
+                self.add_cache_headers(message, rule, keys)
+                start_message = message
+                if message["status"] != 200:
+                    chunks = None
+            elif message["type"] == "http.response.body" and chunks is not None:
+                body = message.get("body", b"")
+                size += len(body)
+                if size > RESPONSE_CACHE_MAX_BODY_BYTES:
+                    chunks = None
+                else:
+                    chunks.append(body)
+                    if not message.get("more_body", False):
+                        self.cache.set(
+                            cache_key,
+                            CachedResponse(
+                                time.monotonic() + rule.ttl,
+                                start_message["status"],
+                                [
+                                    (name, value) for name, value in start_message["headers"]
+                                    if name.lower() != b"server-timing"
+                                ],
+                                b"".join(chunks),
+                                keys,
+                            ),
+                            generation,
+                        )
+            await send(message)
+
+        await self.app(scope, receive, send_and_store)
+
+    def tagging(self, send, rule: CacheRule, keys: List[str]):
+        async def send_tagged(message):
+            if message["type"] == "http.response.start":
+                self.add_cache_headers(message, rule, keys)
+            await send(message)
+        return send_tagged
+
+    @staticmethod
+    def add_cache_headers(message, rule: CacheRule, keys: Iterable[str]) -> None:
+        if message["status"] != 200:
+            return
+        headers = MutableHeaders(scope=message)
+        headers["Cache-Control"] = rule.cache_control
+        headers["Surrogate-Key"] = " ".join(keys)
+
+    @staticmethod
+    async def send_cached(send, entry: CachedResponse) -> None:
+        headers = list(entry.headers)
+        headers.append((b"age", str(int(time.monotonic() - entry.stored_at)).encode()))
+        headers.append((b"x-cache", b"HIT"))
+        await send({"type": "http.response.start", "status": entry.status, "headers": headers})
+        await send({"type": "http.response.body", "body": entry.body})
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String, func
 from sqlalchemy.orm import relationship
 from ..database import Base
 
@@ -10,4 +10,17 @@ class Reader(Base):
     email = Column(String, unique=True, index=True, nullable=False)
 
     # Relationship with borrows
-    borrows = relationship("Borrow", back_populates="reader")
\ No newline at end of file
+    borrows = relationship("Borrow", back_populates="reader")
+
+    # Case-insensitive prefix search (GET /readers/search). On PostgreSQL
+    # text_pattern_ops lets LIKE 'prefix%' use them under any collation.
+    __table_args__ = (
+        Index(
+            "ix_readers_name_lower", func.lower(name).label("name_lower"),
+            postgresql_ops={"name_lower": "text_pattern_ops"},
+        ),
+        Index(
+            "ix_readers_email_lower", func.lower(email).label("email_lower"),
+            postgresql_ops={"email_lower": "text_pattern_ops"},
+        ),
+    )
@@ -0,0 +1,150 @@
+"""
+Structured JSON access log.
+
+``AccessLogMiddleware`` builds one record per request with the route
+template, status, latency, DB time and query count, time spent
+authenticating, and response size. DB time and query count are only
+measured while SQL instrumentation is enabled (``app.monitoring.sql``) and
+are null otherwise, so the cursor listeners stay detached by default.
+
+The record is handed to a ``QueueHandler`` and returned immediately. A
+``QueueListener`` thread formats it as JSON and writes it, so neither
+formatting nor I/O runs on the event loop.
+
+Fast successful responses are sampled at ``ACCESS_LOG_SAMPLE_PERCENT``.
+Requests slower than ``ACCESS_LOG_SLOW_MS``, 4xx/5xx responses and requests
+that raised are always logged.
+"""
+import json
+import logging
+import queue
+import random
+import sys
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from ..config import ACCESS_LOG_SAMPLE_PERCENT, ACCESS_LOG_SLOW_MS
+from . import sql
+from .metrics import route_template
+
+logger = logging.getLogger("app.access")
+logger.propagate = False
+logger.setLevel(logging.INFO)
+
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("access_log_timings", default=None)
+
+
+def add_timing(name: str, seconds: float) -> None:
+    """Add to a named phase of the current request (no-op outside a request)"""
+    timings = _timings.get()
+    if timings is not None:
+        # The dict is shared with the middleware even from threadpool threads
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {"ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds")}
+        entry.update(getattr(record, "access", None) or {"message": record.getMessage()})
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # QueueHandler formats in the caller by default; leave that to the listener
+        return record
+
+
+class AccessLog:
+    """Owns the queue, its handler on the ``app.access`` logger and the writer thread"""
+
+    def __init__(self, handler: Optional[logging.Handler] = None):
+        self.queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        if handler is None:
+            handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(JSONFormatter())
+        self.handler = handler
+        self.listener: Optional[QueueListener] = None
+        self._queue_handler = _DeferredQueueHandler(self.queue)
+
+    def start(self) -> None:
+        if self.listener is not None:
+            return
+        logger.addHandler(self._queue_handler)
+        self.listener = QueueListener(self.queue, self.handler)
+        self.listener.start()
+
+    def stop(self) -> None:
+        """Flush queued records and stop the writer thread"""
+        logger.removeHandler(self._queue_handler)
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+
+access_log = AccessLog()
+
+
+class AccessLogMiddleware:
+    def __init__(self, app, sample_percent: float = ACCESS_LOG_SAMPLE_PERCENT, slow_ms: float = ACCESS_LOG_SLOW_MS):
+        self.app = app
+        self.sample_percent = sample_percent
+        self.slow_ms = slow_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        size = 0
+        timings: Dict[str, float] = {}
+        timings_token = _timings.set(timings)
+        # Without the cursor listeners there is nothing to measure
+        stats, stats_token = sql.start_request() if sql.is_enabled() else (None, None)
+
+        async def send_with_stats(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        start = time.perf_counter()
+        error = None
+        try:
+            await self.app(scope, receive, send_with_stats)
+        except Exception as exc:
+            error = type(exc).__name__
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if stats_token is not None:
+                sql.end_request(stats_token)
+            _timings.reset(timings_token)
+            if (
+                error is not None
+                or status_code >= 400
+                or duration_ms >= self.slow_ms
+                or random.random() * 100 < self.sample_percent
+            ):
+                client = scope.get("client")
+                entry = {
+                    "method": scope["method"],
+                    "route": route_template(scope),
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round(duration_ms, 3),
+                    "db_ms": round(stats.total_ms, 3) if stats is not None else None,
+                    "db_queries": stats.count if stats is not None else None,
+                    "auth_ms": round(timings.get("auth", 0.0) * 1000, 3),
+                    "bytes": size,
+                    "client": client[0] if client else None,
+                }
+                if error is not None:
+                    entry["error"] = error
+                logger.info("access", extra={"access": entry})
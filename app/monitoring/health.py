@@ -0,0 +1,100 @@
+"""
+Readiness state for the load balancer.
+
+The database check (``SELECT 1``) runs at most once per
+``READINESS_CACHE_SECONDS`` no matter how many probes arrive: concurrent
+probes wait for the one check in flight and then share its result. The check
+is bounded by ``READINESS_DB_TIMEOUT_SECONDS`` so a hung pool reports
+not-ready instead of hanging the probe. Once draining starts (graceful
+shutdown) readiness fails immediately without touching the database.
+"""
+import logging
+import time
+from typing import Optional
+
+import anyio
+import anyio.to_thread
+from sqlalchemy import text
+
+from ..config import READINESS_CACHE_SECONDS, READINESS_DB_TIMEOUT_SECONDS
+from ..database import engine
+
+logger = logging.getLogger(__name__)
+
+
+def _select_one() -> None:
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def pool_status() -> dict:
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        # StaticPool/NullPool have no fixed capacity to saturate
+        return {"type": type(pool).__name__}
+    capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+    checked_out = pool.checkedout()
+    return {
+        "type": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": checked_out,
+        "overflow": pool.overflow(),
+        "saturation": round(checked_out / capacity, 3) if capacity else None,
+    }
+
+
+class Readiness:
+    def __init__(self, cache_seconds: float = READINESS_CACHE_SECONDS, timeout: float = READINESS_DB_TIMEOUT_SECONDS):
+        self.cache_seconds = cache_seconds
+        self.timeout = timeout
+        self.draining = False
+        self.db_ok = False
+        self.db_error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+        self._lock: Optional[anyio.Lock] = None
+
+    def begin_draining(self) -> None:
+        self.draining = True
+
+    def _is_fresh(self) -> bool:
+        return self.checked_at is not None and time.monotonic() - self.checked_at < self.cache_seconds
+
+    async def check_database(self) -> bool:
+        if self._is_fresh():
+            return self.db_ok
+        if self._lock is None:
+            self._lock = anyio.Lock()
+        async with self._lock:
+            # Another probe may have refreshed the result while this one waited
+            if not self._is_fresh():
+                try:
+                    with anyio.fail_after(self.timeout):
+                        await anyio.to_thread.run_sync(_select_one, cancellable=True)
+                    self.db_ok, self.db_error = True, None
+                except TimeoutError:
+                    self.db_ok, self.db_error = False, f"SELECT 1 timed out after {self.timeout}s"
+                except Exception:
+                    # Driver messages can carry hostnames and DSN fragments; /readyz is public
+                    logger.exception("Readiness check: SELECT 1 failed")
+                    self.db_ok, self.db_error = False, "SELECT 1 failed"
+                self.checked_at = time.monotonic()
+        return self.db_ok
+
+    async def status(self) -> dict:
+        if self.draining:
+            return {"status": "draining"}
+        db_ok = await self.check_database()
+        status = {
+            "status": "ready" if db_ok else "unavailable",
+            "database": {
+                "ok": db_ok,
+                "checked_seconds_ago": round(time.monotonic() - self.checked_at, 3),
+            },
+            "pool": pool_status(),
+        }
+        if self.db_error:
+            status["database"]["error"] = self.db_error
+        return status
+
+
+readiness = Readiness()
@@ -0,0 +1,332 @@
+"""
+Prometheus metrics without external dependencies.
+
+``MetricsMiddleware`` records request counts and latency histograms per route
+template (``/books/{book_id}``, not the raw path, so label cardinality stays
+bounded) and status code, and tracks in-flight requests. Business counters
+are incremented by the handlers. Threadpool and DB pool gauges are sampled
+when ``/metrics`` is scraped, so they cost nothing between scrapes.
+
+Every series has its own lock, held only for a couple of additions, so
+recording never contends on a registry-wide lock.
+"""
+import bisect
+import threading
+from abc import ABC, abstractmethod
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import anyio.to_thread
+
+from ..database import engine
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; tuned for an API whose handlers usually answer within tens of ms
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def labels(self, *values):
+        # Values are stringified only when rendering, keeping the hot path to a dict lookup
+        child = self._children.get(values)
+        if child is None:
+            key = values
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """A fresh series for one combination of label values"""
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for key, child in list(self._children.items()):
+            lines.extend(child.samples(self.name, self.labelnames, key))
+        return lines
+
+
+class _Value:
+    __slots__ = ("value", "lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self.lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self.lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def samples(self, name, labelnames, key):
+        return [f"{name}{_format_labels(labelnames, key)} {_format_value(self.value)}"]
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        self._default.inc(amount)
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), sample: Optional[Callable[[], float]] = None):
+        super().__init__(name, documentation, labelnames)
+        # Gauges with a sample function are read at scrape time
+        self.sample = sample
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._default.dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def collect(self) -> List[str]:
+        if self.sample is not None:
+            value = self.sample()
+            if value is None:
+                return []
+            self._default.set(value)
+        return super().collect()
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "lock")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # Per-bucket (non-cumulative) counts; the last slot is +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def samples(self, name, labelnames, key):
+        with self.lock:
+            counts, total = list(self.counts), self.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{name}_bucket{_format_labels(labelnames, key, le)} {cumulative}")
+        labels = _format_labels(labelnames, key)
+        lines.append(f"{name}_sum{labels} {total!r}")
+        lines.append(f"{name}_count{labels} {cumulative}")
+        return lines
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+
+class RatePerMinute(Gauge):
+    """Events in the last 60 seconds, kept in one-second buckets"""
+
+    def __init__(self, name, documentation):
+        self._seconds = [0] * 60
+        self._stamps = [0] * 60
+        super().__init__(name, documentation, sample=self._rate)
+
+    def mark(self) -> None:
+        now = int(time.monotonic())
+        slot = now % 60
+        with self._lock:
+            if self._stamps[slot] != now:
+                self._stamps[slot] = now
+                self._seconds[slot] = 0
+            self._seconds[slot] += 1
+
+    def _rate(self) -> float:
+        cutoff = int(time.monotonic()) - 60
+        with self._lock:
+            return sum(count for count, stamp in zip(self._seconds, self._stamps) if stamp > cutoff)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+def _threadpool_statistics():
+    try:
+        return anyio.to_thread.current_default_thread_limiter().statistics()
+    except RuntimeError:  # no running event loop
+        return None
+
+
+def _threadpool(attribute: str) -> Callable[[], Optional[float]]:
+    def sample():
+        statistics = _threadpool_statistics()
+        return None if statistics is None else getattr(statistics, attribute)
+    return sample
+
+
+def _pool(method: str) -> Callable[[], Optional[float]]:
+    def sample():
+        measure = getattr(engine.pool, method, None)
+        return None if measure is None else measure()
+    return sample
+
+
+registry = Registry()
+
+REQUESTS = registry.register(Counter(
+    "http_requests_total", "HTTP requests by method, route template and status", ("method", "route", "status"),
+))
+LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by method, route template and status",
+    ("method", "route", "status"),
+))
+IN_FLIGHT = registry.register(Gauge("http_requests_in_flight", "HTTP requests currently being served"))
+
+registry.register(Gauge(
+    "threadpool_busy_threads", "Worker threads running sync handlers", sample=_threadpool("borrowed_tokens"),
+))
+registry.register(Gauge(
+    "threadpool_max_threads", "Worker thread limit for sync handlers", sample=_threadpool("total_tokens"),
+))
+registry.register(Gauge(
+    "threadpool_waiting_tasks", "Sync handlers waiting for a free worker thread", sample=_threadpool("tasks_waiting"),
+))
+
+registry.register(Gauge("db_pool_size", "Configured DB connection pool size", sample=_pool("size")))
+registry.register(Gauge("db_pool_checked_out", "DB connections currently in use", sample=_pool("checkedout")))
+registry.register(Gauge("db_pool_checked_in", "Idle DB connections in the pool", sample=_pool("checkedin")))
+registry.register(Gauge("db_pool_overflow", "DB connections open beyond the pool size", sample=_pool("overflow")))
+
+BORROWS = registry.register(Counter("library_borrows_total", "Books borrowed"))
+RETURNS = registry.register(Counter("library_returns_total", "Books returned"))
+BORROWS_PER_MINUTE = registry.register(RatePerMinute("library_borrows_per_minute", "Books borrowed in the last minute"))
+RETURNS_PER_MINUTE = registry.register(RatePerMinute("library_returns_per_minute", "Books returned in the last minute"))
+
+
+def record_borrow() -> None:
+    BORROWS.inc()
+    BORROWS_PER_MINUTE.mark()
+
+
+def record_return() -> None:
+    RETURNS.inc()
+    RETURNS_PER_MINUTE.mark()
+
+
+def route_template(scope) -> str:
+    """Path template of the route that handled the request"""
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is None or app is None:
+        return UNMATCHED_ROUTE
+    templates = getattr(app.state, "route_templates", None)
+    if templates is None or endpoint not in templates:
+        templates = app.state.route_templates = {
+            route.endpoint: route.path
+            for route in app.routes
+            if hasattr(route, "endpoint") and hasattr(route, "path")
+        }
+    return templates.get(endpoint, UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            IN_FLIGHT.dec()
+            labels = (scope["method"], route_template(scope), status_code)
+            REQUESTS.labels(*labels).inc()
+            LATENCY.labels(*labels).observe(duration)
@@ -0,0 +1,234 @@
+"""
+On-demand request profiling.
+
+A sampling profiler records the Python stacks of every thread in the worker
+while a request runs: the event loop and the threadpool thread that runs a
+sync handler. Other requests served concurrently by the same worker show up
+as well. Stacks are written in the folded format understood by
+``flamegraph.pl``, speedscope and similar tools (``frame;frame;frame count``
+per line).
+
+When ``PROFILING_ENABLED`` is set, a request is profiled if:
+
+* it passes ``?__profile=1`` or ``X-Profile: 1`` and authenticates as an
+  active user (the same check as ``get_current_active_user``); or
+* it is picked by ``PROFILING_SAMPLE_PERCENT`` random sampling.
+
+Profiles go to a rotating directory that keeps the newest
+``PROFILING_MAX_FILES``. The response names the profile in ``X-Profile-Id``,
+and ``GET /debug/profiles/{profile_id}`` downloads it.
+"""
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import List, Optional
+from urllib.parse import quote, unquote
+
+import anyio.to_thread
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.responses import JSONResponse
+
+from ..auth.jwt_handler import get_current_active_user, get_current_user
+from ..config import (
+    PROFILING_DIRECTORY,
+    PROFILING_INTERVAL_MS,
+    PROFILING_MAX_FILES,
+    PROFILING_SAMPLE_PERCENT,
+)
+from ..database import get_db
+
+logger = logging.getLogger(__name__)
+
+PROFILE_QUERY_PARAM = "__profile"
+PROFILE_HEADER = "x-profile"
+
+# Innermost frames of threads that are parked rather than working
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py", "thread.py")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples the stacks of all other threads every ``interval`` seconds"""
+
+    def __init__(self, interval: float = PROFILING_INTERVAL_MS / 1000):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or frame.f_code.co_filename.endswith(_IDLE_FILES):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Directory of folded-stack profiles, rotated to the newest ``max_files``"""
+
+    def __init__(self, directory: str = PROFILING_DIRECTORY, max_files: int = PROFILING_MAX_FILES):
+        self.directory = directory
+        self.max_files = max_files
+
+    def save(self, method: str, path: str, folded: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        profile_id = uuid.uuid4().hex[:12]
+        # Percent-encoded so the path comes back exactly, hyphens and colons included
+        filename = f"{time.time():.6f}_{profile_id}_{method}_{quote(path, safe='')}.folded"
+        with open(os.path.join(self.directory, filename), "w", encoding="utf-8") as file:
+            file.write(folded)
+        self._rotate()
+        return profile_id
+
+    def list(self) -> List[dict]:
+        profiles = []
+        for filename in self._files():
+            created, profile_id, method, path = filename[: -len(".folded")].split("_", 3)
+            profiles.append({
+                "id": profile_id,
+                "created": float(created),
+                "method": method,
+                "path": unquote(path),
+                "size": os.path.getsize(os.path.join(self.directory, filename)),
+            })
+        return profiles[::-1]
+
+    def read(self, profile_id: str) -> Optional[str]:
+        for filename in self._files():
+            if filename.split("_", 2)[1] == profile_id:
+                with open(os.path.join(self.directory, filename), encoding="utf-8") as file:
+                    return file.read()
+        return None
+
+    def _files(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        # Names start with the timestamp, so this is oldest first
+        return sorted(name for name in os.listdir(self.directory) if name.endswith(".folded"))
+
+    def _rotate(self) -> None:
+        files = self._files()
+        for filename in files[: max(len(files) - self.max_files, 0)]:
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except FileNotFoundError:
+                pass
+
+
+profile_store = ProfileStore()
+
+
+def _authorize(app, authorization: str) -> bool:
+    """Run the get_current_active_user check outside of dependency injection"""
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    db_provider = app.dependency_overrides.get(get_db, get_db)
+    db_dependency = db_provider()
+    db = next(db_dependency)
+    try:
+        user = get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), db)
+        get_current_active_user(user)
+        return True
+    except HTTPException:
+        return False
+    finally:
+        db_dependency.close()
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, store: ProfileStore = profile_store, sample_percent: float = PROFILING_SAMPLE_PERCENT):
+        self.app = app
+        self.store = store
+        self.sample_percent = sample_percent
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        requested = (
+            QueryParams(scope.get("query_string", b"")).get(PROFILE_QUERY_PARAM) == "1"
+            or headers.get(PROFILE_HEADER) == "1"
+        )
+        if requested:
+            allowed = await anyio.to_thread.run_sync(
+                _authorize, scope["app"], headers.get("authorization", "")
+            )
+            if not allowed:
+                response = JSONResponse(
+                    {"detail": "Profiling requires an authenticated active user"}, status_code=403
+                )
+                await response(scope, receive, send)
+                return
+        elif not (self.sample_percent and random.random() * 100 < self.sample_percent):
+            await self.app(scope, receive, send)
+            return
+
+        # Tells the response cache to let this request reach its handler
+        scope["profiling"] = True
+        profiler = SamplingProfiler()
+        start_message = None
+        profile_id = None
+
+        async def save_profile():
+            nonlocal profile_id
+            profiler.stop()
+            profile_id = await anyio.to_thread.run_sync(
+                self.store.save, scope["method"], scope["path"], profiler.folded()
+            )
+
+        async def send_with_profile(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Held back so a complete response can name its profile
+                start_message = message
+                return
+            if start_message is not None:
+                if not message.get("more_body", False):
+                    await save_profile()
+                    MutableHeaders(scope=start_message)["X-Profile-Id"] = profile_id
+                await send(start_message)
+                start_message = None
+            await send(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            if profile_id is None:
+                await save_profile()
+            logger.info(
+                "Profiled %s %s: %d samples, profile %s",
+                scope["method"], scope["path"], profiler.samples, profile_id,
+            )
@@ -0,0 +1,188 @@
+"""
+Per-request SQL instrumentation.
+
+SQLAlchemy cursor events record every statement executed while a request is
+in flight: statement count, total DB time and the slowest statements. The
+numbers are returned in a ``Server-Timing`` header, logged when a request
+crosses the configured thresholds, and statements repeated within a single
+request are reported as likely N+1 patterns.
+
+When instrumentation is disabled the event listeners are detached from the
+engine and the middleware passes requests straight through.
+"""
+import logging
+import time
+from contextvars import ContextVar, Token
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from ..config import (
+    SQL_INSTRUMENTATION_ENABLED,
+    SQL_LOG_THRESHOLD_MS,
+    SQL_LOG_THRESHOLD_QUERIES,
+    SQL_N_PLUS_ONE_THRESHOLD,
+)
+
+logger = logging.getLogger(__name__)
+
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar("sql_query_stats", default=None)
+_enabled = False
+
+# Transaction control issued through the cursor; like BEGIN/COMMIT (which the
+# driver handles itself) these aren't counted as queries
+TRANSACTION_CONTROL = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+class QueryStats:
+    """Statements executed during one unit of work (usually one request)"""
+
+    __slots__ = ("count", "total_time", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        # statement -> [executions, total seconds, slowest seconds]
+        self.statements: Dict[str, List[float]] = {}
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        entry = self.statements.get(statement)
+        if entry is None:
+            self.statements[statement] = [1, duration, duration]
+        else:
+            entry[0] += 1
+            entry[1] += duration
+            if duration > entry[2]:
+                entry[2] = duration
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_time * 1000
+
+    def slowest(self, limit: int = 3) -> List[Tuple[str, float]]:
+        """Slowest distinct statements as (statement, milliseconds)"""
+        ranked = sorted(self.statements.items(), key=lambda item: item[1][2], reverse=True)
+        return [(statement, entry[2] * 1000) for statement, entry in ranked[:limit]]
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Statements executed at least ``threshold`` times - likely N+1 patterns"""
+        if threshold is None:
+            threshold = SQL_N_PLUS_ONE_THRESHOLD
+        return [
+            (statement, int(entry[0]))
+            for statement, entry in self.statements.items()
+            if entry[0] >= threshold
+        ]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_ms:.2f};desc="{self.count} queries"'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    duration = time.perf_counter() - start_times.pop()
+    if not statement.startswith(TRANSACTION_CONTROL):
+        stats.record(statement, duration)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _attach_listeners() -> None:
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def enable() -> None:
+    """Attach the cursor listeners to all engines"""
+    global _enabled
+    _attach_listeners()
+    _enabled = True
+
+
+def disable() -> None:
+    """Detach the cursor listeners so statements run without any overhead"""
+    global _enabled
+    _enabled = False
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def start_request() -> Tuple[QueryStats, Token]:
+    """Scope a fresh QueryStats to the current context; pass the token to end_request()"""
+    stats = QueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def end_request(token: Token) -> None:
+    _current_stats.reset(token)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def _log_request(method: str, path: str, stats: QueryStats) -> None:
+    if stats.total_ms >= SQL_LOG_THRESHOLD_MS or stats.count >= SQL_LOG_THRESHOLD_QUERIES:
+        slowest = "; ".join(f"{ms:.2f}ms {statement}" for statement, ms in stats.slowest())
+        logger.warning(
+            "%s %s ran %d queries in %.2fms. Slowest: %s",
+            method, path, stats.count, stats.total_ms, slowest,
+        )
+    for statement, executions in stats.repeated():
+        logger.warning(
+            "Possible N+1 in %s %s: statement executed %d times: %s",
+            method, path, executions, statement,
+        )
+
+
+class SQLTimingMiddleware:
+    """ASGI middleware that scopes a QueryStats to each HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _enabled:
+            await self.app(scope, receive, send)
+            return
+
+        # Share the stats of an outer consumer (the access log) if there is one
+        stats = _current_stats.get()
+        token = None
+        if stats is None:
+            stats, token = start_request()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            if token is not None:
+                end_request(token)
+            _log_request(scope["method"], scope["path"], stats)
+
+
+if SQL_INSTRUMENTATION_ENABLED:
+    enable()
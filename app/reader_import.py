@@ -0,0 +1,196 @@
+"""
+Bulk reader import (POST /readers/bulk).
+
+The body is NDJSON (one JSON object per line) or CSV with a header row
+naming the ``name`` and ``email`` columns, one record per line. It is read
+as a stream. Records are validated with ``ReaderCreate`` and written in
+chunks of READER_IMPORT_CHUNK_SIZE with one ``INSERT ... ON CONFLICT
+(email)`` per chunk, each chunk in its own transaction, so a large roster
+never holds one long transaction or the whole file in memory.
+
+An email that already exists, in the database or earlier in the same
+import, gets the imported name (mode "update") or is left alone (mode
+"skip"). Invalid or oversized lines are counted as rejected and don't stop
+the import. A chunk the database fails to write is rolled back and its
+records are rejected with the chunk's line range; later chunks still run.
+"""
+import csv
+import json
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from . import models, schemas
+from .config import READER_IMPORT_MAX_ERRORS
+
+NDJSON_TYPES = ("application/x-ndjson", "application/jsonl")
+CSV_TYPES = ("text/csv",)
+# A record is a name and an email; anything longer is not a roster line
+MAX_LINE_BYTES = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+# (line number, record or the reason it could not be parsed)
+Record = Tuple[int, Union[dict, str]]
+
+
+class ImportFormatError(ValueError):
+    """The body as a whole can't be imported (bad CSV header)"""
+
+
+async def read_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """Numbered non-blank lines of a streamed body; a line over MAX_LINE_BYTES comes back as None"""
+    buffer = b""
+    number = 0
+    # The start of the current line was too long and has been dropped
+    oversized = False
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            number += 1
+            if oversized or len(line) > MAX_LINE_BYTES:
+                oversized = False
+                yield number, None
+            elif line.strip():
+                yield number, line
+        if len(buffer) > MAX_LINE_BYTES:
+            oversized = True
+            buffer = b""
+    if oversized or len(buffer) > MAX_LINE_BYTES:
+        yield number + 1, None
+    elif buffer.strip():
+        yield number + 1, buffer
+
+
+async def read_records(chunks: AsyncIterator[bytes], media_type: str) -> AsyncIterator[Record]:
+    """Parse NDJSON or CSV lines into dicts; unparseable lines carry an error message"""
+    header = None
+    async for number, raw in read_lines(chunks):
+        if raw is None:
+            if media_type in CSV_TYPES and header is None:
+                raise ImportFormatError(f"CSV header is longer than {MAX_LINE_BYTES} bytes")
+            yield number, f"Line is longer than {MAX_LINE_BYTES} bytes"
+            continue
+        try:
+            line = raw.decode("utf-8-sig" if number == 1 else "utf-8").rstrip("\r")
+        except UnicodeDecodeError:
+            yield number, "Line is not valid UTF-8"
+            continue
+
+        if media_type in NDJSON_TYPES:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield number, "Invalid JSON"
+                continue
+            yield number, record if isinstance(record, dict) else "Expected a JSON object"
+            continue
+
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [column.strip().lower() for column in values]
+            if not {"name", "email"} <= set(header):
+                raise ImportFormatError("CSV header must name the 'name' and 'email' columns")
+            continue
+        if len(values) != len(header):
+            yield number, f"Expected {len(header)} fields, got {len(values)}"
+            continue
+        yield number, dict(zip(header, values))
+
+
+def describe(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+    )
+
+
+class ReaderImport:
+    """Validates and upserts chunks of records, keeping the running counts"""
+
+    def __init__(self, db: Session, mode: str):
+        self.db = db
+        self.update = mode == "update"
+        dialect = db.get_bind().dialect.name
+        if dialect not in _INSERTS:
+            raise ImportFormatError(f"Bulk import is not supported on {dialect}")
+        insert = _INSERTS[dialect](models.Reader)
+        if self.update:
+            self.statement = insert.on_conflict_do_update(
+                index_elements=[models.Reader.email], set_={"name": insert.excluded.name},
+            )
+        else:
+            self.statement = insert.on_conflict_do_nothing(index_elements=[models.Reader.email])
+        self.inserted = self.updated = self.skipped = self.rejected = 0
+        self.errors: List[dict] = []
+
+    def reject(self, line: int, error: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < READER_IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line, "error": error})
+
+    def count_existing(self, existing: int) -> None:
+        if self.update:
+            self.updated += existing
+        else:
+            self.skipped += existing
+
+    def process(self, records: List[Record]) -> None:
+        """Validate one chunk and write it in a single upsert and transaction"""
+        rows: Dict[str, dict] = {}
+        repeated = 0
+        for line, record in records:
+            if isinstance(record, str):
+                self.reject(line, record)
+                continue
+            try:
+                reader = schemas.ReaderCreate.model_validate(record)
+            except ValidationError as exc:
+                self.reject(line, describe(exc))
+                continue
+            # One row per email and statement (PostgreSQL can't upsert a row twice)
+            if reader.email in rows:
+                repeated += 1
+                if not self.update:
+                    continue
+            rows[reader.email] = reader.model_dump()
+        if not rows:
+            return
+
+        try:
+            existing = self.write(rows)
+        except SQLAlchemyError:
+            self.db.rollback()
+            first, last = records[0][0], records[-1][0]
+            logger.exception("Reader import: writing lines %d-%d failed", first, last)
+            self.rejected += len(rows) + repeated
+            if len(self.errors) < READER_IMPORT_MAX_ERRORS:
+                self.errors.append({"line": first, "error": f"Lines {first}-{last} were not written: database error"})
+            return
+        self.inserted += len(rows) - existing
+        self.count_existing(existing + repeated)
+
+    def write(self, rows: Dict[str, dict]) -> int:
+        """Upsert and commit one chunk; returns how many of its emails already existed"""
+        existing = self.db.execute(
+            select(models.Reader.email).where(models.Reader.email.in_(list(rows)))
+        ).scalars().all()
+        self.db.execute(self.statement, list(rows.values()))
+        self.db.commit()
+        return len(existing)
+
+    def result(self) -> dict:
+        return {
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "rejected": self.rejected,
+            "errors": self.errors,
+        }
@@ -0,0 +1,88 @@
+"""
+Fast JSON responses.
+
+``FastJSONResponse`` is the application's default response class. Plain
+JSON-compatible content (what FastAPI produces after ``response_model``
+serialization) is encoded with orjson. Pydantic models, or lists of one
+model type, returned directly from a handler are encoded by pydantic-core
+straight to bytes, without building intermediate dicts. Models anywhere
+else (mixed lists, inside dicts) go through ``model_dump(mode="json")``.
+Falls back to the stdlib encoder when orjson is not installed.
+
+``trusted_rows`` is for list endpoints whose rows come straight from our own
+database: it serializes them with the response model's field types but
+skips the validation FastAPI would run against ``response_model``.
+"""
+import json
+from typing import Any, Dict, Iterable, List, Mapping, Type
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import TypedDict
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+_list_adapters: Dict[Type[BaseModel], TypeAdapter] = {}
+
+
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Cached TypeAdapter for ``List[model]``"""
+    adapter = _list_adapters.get(model)
+    if adapter is None:
+        adapter = _list_adapters[model] = TypeAdapter(List[model])
+    return adapter
+
+
+_row_adapters: Dict[Type[BaseModel], TypeAdapter] = {}
+
+
+def row_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Cached serializer for lists of plain dicts shaped like ``model``"""
+    adapter = _row_adapters.get(model)
+    if adapter is None:
+        fields = {name: field.annotation for name, field in model.model_fields.items()}
+        row_type = TypedDict(f"{model.__name__}Row", fields)
+        adapter = _row_adapters[model] = TypeAdapter(List[row_type])
+    return adapter
+
+
+def trusted_rows(model: Type[BaseModel], rows: Iterable[Mapping[str, Any]]) -> Response:
+    """
+    JSON list response for rows read from our own database.
+
+    Keep ``response_model=List[model]`` on the route for the OpenAPI schema:
+    FastAPI returns a ``Response`` as is, so the rows are not validated again.
+    Their keys must be ``model``'s fields in the same order (select the
+    columns from ``model.model_fields``).
+    """
+    return Response(row_adapter(model).dump_json([dict(row) for row in rows]), media_type="application/json")
+
+
+def _encode_model(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dump_json(content: Any) -> bytes:
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    if isinstance(content, list) and content and isinstance(content[0], BaseModel):
+        model = type(content[0])
+        # List[model] would drop or reject the fields of any other type
+        if all(type(item) is model for item in content):
+            return list_adapter(model).dump_json(content)
+    if orjson is not None:
+        return orjson.dumps(content, default=_encode_model, option=orjson.OPT_NON_STR_KEYS)
+    # Same output as starlette's JSONResponse
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"), default=_encode_model,
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
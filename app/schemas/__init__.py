@@ -1,6 +1,6 @@
 from .user import User, UserCreate, UserLogin, Token, TokenData
-from .book import Book, BookCreate, BookUpdate
-from .reader import Reader, ReaderCreate, ReaderUpdate
+from .book import Book, BookCreate, BookUpdate, IsbnLookup, IsbnLookupResult, IsbnLookupResponse
+from .reader import Reader, ReaderCreate, ReaderUpdate, Loan, ReaderProfile, ImportMode, ReaderImportError, ReaderImportResult
 from .borrow import Borrow, BorrowCreate, BorrowReturn
 
 __all__ = [
@@ -15,11 +15,19 @@ __all__ = [
     "Book",
     "BookCreate",
     "BookUpdate",
+    "IsbnLookup",
+    "IsbnLookupResult",
+    "IsbnLookupResponse",
     
     # Reader schemas
     "Reader",
     "ReaderCreate",
     "ReaderUpdate",
+    "Loan",
+    "ReaderProfile",
+    "ImportMode",
+    "ReaderImportError",
+    "ReaderImportResult",
     
     # Borrow schemas
     "Borrow",
@@ -1,63 +1,39 @@
-from pydantic import BaseModel, field_validator
-from typing import Optional
-import re
+from datetime import datetime
+from pydantic import AfterValidator, BaseModel, Field
+from typing import Annotated, List, Optional
 
-class BookBase(BaseModel):
-    title: str
-    author: str
-    year: Optional[int] = None
-    isbn: Optional[str] = None
-    copies: Optional[int] = 1
-    description: Optional[str] = None
-
-    @field_validator('title')
-    def validate_title(cls, v):
-        if not v or v.strip() == "":
-            raise ValueError('Title cannot be empty')
-        if len(v) > 500:
-            raise ValueError('Title must be less than 500 characters')
-        return v.strip()
-
-    @field_validator('author')
-    def validate_author(cls, v):
-        if not v or v.strip() == "":
-            raise ValueError('Author cannot be empty')
-        if len(v) > 200:
-            raise ValueError('Author name must be less than 200 characters')
-        return v.strip()
+from ..config import ISBN_LOOKUP_MAX_BATCH
+from ..isbn import to_isbn13
+from .constraints import NOT_BLANK, Rule
 
-    @field_validator('year')
-    def validate_year(cls, v):
-        if v is not None:
-            from datetime import datetime
-            current_year = datetime.now().year
-            if v < 1000 or v > current_year + 10:  # Allow up to 10 years in the future
-                raise ValueError(f'Year must be between 1000 and {current_year + 10}')
-        return v
+# Checks run inside pydantic-core (see constraints.Rule) and keep the
+# messages of the original validators. Lengths are checked before stripping.
+MIN_YEAR = 1000
+# Allow up to 10 years in the future (workers are recycled, so this follows the calendar)
+MAX_YEAR = datetime.now().year + 10
+YEAR_MESSAGE = f'Year must be between {MIN_YEAR} and {MAX_YEAR}'
 
-    @field_validator('isbn')
-    def validate_isbn(cls, v):
-        if v is not None:
-            # Remove hyphens and spaces
-            clean_isbn = re.sub(r'[-\s]', '', v)
-            if len(clean_isbn) not in [10, 13]:
-                raise ValueError('ISBN must be either 10 or 13 characters long')
-            # Check if all characters are digits (for basic validation)
-            if not clean_isbn.isdigit() and not (len(clean_isbn) == 10 and clean_isbn[:-1].isdigit() and clean_isbn[-1] in '0123456789Xx'):
-                raise ValueError('Invalid ISBN format')
-        return v
+# Checksum-verified and stored as a bare ISBN-13 (see app.isbn)
+ISBN = Annotated[str, AfterValidator(to_isbn13)]
 
-    @field_validator('copies')
-    def validate_copies(cls, v):
-        if v is not None and v < 0:
-            raise ValueError('Copies cannot be negative')
-        return v
 
-    @field_validator('description')
-    def validate_description(cls, v):
-        if v is not None and len(v) > 2000:
-            raise ValueError('Description must be less than 2000 characters')
-        return v
+class BookBase(BaseModel):
+    title: Annotated[
+        str,
+        Rule('Title cannot be empty', pattern=NOT_BLANK),
+        Rule('Title must be less than 500 characters', max_length=500),
+        Rule(strip_whitespace=True),
+    ]
+    author: Annotated[
+        str,
+        Rule('Author cannot be empty', pattern=NOT_BLANK),
+        Rule('Author name must be less than 200 characters', max_length=200),
+        Rule(strip_whitespace=True),
+    ]
+    year: Optional[Annotated[int, Rule(YEAR_MESSAGE, ge=MIN_YEAR), Rule(YEAR_MESSAGE, le=MAX_YEAR)]] = None
+    isbn: Optional[ISBN] = None
+    copies: Optional[Annotated[int, Rule('Copies cannot be negative', ge=0)]] = 1
+    description: Optional[Annotated[str, Rule('Description must be less than 2000 characters', max_length=2000)]] = None
 
 class BookCreate(BookBase):
     pass
@@ -66,12 +42,26 @@ class BookUpdate(BaseModel):
     title: Optional[str] = None
     author: Optional[str] = None
     year: Optional[int] = None
-    isbn: Optional[str] = None
+    isbn: Optional[ISBN] = None
     copies: Optional[int] = None
     description: Optional[str] = None
 
 class Book(BookBase):
     id: int
+    # Responses carry what is stored; rows not yet canonicalized must still load
+    isbn: Optional[str] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class IsbnLookup(BaseModel):
+    isbns: List[str] = Field(..., min_length=1, max_length=ISBN_LOOKUP_MAX_BATCH)
+
+class IsbnLookupResult(BaseModel):
+    isbn: str
+    # None when the requested ISBN is invalid
+    canonical: Optional[str] = None
+    book: Optional[Book] = None
+
+class IsbnLookupResponse(BaseModel):
+    results: List[IsbnLookupResult]
@@ -1,41 +1,22 @@
-from pydantic import BaseModel, field_validator
-from typing import Optional
+from pydantic import BaseModel
+from typing import Annotated, Optional
 from datetime import datetime
 
-class BorrowBase(BaseModel):
-    book_id: int
-    reader_id: int
+from .constraints import Rule
 
-    @field_validator('book_id')
-    def validate_book_id(cls, v):
-        if v <= 0:
-            raise ValueError('Book ID must be a positive integer')
-        return v
+BookId = Annotated[int, Rule('Book ID must be a positive integer', gt=0)]
+ReaderId = Annotated[int, Rule('Reader ID must be a positive integer', gt=0)]
 
-    @field_validator('reader_id')
-    def validate_reader_id(cls, v):
-        if v <= 0:
-            raise ValueError('Reader ID must be a positive integer')
-        return v
+class BorrowBase(BaseModel):
+    book_id: BookId
+    reader_id: ReaderId
 
 class BorrowCreate(BorrowBase):
     pass
 
 class BorrowReturn(BaseModel):
-    book_id: int
-    reader_id: int
-
-    @field_validator('book_id')
-    def validate_book_id(cls, v):
-        if v <= 0:
-            raise ValueError('Book ID must be a positive integer')
-        return v
-
-    @field_validator('reader_id')
-    def validate_reader_id(cls, v):
-        if v <= 0:
-            raise ValueError('Reader ID must be a positive integer')
-        return v
+    book_id: BookId
+    reader_id: ReaderId
 
 class Borrow(BorrowBase):
     id: int
@@ -0,0 +1,49 @@
+"""
+Field checks that run inside pydantic-core but report the messages of the
+original ``@field_validator`` functions.
+
+``Rule`` is ``Annotated`` metadata holding ``str``/``int`` constraints. Each
+rule becomes one step of a chain schema, and a failing step is reported as
+``value_error`` with the same message ("Value error, Title cannot be
+empty") as the validator it replaces. ``ctx.error`` holds the message
+string instead of the exception. No Python code runs for valid input:
+
+    title: Annotated[str, Rule('Title cannot be empty', pattern=NOT_BLANK), Rule(strip_whitespace=True)]
+
+Rules apply in order to the output of the previous one. A rule without a
+message is a plain transformation (stripping, lowercasing) that keeps
+pydantic's own errors. Don't combine several rules with a ``Field()``
+default: merging field infos keeps only one metadata item per type.
+"""
+from typing import Any, Optional
+
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+_INT_CONSTRAINTS = {"gt", "ge", "lt", "le"}
+
+# Some character other than whitespace. The regex engine's \s is Unicode
+# White_Space; str.isspace() (and so str.strip()) also counts \x1c-\x1f
+NOT_BLANK = r'[^\s\x1c-\x1f\x85]'
+
+
+class Rule:
+    __slots__ = ("message", "constraints")
+
+    def __init__(self, message: Optional[str] = None, **constraints: Any):
+        self.message = message
+        self.constraints = constraints
+
+    def __get_pydantic_core_schema__(self, source_type: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        if self.constraints.keys() & _INT_CONSTRAINTS:
+            check = core_schema.int_schema(**self.constraints)
+        else:
+            check = core_schema.str_schema(**self.constraints)
+        if self.message is not None:
+            check = core_schema.custom_error_schema(
+                check, "value_error", custom_error_context={"error": self.message},
+            )
+        return core_schema.chain_schema([handler(source_type), check])
+
+    def __repr__(self) -> str:
+        return f"Rule({self.message!r}, {self.constraints!r})"
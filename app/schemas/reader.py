@@ -1,58 +1,56 @@
-from pydantic import BaseModel, field_validator, EmailStr
-from typing import Optional
-import re
-
+from pydantic import BaseModel, EmailStr
+from typing import Annotated, List, Literal, Optional
+
+from .book import Book
+from .borrow import Borrow
+from .constraints import NOT_BLANK, Rule
+
+# Letters, spaces, hyphens, apostrophes and dots. Checked before stripping,
+# which gives the same answer since whitespace is allowed anyway.
+Name = Annotated[
+    str,
+    Rule('Name cannot be empty', pattern=NOT_BLANK),
+    Rule('Name must be less than 200 characters', max_length=200),
+    Rule('Name contains invalid characters', pattern=r"^[A-Za-z\s\-'\.]+$"),
+    Rule(strip_whitespace=True),
+]
+
+# EmailStr already rejects addresses longer than 254 characters
 class ReaderBase(BaseModel):
-    name: str
+    name: Name
     email: EmailStr
 
-    @field_validator('name')
-    def validate_name(cls, v):
-        if not v or v.strip() == "":
-            raise ValueError('Name cannot be empty')
-        if len(v) > 200:
-            raise ValueError('Name must be less than 200 characters')
-        # Check if name contains only allowed characters (letters, spaces, hyphens, apostrophes)
-        if not re.match(r'^[A-Za-z\s\-\'\.]+$', v.strip()):
-            raise ValueError('Name contains invalid characters')
-        return v.strip()
-
-    @field_validator('email')
-    def validate_email(cls, v):
-        # Email validation is handled by EmailStr, but we can add additional checks
-        if len(v) > 254:
-            raise ValueError('Email must be less than 254 characters')
-        return v
-
 class ReaderCreate(ReaderBase):
     pass
 
 class ReaderUpdate(BaseModel):
-    name: Optional[str] = None
+    name: Optional[Name] = None
     email: Optional[EmailStr] = None
 
-    @field_validator('name')
-    def validate_name(cls, v):
-        if v is not None:
-            if not v or v.strip() == "":
-                raise ValueError('Name cannot be empty')
-            if len(v) > 200:
-                raise ValueError('Name must be less than 200 characters')
-            # Check if name contains only allowed characters (letters, spaces, hyphens, apostrophes)
-            if not re.match(r'^[A-Za-z\s\-\'\.]+$', v.strip()):
-                raise ValueError('Name contains invalid characters')
-            return v.strip()
-        return v
-
-    @field_validator('email')
-    def validate_email(cls, v):
-        if v is not None:
-            if len(v) > 254:
-                raise ValueError('Email must be less than 254 characters')
-        return v
-
 class Reader(ReaderBase):
     id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class Loan(Borrow):
+    book: Book
+
+class ReaderProfile(Reader):
+    # Open loans, oldest first
+    loans: List[Loan]
+
+# POST /readers/bulk: what to do with an email that already exists
+ImportMode = Literal["update", "skip"]
+
+class ReaderImportError(BaseModel):
+    line: int
+    error: str
+
+class ReaderImportResult(BaseModel):
+    inserted: int
+    updated: int
+    skipped: int
+    rejected: int
+    # The first READER_IMPORT_MAX_ERRORS rejected lines
+    errors: List[ReaderImportError]
@@ -1,84 +1,38 @@
-from pydantic import BaseModel, field_validator, EmailStr, Field
-from typing import Optional
-import re
+from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Annotated, Optional
+
+from .constraints import Rule
+
+
+# EmailStr already strips the address and rejects control characters and
+# addresses over 254 characters; only the lowercasing is left to do
+Email = Annotated[EmailStr, Rule(to_lower=True)]
 
 
 class UserBase(BaseModel):
     """Базовая схема пользователя"""
-    email: EmailStr = Field(..., max_length=254, description="User email address")
-
-    @field_validator('email')
-    @classmethod
-    def validate_email(cls, v: str) -> str:
-        """Валидация email"""
-        if len(v) > 254:
-            raise ValueError('Email must be less than 254 characters')
-        
-        # Дополнительная проверка на безопасность
-        if '\x00' in v or any(ord(c) < 32 for c in v):
-            raise ValueError('Email contains invalid characters')
-        
-        return v.lower().strip()
+    email: Email = Field(..., max_length=254, description="User email address")
 
 
 class UserCreate(UserBase):
     """Схема создания пользователя"""
-    password: str = Field(
-        ..., 
-        min_length=8, 
-        max_length=72,
-        description="Password (8-72 chars, must contain letters and numbers)"
-    )
-
-    @field_validator('password')
-    @classmethod
-    def validate_password(cls, v: str) -> str:
-        """Валидация пароля"""
-        if len(v) > 72:
-            raise ValueError('Password must not exceed 72 characters (bcrypt limitation)')
-        
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        
-        # Проверка на буквы и цифры
-        if not re.search(r'[A-Za-z]', v):
-            raise ValueError('Password must contain letters')
-        
-        if not re.search(r'\d', v):
-            raise ValueError('Password must contain numbers')
-        
-        # Проверка на null bytes и управляющие символы
-        if '\x00' in v or any(ord(c) < 32 for c in v if c not in '\t\n\r'):
-            raise ValueError('Password contains invalid characters')
-        
-        return v
+    # No Field() default here: merging it would keep only the last Rule
+    password: Annotated[
+        str,
+        Field(min_length=8, max_length=72, description="Password (8-72 chars, must contain letters and numbers)"),
+        Rule('Password must contain letters', pattern=r'[A-Za-z]'),
+        Rule('Password must contain numbers', pattern=r'\d'),
+        # Control characters other than tab and newlines
+        Rule('Password contains invalid characters', pattern=r'^[^\x00-\x08\x0b\x0c\x0e-\x1f]*$'),
+    ]
 
 
 class UserLogin(BaseModel):
     """Схема для логина"""
-    email: EmailStr = Field(..., max_length=254)
-    password: str = Field(..., max_length=72)
-
-    @field_validator('password')
-    @classmethod
-    def validate_password(cls, v: str) -> str:
-        """Базовая валидация пароля для логина"""
-        if len(v) > 72:
-            raise ValueError('Password must not exceed 72 characters')
-        
-        if '\x00' in v:
-            raise ValueError('Invalid password format')
-        
-        return v
-
-    @field_validator('email')
-    @classmethod
-    def validate_email(cls, v: str) -> str:
-        """Валидация email для логина"""
-        if len(v) > 254:
-            raise ValueError('Email must be less than 254 characters')
-        
-        return v.lower().strip()
+    email: Email = Field(..., max_length=254)
+    password: Annotated[
+        str, Field(max_length=72), Rule('Invalid password format', pattern=r'^[^\x00]*$'),
+    ]
 
 
 class User(UserBase):
@@ -0,0 +1,197 @@
+"""
+Production entrypoint: ``python -m app.server``.
+
+Runs ``WEB_CONCURRENCY`` uvicorn workers (default: one per CPU) on a socket
+shared from this supervisor process, with uvloop and httptools. A worker
+exits after ``SERVER_MAX_REQUESTS`` requests (plus jitter) to bound memory
+growth and is replaced right away. uvicorn's own multiprocess supervisor
+doesn't respawn workers, so that is handled here. A worker that dies right
+after starting (bad config, database down) is respawned with exponential
+backoff, and the supervisor exits after ``SERVER_MAX_FAILED_STARTS`` such
+failures in a row.
+
+On SIGTERM each worker first reports draining on ``/readyz`` for
+``SERVER_DRAIN_SECONDS``, giving the load balancer time to stop routing to
+it, then stops accepting connections and finishes in-flight requests.
+
+With more than one worker the in-process response store is turned off: a
+purge only reaches the worker that handled the write.
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import List, Optional
+
+import uvicorn
+
+from .config import (
+    SERVER_BACKLOG,
+    SERVER_DRAIN_SECONDS,
+    SERVER_GRACEFUL_TIMEOUT,
+    SERVER_HOST,
+    SERVER_KEEPALIVE_SECONDS,
+    SERVER_LIMIT_CONCURRENCY,
+    SERVER_MAX_FAILED_STARTS,
+    SERVER_MAX_REQUESTS,
+    SERVER_MAX_REQUESTS_JITTER,
+    SERVER_MIN_WORKER_UPTIME_SECONDS,
+    SERVER_PORT,
+    SERVER_RESPAWN_BACKOFF_MAX_SECONDS,
+    SERVER_WORKERS,
+)
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn server that fails readiness for a while before shutting down"""
+
+    def __init__(self, config: uvicorn.Config, drain_seconds: float = SERVER_DRAIN_SECONDS):
+        super().__init__(config)
+        self.drain_seconds = drain_seconds
+        self.draining = False
+
+    def handle_exit(self, sig, frame) -> None:
+        if self.draining or not self.drain_seconds:
+            # Second signal, or draining disabled: shut down now
+            super().handle_exit(sig, frame)
+            return
+        from .monitoring.health import readiness
+
+        self.draining = True
+        readiness.begin_draining()
+        logger.info("Draining for %.1fs before shutdown", self.drain_seconds)
+        timer = threading.Timer(self.drain_seconds, super().handle_exit, (sig, frame))
+        timer.daemon = True
+        timer.start()
+
+
+def run_worker(config: uvicorn.Config, sockets: List[socket.socket]) -> None:
+    """Entry point of a spawned worker process"""
+    config.configure_logging()
+    DrainingServer(config).run(sockets=sockets)
+
+
+def build_config(args: argparse.Namespace) -> uvicorn.Config:
+    return uvicorn.Config(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        loop="uvloop",
+        http="httptools",
+        backlog=args.backlog,
+        limit_concurrency=args.limit_concurrency or None,
+        timeout_keep_alive=args.keepalive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+        server_header=False,
+        access_log=False,
+    )
+
+
+class Supervisor:
+    """Keeps ``workers`` processes serving one shared socket, replacing any that exit"""
+
+    def __init__(self, config: uvicorn.Config, workers: int, max_requests: int, max_requests_jitter: int):
+        self.config = config
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.processes: List[multiprocessing.Process] = []
+        self.started_at: List[float] = []
+        self.failed_starts = 0
+        self.exit_code = 0
+        self.should_exit = threading.Event()
+
+    def spawn(self) -> multiprocessing.Process:
+        if self.max_requests:
+            self.config.limit_max_requests = self.max_requests + random.randint(0, self.max_requests_jitter)
+        # Spawn rather than fork: the worker imports the app fresh and reads its own config
+        process = multiprocessing.get_context("spawn").Process(target=run_worker, args=(self.config, [self.socket]))
+        process.start()
+        return process
+
+    def replace(self, index: int) -> bool:
+        """Respawn a dead worker, backing off after failed starts; False once giving up"""
+        process = self.processes[index]
+        process.join()
+        if time.monotonic() - self.started_at[index] < SERVER_MIN_WORKER_UPTIME_SECONDS:
+            self.failed_starts += 1
+        else:
+            self.failed_starts = 0
+        if self.failed_starts >= SERVER_MAX_FAILED_STARTS:
+            logger.error(
+                "Worker %s exited with code %s; %d failed starts in a row, giving up",
+                process.pid, process.exitcode, self.failed_starts,
+            )
+            return False
+        delay = min(2 ** self.failed_starts - 1, SERVER_RESPAWN_BACKOFF_MAX_SECONDS)
+        logger.info("Worker %s exited with code %s, replacing it in %.0fs", process.pid, process.exitcode, delay)
+        if self.should_exit.wait(delay):
+            return False
+        self.processes[index] = self.spawn()
+        self.started_at[index] = time.monotonic()
+        return True
+
+    def handle_exit(self, sig, frame) -> None:
+        self.should_exit.set()
+
+    def run(self) -> None:
+        self.socket = self.config.bind_socket()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, self.handle_exit)
+        logger.info("Starting %d workers", self.workers)
+        self.processes = [self.spawn() for _ in range(self.workers)]
+        self.started_at = [time.monotonic()] * self.workers
+
+        while not self.should_exit.wait(0.5):
+            for index, process in enumerate(self.processes):
+                if not process.is_alive() and not self.replace(index):
+                    if not self.should_exit.is_set():
+                        self.exit_code = 1
+                        self.should_exit.set()
+                    break
+
+        for process in self.processes:
+            process.terminate()  # SIGTERM: each worker drains, then shuts down gracefully
+        for process in self.processes:
+            process.join()
+        self.socket.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the Library Management API in production")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS)
+    parser.add_argument("--limit-concurrency", type=int, default=SERVER_LIMIT_CONCURRENCY)
+    parser.add_argument("--backlog", type=int, default=SERVER_BACKLOG)
+    parser.add_argument("--keepalive", type=int, default=SERVER_KEEPALIVE_SECONDS)
+    parser.add_argument("--max-requests", type=int, default=SERVER_MAX_REQUESTS)
+    parser.add_argument("--max-requests-jitter", type=int, default=SERVER_MAX_REQUESTS_JITTER)
+    parser.add_argument("--graceful-timeout", type=int, default=SERVER_GRACEFUL_TIMEOUT)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    config = build_config(args)
+    if args.workers > 1:
+        # Read by app.config in each spawned worker
+        os.environ["RESPONSE_CACHE_STORE_ENABLED"] = "false"
+        logger.info("In-process response store disabled with %d workers", args.workers)
+    supervisor = Supervisor(config, max(args.workers, 1), args.max_requests, args.max_requests_jitter)
+    supervisor.run()
+    sys.exit(supervisor.exit_code)
+
+
+if __name__ == "__main__":
+    main()
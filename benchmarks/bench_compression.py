@@ -0,0 +1,42 @@
+"""
+Bytes on the wire and compression CPU per page size.
+
+Encodes book list pages of several sizes the way the API returns them and
+compresses them with the encoders used by CompressionMiddleware at a few
+levels.
+
+    python -m benchmarks.bench_compression
+"""
+import time
+
+from app.middleware.compression import BrotliEncoder, GzipEncoder, brotli
+from app.responses import dump_json
+from benchmarks.bench_serialization import book_page
+
+PAGE_SIZES = (10, 100, 1000)
+ENCODERS = [("gzip-1", GzipEncoder, 1), ("gzip-6", GzipEncoder, 6), ("gzip-9", GzipEncoder, 9)]
+if brotli is not None:
+    ENCODERS += [("br-1", BrotliEncoder, 1), ("br-4", BrotliEncoder, 4), ("br-11", BrotliEncoder, 11)]
+
+
+def cpu_per_page(encoder_cls, level, body, budget=0.2):
+    rounds, start = 0, time.perf_counter()
+    while time.perf_counter() - start < budget:
+        encoder_cls(level).finish(body)
+        rounds += 1
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    print(f"{'rows':>6}{'encoding':>10}{'bytes':>10}{'ratio':>8}{'CPU ms':>9}")
+    for rows in PAGE_SIZES:
+        body = dump_json(book_page(rows))
+        print(f"{rows:>6}{'identity':>10}{len(body):>10}{1:>8.2f}{0:>9.3f}")
+        for name, encoder_cls, level in ENCODERS:
+            compressed = encoder_cls(level).finish(body)
+            seconds = cpu_per_page(encoder_cls, level, body)
+            print(f"{'':>6}{name:>10}{len(compressed):>10}{len(body) / len(compressed):>8.1f}{seconds * 1e3:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
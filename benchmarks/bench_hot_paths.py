@@ -0,0 +1,86 @@
+"""
+Per-request CPU hot paths, for regression tracking with pytest-benchmark.
+
+    pytest benchmarks/bench_hot_paths.py --benchmark-save=baseline
+    pytest benchmarks/bench_hot_paths.py --benchmark-compare --benchmark-compare-fail=median:10%
+
+The first command stores a baseline under ``.benchmarks/``; the second
+compares against the latest stored run and fails if any benchmark's median
+got more than 10% slower.
+"""
+from datetime import timedelta
+
+import pytest
+from jose import jwt
+
+from app import schemas
+from app.auth.jwt_handler import create_access_token, get_password_hash, verify_password
+from app.config import ALGORITHM, SECRET_KEY
+from app.responses import dump_json, list_adapter
+from benchmarks.bench_serialization import book_page
+
+BOOK_PAYLOAD = {
+    "title": "The Pragmatic Programmer",
+    "author": "Andrew Hunt",
+    "year": 1999,
+    "isbn": "9780201616224",
+    "copies": 3,
+    "description": "From journeyman to master.",
+}
+USER_PAYLOAD = {"email": "Staff.Member@Example.com", "password": "Secure123Pass"}
+
+
+@pytest.fixture(scope="module")
+def token():
+    return create_access_token({"sub": "staff@example.com"}, timedelta(minutes=30))
+
+
+@pytest.fixture(scope="module")
+def password_hash():
+    return get_password_hash(USER_PAYLOAD["password"])
+
+
+@pytest.mark.benchmark(group="validation")
+def test_book_create_validation(benchmark):
+    book = benchmark(schemas.BookCreate.model_validate, BOOK_PAYLOAD)
+    assert book.title == BOOK_PAYLOAD["title"]
+
+
+@pytest.mark.benchmark(group="validation")
+def test_user_create_validation(benchmark):
+    user = benchmark(schemas.UserCreate.model_validate, USER_PAYLOAD)
+    assert user.email == "staff.member@example.com"
+
+
+@pytest.mark.benchmark(group="auth")
+def test_create_access_token(benchmark):
+    token = benchmark(create_access_token, {"sub": "staff@example.com"}, timedelta(minutes=30))
+    assert token.count(".") == 2
+
+
+@pytest.mark.benchmark(group="auth")
+def test_jwt_decode(benchmark, token):
+    payload = benchmark(jwt.decode, token, SECRET_KEY, algorithms=[ALGORITHM])
+    assert payload["sub"] == "staff@example.com"
+
+
+@pytest.mark.benchmark(group="auth")
+def test_verify_password(benchmark, password_hash):
+    # bcrypt is deliberately slow; a handful of rounds gives a stable median
+    result = benchmark.pedantic(
+        verify_password, args=(USER_PAYLOAD["password"], password_hash), rounds=5, warmup_rounds=1,
+    )
+    assert result is True
+
+
+@pytest.mark.benchmark(group="serialization")
+@pytest.mark.parametrize("rows", [20, 100])
+def test_book_list_response(benchmark, rows):
+    # What FastAPI does with row dicts for response_model=List[schemas.Book], then FastJSONResponse.render
+    adapter = list_adapter(schemas.Book)
+    page = [book.model_dump() for book in book_page(rows)]
+
+    def render():
+        return dump_json(adapter.dump_python(adapter.validate_python(page), mode="json"))
+
+    assert benchmark(render).startswith(b"[{")
@@ -0,0 +1,94 @@
+"""
+ISBN lookups: canonical ISBNs on the unique index vs matching any spelling.
+
+Seeds a SQLite database with books whose ISBNs are stored in canonical
+ISBN-13 form and times, per scanned ISBN, the ``GET /books/isbn/{isbn}`` and
+``POST /books/isbn:lookup`` handlers (canonicalize, then an index lookup).
+The baseline is what finding a book by a hyphenated scan needs when stored
+ISBNs keep their original spelling: stripping separators on both sides of
+the comparison, which no index can serve.
+
+    python -m benchmarks.bench_isbn_lookup [books] [rounds]
+"""
+import random
+import sys
+import time
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models, schemas
+from app.api.books import BOOK_COLUMNS, get_book_by_isbn, lookup_books_by_isbn
+from app.config import ISBN_LOOKUP_MAX_BATCH
+from app.database import Base
+from app.isbn import check_digit13
+
+REPEATS = 5
+
+
+def isbn13(i):
+    first12 = f"978{i:09d}"
+    return first12 + check_digit13(first12)
+
+
+def hyphenated(isbn):
+    return f"{isbn[:3]}-{isbn[3]}-{isbn[4:9]}-{isbn[9:12]}-{isbn[12]}"
+
+
+def seed(session_factory, books):
+    with session_factory() as session:
+        session.execute(insert(models.Book), [
+            {"title": f"Book {i}", "author": f"Author {i % 97}", "isbn": isbn13(i), "copies": 1}
+            for i in range(books)
+        ])
+        session.commit()
+
+
+def unindexed_lookup(isbn, db):
+    bare = isbn.replace("-", "").replace(" ", "")
+    stored = func.replace(func.replace(models.Book.isbn, "-", ""), " ", "")
+    return db.execute(select(*BOOK_COLUMNS).where(stored == bare)).mappings().first()
+
+
+def best_of(func, rounds):
+    func()
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / rounds
+
+
+def main(books=50000, rounds=200):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    seed(session_factory, books)
+
+    rng = random.Random(7)
+    scans = [hyphenated(isbn13(rng.randrange(books))) for _ in range(ISBN_LOOKUP_MAX_BATCH)]
+    batch = schemas.IsbnLookup(isbns=scans)
+
+    with session_factory() as db:
+        assert get_book_by_isbn(scans[0], db=db)["isbn"] == scans[0].replace("-", "")
+        assert all(result["book"] for result in lookup_books_by_isbn(batch, db=db)["results"])
+        assert unindexed_lookup(scans[0], db) is not None
+
+        scan = iter(scans * (rounds * REPEATS + 1))
+        single = best_of(lambda: get_book_by_isbn(next(scan), db=db), rounds)
+        batched = best_of(lambda: lookup_books_by_isbn(batch, db=db), max(1, rounds // 20)) / len(scans)
+        scan = iter(scans * 10)
+        unindexed = best_of(lambda: unindexed_lookup(next(scan), db), 2)
+
+    print(f"{books} books, best of {REPEATS}\n")
+    print(f"{'lookup':<38}{'us/ISBN':>10}")
+    print(f"{'separator-insensitive scan':<38}{unindexed * 1e6:>10.1f}")
+    print(f"{'GET /books/isbn/{isbn}':<38}{single * 1e6:>10.1f}")
+    print(f"{f'POST /books/isbn:lookup ({len(scans)} ISBNs)':<38}{batched * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,100 @@
+"""
+List endpoint responses: response-model validation vs trusted rows.
+
+For 1k-row pages of books, readers and borrows, compares what FastAPI does
+with ``response_model=List[...]`` (validate every row against the schema,
+serialize the models back to JSON-compatible data, encode with orjson) with
+``trusted_rows``, which serializes the rows read from the database directly
+with a prebuilt serializer. Both produce the same bytes.
+
+    python -m benchmarks.bench_list_responses [rows] [rounds]
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+
+from app import schemas
+from app.main import app
+from app.responses import FastJSONResponse, trusted_rows
+
+REPEATS = 5
+
+
+def book_rows(rows):
+    return [
+        {
+            "title": f"Book {i}",
+            "author": f"Author {i % 97}",
+            "year": 1900 + i % 120,
+            "isbn": "9780134685991",
+            "copies": i % 5,
+            "description": "A fairly ordinary description of a library book.",
+            "id": i + 1,
+        }
+        for i in range(rows)
+    ]
+
+
+def reader_rows(rows):
+    # Reader names may only contain letters
+    return [
+        {"name": f"Reader {chr(ord('A') + i % 26)}", "email": f"reader{i}@example.com", "id": i + 1}
+        for i in range(rows)
+    ]
+
+
+def borrow_rows(rows):
+    start = datetime(2024, 3, 1, 9, 15, 30, 123456)
+    return [
+        {
+            "book_id": i + 1,
+            "reader_id": i % 50 + 1,
+            "id": i + 1,
+            "borrow_date": start + timedelta(minutes=i),
+            "return_date": None if i % 3 else start + timedelta(days=7),
+        }
+        for i in range(rows)
+    ]
+
+
+def response_field(path):
+    route = next(route for route in app.routes if getattr(route, "path", None) == path and "GET" in route.methods)
+    return route.response_field
+
+
+def response_model_path(field, rows):
+    # fastapi.routing.serialize_response followed by the default response class
+    value, errors = field.validate(rows, {}, loc=("response",))
+    assert not errors
+    return FastJSONResponse(content=field.serialize(value, mode="json")).body
+
+
+def best_of(func, rounds):
+    func()
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / rounds
+
+
+def main(rows=1000, rounds=10):
+    cases = {
+        "books": ("/books/", schemas.Book, book_rows(rows)),
+        "readers": ("/readers/", schemas.Reader, reader_rows(rows)),
+        "borrows": ("/borrows/", schemas.Borrow, borrow_rows(rows)),
+    }
+    print(f"{rows}-row pages, best of {REPEATS} x {rounds} rounds\n")
+    print(f"{'page':<10}{'response_model us/row':>23}{'trusted us/row':>16}{'saved us/row':>14}")
+    for name, (path, model, data) in cases.items():
+        field = response_field(path)
+        assert response_model_path(field, data) == trusted_rows(model, data).body
+        validated = best_of(lambda: response_model_path(field, data), rounds) / rows * 1e6
+        trusted = best_of(lambda: trusted_rows(model, data), rounds) / rows * 1e6
+        print(f"{name:<10}{validated:>23.2f}{trusted:>16.2f}{validated - trusted:>14.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,109 @@
+"""
+List pages: ORM hydration vs column rows.
+
+Measures the per-row CPU time and peak memory of producing a list page the way
+FastAPI does it (fetch, validate into the response schema, serialize) for the
+old ORM query and the column-level select used by the list endpoints.
+
+    python -m benchmarks.bench_list_rows [page_size] [rounds]
+"""
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models, schemas
+from app.api.books import BOOK_COLUMNS
+from app.api.borrows import BORROW_COLUMNS
+from app.database import Base
+
+REPEATS = 5
+
+
+def seed(session, rows):
+    session.add_all(
+        models.Book(
+            title=f"Book {i}",
+            author=f"Author {i % 97}",
+            year=1900 + i % 120,
+            isbn=f"978{i:010d}",
+            copies=i % 5,
+            description="A fairly ordinary description of a library book." * 2,
+        )
+        for i in range(rows)
+    )
+    session.add(models.Reader(name="Bench Reader", email="bench@example.com"))
+    session.flush()
+    session.add_all(
+        models.Borrow(book_id=i + 1, reader_id=1, borrow_date=datetime(2024, 1, 1, 10, 30))
+        for i in range(rows)
+    )
+    session.commit()
+
+
+def measure(session_factory, fetch, adapter, rounds, rows):
+    def page():
+        session = session_factory()
+        try:
+            return adapter.dump_python(adapter.validate_python(fetch(session)), mode="json")
+        finally:
+            session.close()
+
+    page()
+    # Best of several repeats keeps scheduler noise out of the comparison
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.process_time()
+        for _ in range(rounds):
+            page()
+        best = min(best, time.process_time() - start)
+    cpu_per_row = best / (rounds * rows)
+
+    tracemalloc.start()
+    page()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu_per_row * 1e6, peak / rows
+
+
+def main(rows=100, rounds=50):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with session_factory() as session:
+        seed(session, rows)
+
+    cases = {
+        "books": (
+            TypeAdapter(List[schemas.Book]),
+            lambda s: s.query(models.Book).limit(rows).all(),
+            lambda s: [
+                dict(row)
+                for row in s.execute(select(*BOOK_COLUMNS).order_by(models.Book.id).limit(rows)).mappings()
+            ],
+        ),
+        "borrows": (
+            TypeAdapter(List[schemas.Borrow]),
+            lambda s: s.query(models.Borrow).all(),
+            lambda s: [dict(row) for row in s.execute(select(*BORROW_COLUMNS)).mappings()],
+        ),
+    }
+
+    print(f"{rows}-row pages, best of {REPEATS} x {rounds} rounds, in-memory SQLite\n")
+    print(f"{'page':<10}{'path':<8}{'CPU us/row':>12}{'peak B/row':>12}")
+    for name, (adapter, orm_fetch, row_fetch) in cases.items():
+        orm = measure(session_factory, orm_fetch, adapter, rounds, rows)
+        core = measure(session_factory, row_fetch, adapter, rounds, rows)
+        print(f"{name:<10}{'ORM':<8}{orm[0]:>12.2f}{orm[1]:>12.0f}")
+        print(f"{'':<10}{'rows':<8}{core[0]:>12.2f}{core[1]:>12.0f}")
+        print(f"{'':<10}{'saved':<8}{1 - core[0] / orm[0]:>12.0%}{1 - core[1] / orm[1]:>12.0%}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
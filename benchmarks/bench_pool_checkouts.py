@@ -0,0 +1,109 @@
+"""
+Pool checkouts per request: eager sessions vs lazy sessions + principal cache.
+
+Runs the real application against a throwaway file-based SQLite database
+(QueuePool, like production) and counts pool checkouts and Session objects
+created per request for a few request shapes, including 4xx paths.
+
+    python -m benchmarks.bench_pool_checkouts [requests_per_scenario]
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+_tmpdir = tempfile.mkdtemp(prefix="bench-pool-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench.db"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app import database  # noqa: E402
+from app.auth import jwt_handler  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+class Counters:
+    def __init__(self):
+        self.checkouts = 0
+        self.sessions = 0
+
+    def on_checkout(self, *args):
+        self.checkouts += 1
+
+
+def eager_get_db():
+    """get_db as it was before lazy sessions"""
+    db = database.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def run(client, counters, scenarios, requests):
+    results = {}
+    for name, call in scenarios.items():
+        call()  # warm up (and fill the principal cache when enabled)
+        counters.checkouts = counters.sessions = 0
+        for _ in range(requests):
+            call()
+        results[name] = (counters.checkouts / requests, counters.sessions / requests)
+    return results
+
+
+def main(requests=200):
+    database.Base.metadata.create_all(bind=database.engine)
+    counters = Counters()
+    event.listen(database.engine.pool, "checkout", counters.on_checkout)
+
+    session_factory = database.SessionLocal
+
+    class CountingFactory:
+        def __call__(self, *args, **kwargs):
+            counters.sessions += 1
+            return session_factory(*args, **kwargs)
+
+    database.SessionLocal = CountingFactory()
+
+    client = TestClient(app)
+    client.post("/auth/register", json={"email": "bench@example.com", "password": "benchpass123"})
+    token = client.post(
+        "/auth/login", data={"username": "bench@example.com", "password": "benchpass123"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    scenarios = {
+        "POST /borrows/borrow (422 body)": lambda: client.post(
+            "/borrows/borrow", json={"book_id": -1, "reader_id": 0}, headers=headers
+        ),
+        "POST /books/ (422 body)": lambda: client.post("/books/", json={"title": ""}, headers=headers),
+        "GET /auth/me": lambda: client.get("/auth/me", headers=headers),
+        "GET /books/": lambda: client.get("/books/"),
+    }
+
+    # Before: eager Session per request, no principal cache
+    app.dependency_overrides[database.get_db] = eager_get_db
+    jwt_handler.PRINCIPAL_CACHE_TTL_SECONDS = 0
+    jwt_handler.clear_principal_cache()
+    before = run(client, counters, scenarios, requests)
+
+    # After: lazy Session + principal cache
+    app.dependency_overrides.clear()
+    jwt_handler.PRINCIPAL_CACHE_TTL_SECONDS = 30
+    after = run(client, counters, scenarios, requests)
+
+    database.SessionLocal = session_factory
+    print(f"{requests} requests per scenario, file-based SQLite with QueuePool\n")
+    print(f"{'scenario':<34}{'checkouts/req':>22}{'sessions/req':>22}")
+    print(f"{'':<34}{'before':>11}{'after':>11}{'before':>11}{'after':>11}")
+    for name in scenarios:
+        (cb, sb), (ca, sa) = before[name], after[name]
+        print(f"{name:<34}{cb:>11.2f}{ca:>11.2f}{sb:>11.2f}{sa:>11.2f}")
+
+
+if __name__ == "__main__":
+    try:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
+    finally:
+        shutil.rmtree(_tmpdir, ignore_errors=True)
@@ -0,0 +1,100 @@
+"""
+Reader roster import: POST /readers/ per row vs POST /readers/bulk.
+
+Runs the real application against a throwaway file-based SQLite database.
+Imports a generated roster as streamed NDJSON and CSV through
+``POST /readers/bulk``, re-imports it in "update" mode (every row
+conflicts), and times a sample of one-at-a-time ``POST /readers/`` calls,
+the previous import path. Reports readers per second and the projected
+time for 500,000 readers.
+
+    python -m benchmarks.bench_reader_import [readers] [single_requests]
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+_tmpdir = tempfile.mkdtemp(prefix="bench-import-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench.db"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import database  # noqa: E402
+from app.main import app  # noqa: E402
+
+ROSTER = 500000
+
+
+def name(i):
+    # Reader names may only contain letters
+    letters = "".join(chr(ord("a") + int(digit)) for digit in str(i))
+    return f"Patron {letters.capitalize()}"
+
+
+def ndjson_lines(prefix, readers):
+    for i in range(readers):
+        yield (json.dumps({"name": name(i), "email": f"{prefix}{i}@example.com"}) + "\n").encode()
+
+
+def csv_lines(prefix, readers):
+    yield b"name,email\n"
+    for i in range(readers):
+        yield f"{name(i)},{prefix}{i}@example.com\n".encode()
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main(readers=100000, single_requests=500):
+    database.Base.metadata.create_all(bind=database.engine)
+    client = TestClient(app)
+    client.post("/auth/register", json={"email": "bench@example.com", "password": "benchpass123"})
+    token = client.post(
+        "/auth/login", data={"username": "bench@example.com", "password": "benchpass123"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def bulk(lines, content_type, mode="skip"):
+        response = client.post(
+            "/readers/bulk", params={"mode": mode}, content=lines,
+            headers={**headers, "Content-Type": content_type},
+        )
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    def single():
+        for i in range(single_requests):
+            response = client.post("/readers/", json={"name": name(i), "email": f"single{i}@example.com"}, headers=headers)
+            assert response.status_code == 200
+
+    runs = [
+        ("POST /readers/ per row", single_requests, timed(single)[1]),
+    ]
+    for label, lines, content_type, mode in (
+        ("bulk NDJSON, new readers", ndjson_lines("ndjson", readers), "application/x-ndjson", "skip"),
+        ("bulk CSV, new readers", csv_lines("csv", readers), "text/csv", "skip"),
+        ("bulk NDJSON, update existing", ndjson_lines("ndjson", readers), "application/x-ndjson", "update"),
+    ):
+        result, seconds = timed(lambda: bulk(lines, content_type, mode))
+        assert result["rejected"] == 0 and result["inserted"] + result["updated"] + result["skipped"] == readers
+        runs.append((label, readers, seconds))
+
+    print(f"{readers} readers per bulk import, {single_requests} single requests\n")
+    print(f"{'import':<32}{'readers/s':>11}{f'{ROSTER // 1000}k readers':>14}")
+    for label, rows, seconds in runs:
+        rate = rows / seconds
+        print(f"{label:<32}{rate:>11,.0f}{ROSTER / rate / 60:>12.1f} min")
+
+
+if __name__ == "__main__":
+    try:
+        main(*(int(arg) for arg in sys.argv[1:3]))
+    finally:
+        shutil.rmtree(_tmpdir, ignore_errors=True)
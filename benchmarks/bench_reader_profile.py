@@ -0,0 +1,90 @@
+"""
+Reader card: chained requests vs GET /readers/{reader_id}/profile.
+
+Runs the real application against a throwaway file-based SQLite database
+and builds the card of a reader with three open loans (the maximum) both
+ways: ``GET /readers/{id}``, ``GET /borrows/reader/{id}/borrowed`` and a
+``GET /books/{id}`` per loan, or one profile request. Reports requests, SQL
+statements and in-process latency per card. The response cache is disabled
+so both flows hit the database.
+
+    python -m benchmarks.bench_reader_profile [cards]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+_tmpdir = tempfile.mkdtemp(prefix="bench-profile-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench.db"
+os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app import database, models  # noqa: E402
+from app.main import app  # noqa: E402
+
+REPEATS = 5
+LOANS = 3
+
+
+def seed():
+    with database.SessionLocal() as session:
+        reader = models.Reader(name="Bench Reader", email="bench.reader@example.com")
+        books = [models.Book(title=f"Book {i}", author="Bench Author", copies=1) for i in range(LOANS)]
+        session.add(reader)
+        session.add_all(books)
+        session.flush()
+        session.add_all(models.Borrow(book_id=book.id, reader_id=reader.id) for book in books)
+        session.commit()
+        return reader.id
+
+
+def chained(client, reader_id):
+    requests = 2
+    client.get(f"/readers/{reader_id}").json()
+    for loan in client.get(f"/borrows/reader/{reader_id}/borrowed").json():
+        client.get(f"/books/{loan['book_id']}").json()
+        requests += 1
+    return requests
+
+
+def profile(client, reader_id):
+    client.get(f"/readers/{reader_id}/profile").json()
+    return 1
+
+
+def measure(card, cards, statements):
+    card()
+    best = float("inf")
+    for _ in range(REPEATS):
+        statements.clear()
+        start = time.perf_counter()
+        for _ in range(cards):
+            requests = card()
+        best = min(best, time.perf_counter() - start)
+    # statements holds the last repeat
+    return requests, len(statements) / cards, best / cards
+
+
+def main(cards=200):
+    database.Base.metadata.create_all(bind=database.engine)
+    reader_id = seed()
+    statements = []
+    event.listen(database.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    client = TestClient(app)
+    print(f"card with {LOANS} open loans, best of {REPEATS} x {cards} cards\n")
+    print(f"{'flow':<34}{'requests':>10}{'queries':>9}{'ms/card':>9}")
+    for name, card in (("reader + borrowed + book per loan", chained), ("/readers/{id}/profile", profile)):
+        requests, queries, seconds = measure(lambda: card(client, reader_id), cards, statements)
+        print(f"{name:<34}{requests:>10}{queries:>9.0f}{seconds * 1e3:>9.2f}")
+
+
+if __name__ == "__main__":
+    try:
+        main(*(int(arg) for arg in sys.argv[1:2]))
+    finally:
+        shutil.rmtree(_tmpdir, ignore_errors=True)
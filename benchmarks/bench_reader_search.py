@@ -0,0 +1,92 @@
+"""
+Reader search: lower() expression indexes vs a full scan.
+
+Seeds a SQLite database with readers and times ``GET /readers/search``'s
+query (case-insensitive name or email prefix, first page of 20) with the
+``ix_readers_name_lower``/``ix_readers_email_lower`` indexes and after
+dropping them, plus the old workaround of paging every reader to the client
+and filtering there.
+
+    python -m benchmarks.bench_reader_search [readers] [rounds]
+"""
+import random
+import string
+import sys
+import time
+
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models
+from app.api.readers import READER_COLUMNS, search_readers
+from app.database import Base
+
+REPEATS = 5
+PAGE = 100
+
+
+def seed(session_factory, readers):
+    rng = random.Random(3)
+    rows = []
+    for i in range(readers):
+        first = "".join(rng.choices(string.ascii_lowercase, k=6)).capitalize()
+        last = "".join(rng.choices(string.ascii_lowercase, k=8)).capitalize()
+        rows.append({"name": f"{first} {last}", "email": f"{first.lower()}.{last.lower()}{i}@example.com"})
+    with session_factory() as session:
+        session.execute(insert(models.Reader), rows)
+        session.commit()
+        session.execute(text("ANALYZE"))
+
+
+def client_side_filter(prefix, db):
+    # Page through GET /readers/ and match locally
+    matches, skip = [], 0
+    while True:
+        page = db.execute(
+            select(*READER_COLUMNS).order_by(models.Reader.id).offset(skip).limit(PAGE)
+        ).mappings().all()
+        matches.extend(row for row in page if row["name"].lower().startswith(prefix) or row["email"].startswith(prefix))
+        if len(page) < PAGE:
+            return matches
+        skip += PAGE
+
+
+def best_of(func, rounds):
+    func()
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / rounds
+
+
+def main(readers=100000, rounds=50):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    seed(session_factory, readers)
+
+    prefixes = ["ab", "mar", "qx", "kol"]
+    with session_factory() as db:
+        def search():
+            for prefix in prefixes:
+                search_readers(q=prefix, skip=0, limit=20, db=db)
+
+        indexed = best_of(search, rounds) / len(prefixes)
+        for name in ("ix_readers_name_lower", "ix_readers_email_lower"):
+            db.execute(text(f"DROP INDEX {name}"))
+        scan = best_of(search, max(1, rounds // 10)) / len(prefixes)
+        paged = best_of(lambda: client_side_filter(prefixes[0], db), 1)
+
+    print(f"{readers} readers, best of {REPEATS}\n")
+    print(f"{'search':<34}{'ms/query':>10}")
+    print(f"{'page through /readers/ + filter':<34}{paged * 1e3:>10.2f}")
+    print(f"{'/readers/search, no index':<34}{scan * 1e3:>10.2f}")
+    print(f"{'/readers/search, lower() indexes':<34}{indexed * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
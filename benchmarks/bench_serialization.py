@@ -0,0 +1,79 @@
+"""
+Response serialization for 1k-row book pages.
+
+Compares the encoders the response path can use once the handler has
+returned validated data:
+
+- stdlib:     dicts from the response model, then starlette's json.dumps
+- orjson:     dicts from the response model, then FastJSONResponse (orjson)
+- model json: pydantic-core writes the validated models straight to bytes
+- jsonable:   fastapi.encoders.jsonable_encoder + json.dumps (routes without
+              a response model), for reference
+
+    python -m benchmarks.bench_serialization [rows] [rounds]
+"""
+import sys
+import time
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app import schemas
+from app.responses import FastJSONResponse, list_adapter
+
+REPEATS = 5
+
+
+def book_page(rows):
+    return [
+        schemas.Book(
+            id=i + 1,
+            title=f"Book {i}",
+            author=f"Author {i % 97}",
+            year=1900 + i % 120,
+            isbn=f"978{i:010d}",
+            copies=i % 5,
+            description="A fairly ordinary description of a library book." * 2,
+        )
+        for i in range(rows)
+    ]
+
+
+def best_of(func, rounds):
+    func()
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / rounds
+
+
+def main(rows=1000, rounds=20):
+    books = book_page(rows)
+    adapter = TypeAdapter(List[schemas.Book])
+    stdlib = JSONResponse(content=None)
+    fast = FastJSONResponse(content=None)
+
+    cases = {
+        "stdlib": lambda: stdlib.render(adapter.dump_python(books, mode="json")),
+        "orjson": lambda: fast.render(adapter.dump_python(books, mode="json")),
+        "model json": lambda: fast.render(books),
+        "jsonable": lambda: stdlib.render(jsonable_encoder(books)),
+    }
+    assert cases["stdlib"]() == cases["orjson"]() == list_adapter(schemas.Book).dump_json(books)
+
+    baseline = None
+    print(f"{rows}-row book page, best of {REPEATS} x {rounds} rounds\n")
+    print(f"{'encoder':<12}{'ms/page':>10}{'us/row':>10}{'speedup':>10}")
+    for name, func in cases.items():
+        seconds = best_of(func, rounds)
+        baseline = baseline or seconds
+        print(f"{name:<12}{seconds * 1e3:>10.2f}{seconds / rows * 1e6:>10.2f}{baseline / seconds:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,81 @@
+"""
+Input validation throughput for bulk imports.
+
+Validates batches of valid ``BookCreate``, ``ReaderCreate``, ``BorrowCreate``
+and ``UserCreate`` payloads, the way an import validates every row before
+writing, and reports validated objects per second for each schema.
+
+    python -m benchmarks.bench_validation [rows] [rounds]
+"""
+import sys
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app import schemas
+from app.isbn import check_digit13
+
+REPEATS = 5
+
+
+def isbn(i):
+    # Hyphenated ISBN-13 with a valid check digit
+    first12 = f"9780{i % 100000:05d}{i % 1000:03d}"
+    return f"978-0-{first12[4:9]}-{first12[9:]}-{check_digit13(first12)}"
+
+
+def book_rows(rows):
+    return [
+        {
+            "title": f"  Imported Book {i}  ",
+            "author": f"Author {i % 97}",
+            "year": 1900 + i % 120,
+            "isbn": isbn(i),
+            "copies": i % 5,
+            "description": "A fairly ordinary description of a library book.",
+        }
+        for i in range(rows)
+    ]
+
+
+def reader_rows(rows):
+    return [{"name": "Reader O'Neil-Smith", "email": f"reader{i}@example.com"} for i in range(rows)]
+
+
+def borrow_rows(rows):
+    return [{"book_id": i + 1, "reader_id": i % 50 + 1} for i in range(rows)]
+
+
+def user_rows(rows):
+    return [{"email": f"Staff{i}@Example.com", "password": f"password{i}"} for i in range(rows)]
+
+
+def best_of(func, rounds):
+    func()
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / rounds
+
+
+def main(rows=1000, rounds=10):
+    cases = {
+        "BookCreate": (schemas.BookCreate, book_rows(rows)),
+        "ReaderCreate": (schemas.ReaderCreate, reader_rows(rows)),
+        "BorrowCreate": (schemas.BorrowCreate, borrow_rows(rows)),
+        "UserCreate": (schemas.UserCreate, user_rows(rows)),
+    }
+    print(f"{rows}-row batches, best of {REPEATS} x {rounds} rounds\n")
+    print(f"{'schema':<14}{'objects/s':>12}{'us/object':>11}")
+    for name, (model, payload) in cases.items():
+        adapter = TypeAdapter(List[model])
+        seconds = best_of(lambda: adapter.validate_python(payload), rounds)
+        print(f"{name:<14}{rows / seconds:>12,.0f}{seconds / rows * 1e6:>11.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,115 @@
+"""
+Throughput of the production launcher at different worker counts.
+
+Starts ``python -m app.server`` against a seeded throwaway SQLite database for
+each worker count and drives ``GET /books/?limit=20`` from keep-alive client
+threads for a fixed duration.
+
+    python -m benchmarks.bench_workers [duration] [worker counts...]
+"""
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from benchmarks.bench_list_rows import seed
+
+CLIENT_THREADS = 32
+PATH = "/books/?limit=20"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(port: int, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/healthz")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def drive(port: int, duration: float):
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client():
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        own = []
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                connection.request("GET", PATH)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    raise OSError(response.status)
+            except (OSError, http.client.HTTPException):
+                errors[0] += 1
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+                continue
+            own.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(own)
+
+    threads = [threading.Thread(target=client) for _ in range(CLIENT_THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return len(latencies) / duration, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)], errors[0]
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    worker_counts = [int(value) for value in sys.argv[2:]] or [1, 2, 4, 8]
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        engine = create_engine(url)
+        Base.metadata.create_all(engine)
+        seed(sessionmaker(bind=engine)(), 1000)
+        engine.dispose()
+
+        print(f"{os.cpu_count()} CPUs, {CLIENT_THREADS} client threads, {duration:.0f}s per run")
+        print(f"{'workers':>8}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        for workers in worker_counts:
+            port = free_port()
+            server = subprocess.Popen(
+                [sys.executable, "-m", "app.server", "--workers", str(workers), "--port", str(port),
+                 "--host", "127.0.0.1"],
+                env={**os.environ, "DATABASE_URL": url, "SERVER_DRAIN_SECONDS": "0"},
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                wait_ready(port)
+                drive(port, 1.0)  # warm up every worker
+                rps, p50, p99, errors = drive(port, duration)
+                print(f"{workers:>8}{rps:>10.0f}{p50 * 1e3:>9.1f}{p99 * 1e3:>9.1f}{errors:>8}")
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == "__main__":
+    main()
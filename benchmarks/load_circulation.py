@@ -0,0 +1,324 @@
+"""
+Load test for the circulation workload.
+
+Seeds a local database with books, readers and staff users, starts
+``python -m app.server`` on it (or targets ``--url``, seeding that server's
+``--database-url`` unless ``--no-seed``), logs every staff user in, then
+runs virtual users that browse the catalog, search readers at the desk,
+borrow and return books. Each virtual user picks an operation from ``MIX`` per
+iteration; ``--rng-seed`` makes the sequence of operations reproducible.
+
+Reports requests per second and p50/p95/p99 latency per endpoint and saves
+the numbers as JSON. ``--compare`` prints the change against an earlier run.
+
+    python -m benchmarks.load_circulation --duration 30 --users 50 --output results.json
+    python -m benchmarks.load_circulation --compare results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.auth.jwt_handler import get_password_hash
+from app.database import Base
+from benchmarks.bench_workers import free_port, wait_ready
+
+# Operation -> weight
+MIX = {
+    "browse_catalog": 40,
+    "view_book": 30,
+    "search_readers": 10,
+    "borrow_book": 10,
+    "return_book": 10,
+}
+
+STAFF_PASSWORD = "LoadTest123"
+
+
+def isbn13(n: int) -> str:
+    digits = f"978{n:09d}"
+    check = (10 - sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digits)) % 10) % 10
+    return digits + str(check)
+
+
+def letters(n: int) -> str:
+    # Reader names may only contain letters
+    name = ""
+    while True:
+        n, remainder = divmod(n, 26)
+        name = chr(ord("a") + remainder) + name
+        if not n:
+            return name.capitalize()
+
+
+def seed(database_url: str, books: int, readers: int, staff: int) -> None:
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    # One bcrypt hash for every staff account keeps seeding fast
+    hashed_password = get_password_hash(STAFF_PASSWORD)
+    session.add_all(
+        models.User(email=f"staff{i}@load.test", hashed_password=hashed_password, is_active=True)
+        for i in range(staff)
+    )
+    session.add_all(
+        models.Book(
+            title=f"Load Book {i}",
+            author=f"Author {i % 211}",
+            year=1950 + i % 70,
+            isbn=isbn13(i),
+            copies=3,
+            description="Seeded for load testing.",
+        )
+        for i in range(books)
+    )
+    session.add_all(
+        models.Reader(name=f"Reader {letters(i)}", email=f"reader{i}@load.test")
+        for i in range(readers)
+    )
+    session.commit()
+    session.close()
+    engine.dispose()
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.rejected: Dict[str, int] = defaultdict(int)
+        self.recording = False
+
+    async def request(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            if self.recording:
+                self.errors[label] += 1
+            return None
+        if self.recording:
+            self.latencies[label].append(time.perf_counter() - start)
+            if response.status_code >= 500:
+                self.errors[label] += 1
+            elif response.status_code >= 400:
+                self.rejected[label] += 1
+        return response
+
+
+class VirtualUser:
+    def __init__(self, client, recorder: Recorder, token: str, books: int, readers: int, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.books = books
+        self.readers = readers
+        self.rng = rng
+        # (book_id, reader_id) borrowed by this user and not yet returned
+        self.loans: List[tuple] = []
+
+    async def run(self, stop_at: float) -> None:
+        operations, weights = zip(*MIX.items())
+        while time.monotonic() < stop_at:
+            operation = self.rng.choices(operations, weights)[0]
+            await getattr(self, operation)()
+
+    async def browse_catalog(self):
+        skip = self.rng.randrange(0, max(self.books - 20, 1))
+        await self.recorder.request(self.client, "GET /books/", "GET", f"/books/?skip={skip}&limit=20")
+
+    async def view_book(self):
+        book_id = self.rng.randint(1, self.books)
+        await self.recorder.request(self.client, "GET /books/{book_id}", "GET", f"/books/{book_id}")
+
+    async def search_readers(self):
+        # A partial email typed at the desk: "reader12" matches reader12, reader120...
+        query = f"reader{self.rng.randint(1, self.readers)}"[:self.rng.randint(7, 10)]
+        await self.recorder.request(
+            self.client, "GET /readers/search", "GET", "/readers/search",
+            params={"q": query}, headers=self.headers,
+        )
+
+    async def borrow_book(self):
+        loan = (self.rng.randint(1, self.books), self.rng.randint(1, self.readers))
+        response = await self.recorder.request(
+            self.client, "POST /borrows/borrow", "POST", "/borrows/borrow",
+            json={"book_id": loan[0], "reader_id": loan[1]}, headers=self.headers,
+        )
+        if response is not None and response.status_code == 200:
+            self.loans.append(loan)
+
+    async def return_book(self):
+        if not self.loans:
+            await self.borrow_book()
+            return
+        book_id, reader_id = self.loans.pop(self.rng.randrange(len(self.loans)))
+        await self.recorder.request(
+            self.client, "POST /borrows/return", "POST", "/borrows/return",
+            json={"book_id": book_id, "reader_id": reader_id}, headers=self.headers,
+        )
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def summarize(recorder: Recorder, duration: float) -> Dict[str, dict]:
+    endpoints = {}
+    for label in sorted(set(recorder.latencies) | set(recorder.errors)):
+        latencies = sorted(recorder.latencies[label])
+        endpoints[label] = {
+            "requests": len(latencies),
+            "rps": round(len(latencies) / duration, 2),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "rejected": recorder.rejected[label],
+            "errors": recorder.errors[label],
+        }
+    return endpoints
+
+
+async def login_all(base_url: str, staff: int) -> List[str]:
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        async def login(i):
+            response = await client.post(
+                "/auth/login", data={"username": f"staff{i}@load.test", "password": STAFF_PASSWORD},
+            )
+            response.raise_for_status()
+            return response.json()["access_token"]
+        return list(await asyncio.gather(*(login(i) for i in range(staff))))
+
+
+async def drive(args, base_url: str) -> dict:
+    tokens = await login_all(base_url, args.staff)
+    rng = random.Random(args.rng_seed)
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) as client:
+        users = [
+            VirtualUser(client, recorder, tokens[i % len(tokens)], args.books, args.readers,
+                        random.Random(rng.random()))
+            for i in range(args.users)
+        ]
+        # Warm-up: connections, caches and worker imports; not recorded
+        stop_at = time.monotonic() + args.warmup
+        await asyncio.gather(*(user.run(stop_at) for user in users))
+
+        recorder.recording = True
+        started = time.monotonic()
+        await asyncio.gather(*(user.run(started + args.duration) for user in users))
+        elapsed = time.monotonic() - started
+
+    endpoints = summarize(recorder, elapsed)
+    total = sum(endpoint["requests"] for endpoint in endpoints.values())
+    return {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {
+            key: getattr(args, key)
+            for key in ("duration", "warmup", "users", "staff", "books", "readers", "workers", "rng_seed")
+        },
+        "environment": {"python": platform.python_version(), "cpus": os.cpu_count()},
+        "mix": MIX,
+        "total": {"requests": total, "rps": round(total / elapsed, 2)},
+        "endpoints": endpoints,
+    }
+
+
+def print_report(results: dict, baseline: Optional[dict] = None) -> None:
+    print(f"{'endpoint':<42}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'4xx':>6}{'err':>5}")
+    for label, row in results["endpoints"].items():
+        line = (
+            f"{label:<42}{row['rps']:>9.1f}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+            f"{row['p99_ms']:>9.1f}{row['rejected']:>6}{row['errors']:>5}"
+        )
+        before = (baseline or {}).get("endpoints", {}).get(label)
+        if before:
+            line += f"   rps {change(before['rps'], row['rps'])}, p99 {change(before['p99_ms'], row['p99_ms'])}"
+        print(line)
+    print(f"{'total':<42}{results['total']['rps']:>9.1f}")
+
+
+def change(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="Target a running local server instead of starting one")
+    parser.add_argument("--database-url", help="Database to seed (default: a throwaway SQLite file)")
+    parser.add_argument("--no-seed", action="store_true", help="Use data already in --database-url")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--users", type=int, default=50, help="Concurrent virtual users")
+    parser.add_argument("--staff", type=int, default=10, help="Staff accounts the virtual users share")
+    parser.add_argument("--books", type=int, default=1000)
+    parser.add_argument("--readers", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=1, help="Workers for the started server")
+    parser.add_argument("--rng-seed", type=int, default=1)
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--compare", help="Earlier JSON results to compare against")
+    args = parser.parse_args(argv)
+    if args.url and not (args.database_url or args.no_seed):
+        # The throwaway database would be seeded, but the server at --url never reads it
+        parser.error("--url needs --database-url (the server's database) or --no-seed")
+    return args
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = args.database_url or f"sqlite:///{os.path.join(directory, 'load.db')}"
+        if not args.no_seed:
+            seed(database_url, args.books, args.readers, args.staff)
+
+        server = None
+        base_url = args.url
+        if base_url is None:
+            port = free_port()
+            server = subprocess.Popen(
+                [sys.executable, "-m", "app.server", "--host", "127.0.0.1", "--port", str(port),
+                 "--workers", str(args.workers)],
+                env={**os.environ, "DATABASE_URL": database_url, "SERVER_DRAIN_SECONDS": "0",
+                     "ACCESS_LOG_ENABLED": "false"},
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            wait_ready(port)
+            base_url = f"http://127.0.0.1:{port}"
+        try:
+            results = asyncio.run(drive(args, base_url))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    print_report(results, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,48 +2,107 @@
 Конфигурация pytest и общие фикстуры для всех тестов
 tests/conftest.py
 """
+import logging
+import os
+from contextlib import contextmanager
+from datetime import timedelta
+
+# bcrypt с минимальной стоимостью: хэши в тестах не должны стоить 12 раундов.
+# Задается до импорта приложения, которое читает конфиг при импорте.
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.database import get_db, Base
-from app import models
+from app import models, schemas
+from app.isbn import check_digit13
+from app.auth.jwt_handler import clear_principal_cache, create_access_token, get_password_hash
+from app.middleware.cache import response_cache
+from app.monitoring import sql
+from app.monitoring.access_log import access_log
+from app.monitoring.sql import TRANSACTION_CONTROL
+
+# Журнал доступа пишет JSON в stdout; в тестах записи проверяются через логгер
+access_log.handler = logging.NullHandler()
 
 
 # ============ ТЕСТОВАЯ БАЗА ДАННЫХ ============
 
-# Используем in-memory SQLite для тестов
-SQLALCHEMY_DATABASE_URL = "sqlite://"
+def worker_database_path(filename):
+    """
+    Имя файла БД для текущего воркера pytest-xdist: test.db -> test_gw0.db.
+    Без xdist имя не меняется.
+    """
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    if not worker:
+        return filename
+    stem, extension = os.path.splitext(filename)
+    return f"{stem}_{worker}{extension}"
+
+
+# In-memory SQLite: у каждого процесса (и каждого воркера xdist) своя БД.
+# TEST_DATABASE_URL позволяет прогнать тесты на файловой SQLite - тогда
+# файл тоже свой у каждого воркера.
+SQLALCHEMY_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "sqlite://")
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite:///"):
+    SQLALCHEMY_DATABASE_URL = "sqlite:///" + worker_database_path(SQLALCHEMY_DATABASE_URL[len("sqlite:///"):])
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,  # Используем StaticPool для in-memory БД
+    poolclass=StaticPool,  # Одно соединение на процесс - его транзакцию и откатываем
 )
 
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    # pysqlite сам открывает транзакции и ломает SAVEPOINT - управляем ими через SQLAlchemy
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+# Пароль и хэш общие для всех тестов: bcrypt выполняется один раз за сессию
+TEST_USER_EMAIL = "testuser@example.com"
+TEST_USER_PASSWORD = "testpassword123"
 
 
 # ============ ФИКСТУРЫ ============
 
-@pytest.fixture(scope="function")
-def db_session():
+@pytest.fixture(scope="session")
+def database():
     """
-    Создает чистую сессию базы данных для каждого теста
+    Схема создается один раз за сессию
     """
-    # Создаем таблицы
     Base.metadata.create_all(bind=engine)
-    
-    db = TestingSessionLocal()
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session(database):
+    """
+    Сессия внутри транзакции, которая откатывается после теста.
+    commit() и rollback() обработчиков работают с SAVEPOINT, поэтому
+    изменения видны в рамках теста, но не переживают его.
+    """
+    connection = database.connect()
+    transaction = connection.begin()
+    db = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
     try:
         yield db
     finally:
         db.close()
-        # Очищаем таблицы после теста
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
 
 
 @pytest.fixture(scope="function")
@@ -57,46 +116,60 @@ def client(db_session):
         finally:
             pass
     
+    # Старые модули (test_auth, test_books, test_borrows) задают свою
+    # подмену get_db при импорте; после теста ее нужно вернуть, иначе они
+    # пойдут в настоящую library.db
+    previous_overrides = dict(app.dependency_overrides)
     app.dependency_overrides[get_db] = override_get_db
-    
+
     with TestClient(app) as test_client:
         yield test_client
-    
+
     app.dependency_overrides.clear()
+    app.dependency_overrides.update(previous_overrides)
+    # Пользователи пересоздаются в каждом тесте - кэш токенов не переносим
+    clear_principal_cache()
+    # БД откатывается после каждого теста - закэшированные ответы тоже сбрасываем
+    response_cache.clear()
+
+
+@pytest.fixture(scope="session")
+def password_hash():
+    """
+    Хэш TEST_USER_PASSWORD, посчитанный один раз за сессию
+    """
+    return get_password_hash(TEST_USER_PASSWORD)
 
 
 @pytest.fixture
-def test_user(client):
+def test_user(db_session, password_hash):
     """
-    Создает тестового пользователя
+    Создает тестового пользователя напрямую в БД, без bcrypt на каждый тест
     """
-    user_data = {
-        "email": "testuser@example.com",
-        "password": "testpassword123"
-    }
-    response = client.post("/auth/register", json=user_data)
-    assert response.status_code == 200
+    user = models.User(email=TEST_USER_EMAIL, hashed_password=password_hash, is_active=True)
+    db_session.add(user)
+    db_session.commit()
     return {
-        "email": user_data["email"],
-        "password": user_data["password"],
-        "user_data": response.json()
+        "email": TEST_USER_EMAIL,
+        "password": TEST_USER_PASSWORD,
+        "user_data": schemas.User.model_validate(user).model_dump(mode="json"),
     }
 
 
+@pytest.fixture(scope="session")
+def precomputed_token():
+    """
+    JWT для TEST_USER_EMAIL, выпущенный один раз за сессию
+    """
+    return create_access_token(data={"sub": TEST_USER_EMAIL}, expires_delta=timedelta(hours=1))
+
+
 @pytest.fixture
-def auth_token(client, test_user):
+def auth_token(test_user, precomputed_token):
     """
-    Получает JWT токен для тестового пользователя
+    JWT токен тестового пользователя (без запроса к /auth/login)
     """
-    login_response = client.post(
-        "/auth/login",
-        json={
-            "email": test_user["email"],
-            "password": test_user["password"]
-        }
-    )
-    assert login_response.status_code == 200
-    return login_response.json()["access_token"]
+    return precomputed_token
 
 
 @pytest.fixture
@@ -116,7 +189,7 @@ def test_book(client, auth_headers):
         "title": "Test Book",
         "author": "Test Author",
         "year": 2023,
-        "isbn": "9781234567890",
+        "isbn": "9781234567897",
         "copies": 5,
         "description": "Test description"
     }
@@ -146,10 +219,11 @@ def multiple_books(client, auth_headers):
     """
     books = []
     for i in range(5):
+        first12 = f"978{i+1}{i+1}{i+1}{i+1}{i+1}{i+1}{i+1}{i+1}{i+1}"
         book_data = {
             "title": f"Test Book {i+1}",
             "author": f"Test Author {i+1}",
-            "isbn": f"978{i+1}{i+1}{i+1}{i+1}{i+1}{i+1}{i+1}{i+1}{i+1}{i+1}",
+            "isbn": first12 + check_digit13(first12),
             "copies": 3
         }
         response = client.post("/books/", json=book_data, headers=auth_headers)
@@ -193,6 +267,101 @@ def borrowed_book(client, auth_headers, test_book, test_reader):
     }
 
 
+# ============ БЮДЖЕТЫ SQL-ЗАПРОСОВ ============
+
+# Максимальное количество SQL-выражений на один вызов эндпоинта.
+# Превышение бюджета валит тест, поэтому регрессии в горячих обработчиках
+# (лишние SELECT, N+1) видны сразу. Аутентифицированные эндпоинты включают
+# запрос пользователя в get_current_user.
+QUERY_BUDGETS = {
+    ("GET", "/auth/me"): 1,
+    ("POST", "/auth/register"): 1,
+    ("GET", "/books/"): 1,
+    ("GET", "/books/{book_id}"): 1,
+    ("GET", "/books/isbn/{isbn}"): 1,
+    ("POST", "/books/isbn:lookup"): 1,
+    ("POST", "/books/"): 2,
+    ("GET", "/readers/"): 1,
+    ("GET", "/readers/search"): 2,
+    ("GET", "/readers/{reader_id}/profile"): 2,
+    ("POST", "/readers/"): 2,
+    ("POST", "/borrows/borrow"): 6,
+    ("POST", "/borrows/return"): 3,
+    ("GET", "/borrows/"): 1,
+    ("GET", "/borrows/reader/{reader_id}/borrowed"): 2,
+}
+
+
+class QueryCounter:
+    """
+    Считает SQL-выражения, выполненные на тестовом движке
+    """
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        # SAVEPOINT-ы - артефакт отката тестовой транзакции, а не работа обработчика
+        if not statement.startswith(TRANSACTION_CONTROL):
+            self.statements.append(statement)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def reset(self):
+        self.statements.clear()
+
+
+@pytest.fixture
+def sql_instrumentation():
+    """
+    Включает инструментирование SQL на время теста
+    """
+    sql.enable()
+    yield
+    sql.disable()
+
+
+@pytest.fixture
+def query_counter():
+    """
+    Подключает счетчик SQL-выражений к тестовому движку
+    """
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+
+@pytest.fixture
+def query_budget(query_counter):
+    """
+    Контекстный менеджер, проверяющий бюджет запросов эндпоинта:
+
+        with query_budget("POST", "/borrows/borrow"):
+            client.post("/borrows/borrow", ...)
+    """
+    @contextmanager
+    def check(method, route):
+        budget = QUERY_BUDGETS[(method, route)]
+        query_counter.reset()
+        yield query_counter
+        if query_counter.count > budget:
+            executed = "\n".join(
+                f"  {i}. {statement}" for i, statement in enumerate(query_counter.statements, 1)
+            )
+            pytest.fail(
+                f"{method} {route} executed {query_counter.count} SQL statements, "
+                f"budget is {budget}:\n{executed}",
+                pytrace=False,
+            )
+
+    return check
+
+
 # ============ ВСПОМОГАТЕЛЬНЫЕ ФУНКЦИИ ============
 
 def create_book(client, auth_headers, **kwargs):
@@ -0,0 +1,109 @@
+"""
+Тесты структурированного журнала доступа
+tests/test_access_log.py
+"""
+import json
+import logging
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.main import app
+from app.monitoring import access_log as access_log_module
+from app.monitoring import sql
+from app.monitoring.access_log import AccessLog, AccessLogMiddleware
+
+
+class ListHandler(logging.Handler):
+    """Собирает записи журнала в список"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def access_entries():
+    """
+    Записи журнала доступа, перехваченные до очереди
+    """
+    handler = ListHandler()
+    access_log_module.logger.addHandler(handler)
+    yield lambda: [record.access for record in handler.records]
+    access_log_module.logger.removeHandler(handler)
+
+
+def middleware_of(cls):
+    """Экземпляр middleware в собранном стеке приложения"""
+    layer = app.middleware_stack
+    while layer is not None and not isinstance(layer, cls):
+        layer = getattr(layer, "app", None)
+    return layer
+
+
+class TestAccessLogEntries:
+    """Тесты содержимого записей"""
+
+    def test_entry_fields(self, client, test_book, access_entries, sql_instrumentation):
+        """Запись содержит маршрут, статус, время и размер ответа"""
+        response = client.get(f"/books/{test_book['id']}")
+        entry = access_entries()[-1]
+        assert entry["method"] == "GET"
+        assert entry["route"] == "/books/{book_id}"
+        assert entry["status"] == 200
+        assert entry["duration_ms"] > 0
+        assert entry["db_queries"] == 1
+        assert entry["db_ms"] >= 0
+        assert entry["bytes"] == len(response.content)
+
+    def test_db_time_needs_sql_instrumentation(self, client, test_book, access_entries):
+        """Без инструментирования SQL время БД не измеряется, слушатели не подключаются"""
+        client.get(f"/books/{test_book['id']}")
+        entry = access_entries()[-1]
+        assert entry["db_ms"] is None
+        assert entry["db_queries"] is None
+        assert not event.contains(Engine, "before_cursor_execute", sql._before_cursor_execute)
+
+    def test_auth_time(self, client, auth_headers, access_entries):
+        """Время аутентификации учитывается отдельно"""
+        client.get("/auth/me", headers=auth_headers)
+        assert access_entries()[-1]["auth_ms"] > 0
+
+    def test_sampling_keeps_errors(self, client, access_entries, monkeypatch):
+        """При нулевой выборке успешные ответы пропускаются, ошибки пишутся"""
+        client.get("/healthz")
+        monkeypatch.setattr(middleware_of(AccessLogMiddleware), "sample_percent", 0)
+        client.get("/books/")
+        client.get("/books/999999")
+        entries = access_entries()
+        assert [entry["status"] for entry in entries[1:]] == [404]
+
+    def test_slow_requests_always_logged(self, client, access_entries, monkeypatch):
+        """Медленные запросы пишутся независимо от выборки"""
+        client.get("/healthz")
+        middleware = middleware_of(AccessLogMiddleware)
+        monkeypatch.setattr(middleware, "sample_percent", 0)
+        monkeypatch.setattr(middleware, "slow_ms", 0)
+        client.get("/books/")
+        assert access_entries()[-1]["route"] == "/books/"
+
+
+class TestQueueListener:
+    """Тесты фоновой записи"""
+
+    def test_json_written_by_listener(self):
+        """Запись форматируется в JSON в фоновом потоке"""
+        handler = ListHandler()
+        log = AccessLog(handler)
+        log.start()
+        try:
+            access_log_module.logger.info("access", extra={"access": {"route": "/books/", "status": 200}})
+        finally:
+            log.stop()
+        line = handler.format(handler.records[-1])
+        assert json.loads(line)["route"] == "/books/"
+        assert "ts" in json.loads(line)
@@ -0,0 +1,131 @@
+"""
+Тесты раздачи дашборда и статики из памяти
+tests/test_assets.py
+"""
+import builtins
+import gzip
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.assets import AssetStore
+from app.main import app
+
+
+@pytest.fixture
+def client():
+    """
+    Дашборд и статика не обращаются к БД: клиент без подмены get_db
+    и без тестовой транзакции
+    """
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+class TestDashboard:
+    """Тесты /dashboard"""
+
+    def test_served_from_memory(self, client, monkeypatch):
+        """Запрос дашборда не обращается к файловой системе"""
+        def forbidden_open(*args, **kwargs):
+            raise AssertionError("filesystem access while serving the dashboard")
+
+        monkeypatch.setattr(builtins, "open", forbidden_open)
+        response = client.get("/dashboard", headers={"Accept-Encoding": "identity"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/html")
+        assert response.headers["cache-control"] == "no-cache"
+
+    def test_precompressed_gzip(self, client):
+        """Клиенту с gzip отдается заранее сжатый вариант со своим ETag"""
+        plain = client.get("/dashboard", headers={"Accept-Encoding": "identity"})
+        response = client.get("/dashboard", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"] != plain.headers["etag"]
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.content == plain.content
+
+    def test_not_modified(self, client):
+        """Совпадающий If-None-Match дает 304 без тела"""
+        etag = client.get("/dashboard").headers["etag"]
+        response = client.get("/dashboard", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_stale_etag(self, client):
+        """Устаревший ETag дает полный ответ"""
+        response = client.get("/dashboard", headers={"If-None-Match": '"outdated"'})
+        assert response.status_code == 200
+
+
+class TestStatic:
+    """Тесты /static"""
+
+    def test_long_lived_cache(self, client):
+        """Статика кэшируется браузером"""
+        response = client.get("/static/index.html")
+        assert response.status_code == 200
+        assert response.headers["cache-control"].startswith("public, max-age=")
+
+    def test_missing_file(self, client):
+        """Неизвестный файл - 404"""
+        assert client.get("/static/missing.js").status_code == 404
+
+
+class TestAssetStore:
+    """Тесты AssetStore"""
+
+    @pytest.fixture
+    def asset_dir(self, tmp_path):
+        (tmp_path / "app.js").write_text("console.log('library');\n" * 100)
+        return tmp_path
+
+    def test_variants(self, asset_dir):
+        """Сжатые варианты совпадают с исходным файлом"""
+        store = AssetStore(str(asset_dir))
+        store.load()
+        asset = store.get("app.js")
+        assert gzip.decompress(asset.variants["gzip"]) == asset.variants[None]
+        assert asset.select("gzip, deflate") == "gzip"
+        assert asset.select("") is None
+
+    def test_without_reload_file_changes_are_ignored(self, asset_dir):
+        """Без режима перезагрузки изменения файла не видны"""
+        store = AssetStore(str(asset_dir))
+        store.load()
+        (asset_dir / "app.js").write_text("changed")
+        assert store.get("app.js").variants[None] != b"changed"
+
+    def test_reload_picks_up_changes(self, asset_dir):
+        """В режиме перезагрузки измененный файл перечитывается"""
+        store = AssetStore(str(asset_dir), reload=True)
+        store.load()
+        etag = store.get("app.js").etags[None]
+        path = asset_dir / "app.js"
+        path.write_text("changed")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        asset = store.get("app.js")
+        assert asset.variants[None] == b"changed"
+        assert asset.etags[None] != etag
+
+    def test_reload_rejects_traversal(self, asset_dir):
+        """Пути за пределами каталога не отдаются"""
+        store = AssetStore(str(asset_dir), reload=True)
+        store.load()
+        assert store.get("../etc/passwd") is None
+
+    def test_reload_directory_is_missing(self, asset_dir):
+        """Каталог в режиме перезагрузки - не файл, а не ошибка"""
+        (asset_dir / "js").mkdir()
+        store = AssetStore(str(asset_dir), reload=True)
+        store.load()
+        assert store.get("js") is None
+
+    def test_loads_on_first_request(self, asset_dir):
+        """Без lifespan файлы читаются при первом обращении"""
+        store = AssetStore(str(asset_dir))
+        assert store.get("app.js").variants[None].startswith(b"console.log")
+        assert store.loaded
@@ -5,9 +5,10 @@ from sqlalchemy.orm import sessionmaker
 from app.main import app
 from app.database import get_db, Base
 from app import models  # Import models to register them with Base
+from tests.conftest import worker_database_path
 
 # Create test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+SQLALCHEMY_DATABASE_URL = f"sqlite:///./{worker_database_path('test.db')}"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -0,0 +1,79 @@
+"""
+Тесты пакетного backfill для миграций Alembic
+tests/test_backfill.py
+"""
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), "alembic"))
+
+from backfill import Backfill, PROGRESS_TABLE  # noqa: E402
+
+
+UPDATE_SQL = "UPDATE items SET flag = 1 WHERE id > :start AND id <= :end AND flag = 0"
+
+
+@pytest.fixture
+def connection():
+    """
+    Таблица items с разреженными первичными ключами
+    """
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.connect() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, flag INTEGER NOT NULL)"))
+        conn.execute(
+            text("INSERT INTO items (id, flag) VALUES (:id, 0)"),
+            [{"id": i} for i in range(1, 251) if i % 7],
+        )
+        conn.commit()
+        yield conn
+    engine.dispose()
+
+
+def test_backfill_processes_all_rows_in_chunks(connection):
+    """Все строки обработаны, по одному коммиту на пачку"""
+    result = Backfill("items_flag", "items", UPDATE_SQL, batch_size=50, pause=0).run(connection)
+
+    total = connection.execute(text("SELECT count(*) FROM items")).scalar()
+    assert result.rows == total
+    assert result.chunks == -(-total // 50)
+    assert result.rows_per_second > 0
+    assert connection.execute(text("SELECT count(*) FROM items WHERE flag = 0")).scalar() == 0
+    assert connection.execute(text(f"SELECT count(*) FROM {PROGRESS_TABLE}")).scalar() == 0
+
+
+def test_backfill_resumes_from_checkpoint(connection):
+    """После сбоя backfill продолжает с последней закоммиченной пачки"""
+    seen = []
+
+    def failing_work(conn, start, end):
+        if len(seen) == 2:
+            raise RuntimeError("simulated crash")
+        seen.append((start, end))
+        return conn.execute(text(UPDATE_SQL), {"start": start, "end": end}).rowcount
+
+    with pytest.raises(RuntimeError):
+        Backfill("items_flag", "items", failing_work, batch_size=50, pause=0).run(connection)
+    connection.rollback()
+
+    last_pk = connection.execute(
+        text(f"SELECT last_pk FROM {PROGRESS_TABLE} WHERE name = 'items_flag'")
+    ).scalar()
+    assert last_pk == seen[-1][1]
+
+    result = Backfill("items_flag", "items", UPDATE_SQL, batch_size=50, pause=0).run(connection)
+    assert result.resumed_from == last_pk
+    assert connection.execute(text("SELECT count(*) FROM items WHERE flag = 0")).scalar() == 0
+
+
+def test_backfill_on_empty_table(connection):
+    """Пустая таблица не вызывает ошибок"""
+    connection.execute(text("DELETE FROM items"))
+    connection.commit()
+    result = Backfill("items_flag", "items", UPDATE_SQL, pause=0).run(connection)
+    assert result.rows == 0
+    assert result.chunks == 0
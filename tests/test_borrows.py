@@ -5,9 +5,10 @@ from sqlalchemy.orm import sessionmaker
 from app.main import app
 from app.database import get_db, Base
 from app import models  # Import models to register them with Base
+from tests.conftest import worker_database_path
 
 # Create test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+SQLALCHEMY_DATABASE_URL = f"sqlite:///./{worker_database_path('test.db')}"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -60,7 +61,7 @@ def test_borrowing_business_logic():
             "title": "Test Book for Borrowing",
             "author": "Test Author",
             "year": 2023,
-            "isbn": "978-1111111111",
+            "isbn": "978-1111111113",
             "copies": 2
         },
         headers=headers
@@ -136,7 +137,7 @@ def test_borrowing_business_logic():
             "title": "Test Book 2 for Borrowing",
             "author": "Test Author 2",
             "year": 2023,
-            "isbn": "978-2222222222",
+            "isbn": "978-2222222224",
             "copies": 5
         },
         headers=headers
@@ -150,7 +151,7 @@ def test_borrowing_business_logic():
             "title": "Test Book 3 for Borrowing",
             "author": "Test Author 3",
             "year": 2023,
-            "isbn": "978-3333333333",
+            "isbn": "978-3333333335",
             "copies": 5
         },
         headers=headers
@@ -186,7 +187,7 @@ def test_borrowing_business_logic():
             "title": "Test Book 4 for Borrowing",
             "author": "Test Author 4",
             "year": 2023,
-            "isbn": "978-4444444444",
+            "isbn": "978-4444444446",
             "copies": 5
         },
         headers=headers
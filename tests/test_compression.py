@@ -0,0 +1,137 @@
+"""
+Тесты сжатия ответов
+tests/test_compression.py
+"""
+import gzip
+import zlib
+
+import anyio
+import brotli
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.compression import CompressionMiddleware, choose_encoding
+
+
+def make_client(minimum_size=100):
+    """
+    Минимальное приложение с middleware сжатия
+    """
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+
+    @app.get("/large")
+    def large():
+        return PlainTextResponse("library " * 500)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/image")
+    def image():
+        return PlainTextResponse("x" * 1000, media_type="image/png")
+
+    @app.get("/stream")
+    def stream():
+        def chunks():
+            for i in range(5):
+                yield f"chunk {i} ".encode() * 50
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return TestClient(app)
+
+
+class TestNegotiation:
+    """Тесты выбора кодировки по Accept-Encoding"""
+
+    def test_prefers_brotli(self):
+        assert choose_encoding("gzip, deflate, br") == "br"
+
+    def test_respects_q_values(self):
+        assert choose_encoding("br;q=0.5, gzip") == "gzip"
+        assert choose_encoding("br;q=0, gzip;q=0") is None
+
+    def test_identity_without_header(self):
+        assert choose_encoding("") is None
+        assert choose_encoding("identity") is None
+
+
+class TestCompressionMiddleware:
+    """Тесты middleware сжатия"""
+
+    def test_gzip_large_response(self):
+        response = make_client().get("/large", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "accept-encoding" in response.headers["vary"].lower()
+        assert response.text == "library " * 500
+        assert int(response.headers["content-length"]) < len("library " * 500)
+
+    def test_brotli_large_response(self):
+        response = make_client().get("/large", headers={"Accept-Encoding": "br"})
+        assert response.headers["content-encoding"] == "br"
+        assert response.text == "library " * 500
+
+    def test_small_response_not_compressed(self):
+        response = make_client().get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.text == "ok"
+
+    def test_binary_response_not_compressed(self):
+        response = make_client().get("/image", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+    def test_streaming_response_compressed_per_chunk(self):
+        chunks = [f"chunk {i} ".encode() * 50 for i in range(5)]
+
+        async def streaming_app(scope, receive, send):
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"text/plain")],
+            })
+            for i, chunk in enumerate(chunks):
+                await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+
+        sent = []
+
+        async def collect(message):
+            sent.append(message)
+
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+        anyio.run(CompressionMiddleware(streaming_app, minimum_size=100), scope, None, collect)
+
+        headers = dict(sent[0]["headers"])
+        assert headers[b"content-encoding"] == b"gzip"
+        assert b"content-length" not in headers
+        bodies = [message["body"] for message in sent[1:]]
+        assert len(bodies) == len(chunks)
+        # Каждый чанк сбрасывается и декодируется сразу, без ожидания конца потока
+        decoder = zlib.decompressobj(31)
+        for chunk, body in zip(chunks, bodies):
+            assert decoder.decompress(body) == chunk
+        assert gzip.decompress(b"".join(bodies)) == b"".join(chunks)
+
+    def test_streaming_brotli(self):
+        expected = b"".join(f"chunk {i} ".encode() * 50 for i in range(5))
+        client = make_client()
+        with client.stream("GET", "/stream", headers={"Accept-Encoding": "br"}) as response:
+            raw = b"".join(response.iter_raw())
+        assert brotli.decompress(raw) == expected
+
+    def test_application_compresses_book_list(self, client, auth_headers):
+        for i in range(15):
+            response = client.post(
+                "/books/",
+                json={"title": f"Compressed Book {i}", "author": "Test Author", "description": "x" * 50},
+                headers=auth_headers,
+            )
+            assert response.status_code == 200
+
+        response = client.get("/books/?limit=1", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+        response = client.get("/books/", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(response.json()) == 15
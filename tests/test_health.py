@@ -0,0 +1,74 @@
+"""
+Тесты проб живости и готовности
+tests/test_health.py
+"""
+import time
+
+import anyio
+
+from app.monitoring import health
+from app.monitoring.health import Readiness
+
+
+class TestProbes:
+    """Тесты /healthz и /readyz"""
+
+    def test_liveness(self, client):
+        """Проба живости всегда отвечает 200"""
+        response = client.get("/healthz")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+    def test_ready(self, client):
+        """При доступной БД сервис готов и сообщает состояние пула"""
+        response = client.get("/readyz")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "ready"
+        assert body["database"]["ok"] is True
+        assert "type" in body["pool"]
+
+    def test_draining(self, client, monkeypatch):
+        """Во время остановки готовность сбрасывается без обращения к БД"""
+        monkeypatch.setattr(health.readiness, "draining", True)
+        response = client.get("/readyz")
+        assert response.status_code == 503
+        assert response.json() == {"status": "draining"}
+
+
+class TestReadiness:
+    """Тесты кэширования проверки БД"""
+
+    def test_check_is_cached(self, monkeypatch):
+        """Поток проб выполняет не больше одного SELECT 1 за интервал"""
+        calls = []
+        monkeypatch.setattr(health, "_select_one", lambda: calls.append(1))
+        readiness = Readiness(cache_seconds=60, timeout=1)
+
+        async def probe_many():
+            async with anyio.create_task_group() as tg:
+                for _ in range(20):
+                    tg.start_soon(readiness.check_database)
+
+        anyio.run(probe_many)
+        assert len(calls) == 1
+        assert readiness.db_ok is True
+
+    def test_database_error(self, monkeypatch, caplog):
+        """Ошибка БД делает сервис неготовым; текст ошибки драйвера только в логе"""
+        def broken():
+            raise ConnectionError("connection refused: db.internal:5432")
+
+        monkeypatch.setattr(health, "_select_one", broken)
+        readiness = Readiness(cache_seconds=0, timeout=1)
+        status = anyio.run(readiness.status)
+        assert status["status"] == "unavailable"
+        assert status["database"]["error"] == "SELECT 1 failed"
+        assert "db.internal" in caplog.text
+
+    def test_timeout(self, monkeypatch):
+        """Зависшая БД не подвешивает пробу"""
+        monkeypatch.setattr(health, "_select_one", lambda: time.sleep(0.5))
+        readiness = Readiness(cache_seconds=0, timeout=0.05)
+        assert anyio.run(readiness.check_database) is False
+        assert "timed out" in readiness.db_error
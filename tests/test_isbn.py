@@ -0,0 +1,151 @@
+"""
+Тесты канонических ISBN и поиска книг по ISBN
+tests/test_isbn.py
+"""
+import importlib.util
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.config import ISBN_LOOKUP_MAX_BATCH
+from app.isbn import to_isbn13
+from tests.conftest import create_book
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(os.path.join(ROOT, "alembic"))
+
+from backfill import Backfill  # noqa: E402
+
+
+def load_migration(filename):
+    path = os.path.join(ROOT, "alembic", "versions", filename)
+    spec = importlib.util.spec_from_file_location(filename[:-3], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestCanonicalIsbn:
+    """Приведение ISBN к ISBN-13 без разделителей"""
+
+    @pytest.mark.parametrize("value, canonical", [
+        ("9780306406157", "9780306406157"),
+        ("978-0-306-40615-7", "9780306406157"),
+        ("978 0 306 40615 7", "9780306406157"),
+        ("0-306-40615-2", "9780306406157"),
+        ("080442957x", "9780804429573"),
+        ("979-10-90636-07-1", "9791090636071"),
+    ])
+    def test_valid(self, value, canonical):
+        """ISBN-10 и ISBN-13 в любом написании дают один и тот же ISBN-13"""
+        assert to_isbn13(value) == canonical
+
+    @pytest.mark.parametrize("value, message", [
+        ("978-0-306", "ISBN must be either 10 or 13 characters long"),
+        ("97803064061570", "ISBN must be either 10 or 13 characters long"),
+        ("03064X6152", "Invalid ISBN format"),
+        ("1230306406157", "Invalid ISBN format"),
+        ("９７８０３０６４０６１５７", "Invalid ISBN format"),
+        ("0-306-40615-3", "Invalid ISBN checksum"),
+        ("9780306406158", "Invalid ISBN checksum"),
+    ])
+    def test_invalid(self, value, message):
+        """Неверная длина, формат или контрольная сумма"""
+        with pytest.raises(ValueError, match=message):
+            to_isbn13(value)
+
+
+class TestIsbnStorage:
+    """Книги хранят канонический ISBN"""
+
+    def test_duplicate_in_other_spelling(self, client, auth_headers, test_book):
+        """ISBN-10 существующей книги считается дубликатом"""
+        response = create_book(client, auth_headers, isbn="1-234-56789-X")
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Book with this ISBN already exists"
+
+    def test_update_canonicalizes(self, client, auth_headers, test_book):
+        """PUT тоже проверяет и приводит ISBN"""
+        response = client.put(f"/books/{test_book['id']}", json={"isbn": "0-306-40615-2"}, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["isbn"] == "9780306406157"
+
+        response = client.put(f"/books/{test_book['id']}", json={"isbn": "0-306-40615-3"}, headers=auth_headers)
+        assert response.status_code == 422
+
+
+class TestIsbnLookup:
+    """GET /books/isbn/{isbn} и POST /books/isbn:lookup"""
+
+    @pytest.mark.parametrize("isbn", ["9781234567897", "978-1-234-56789-7", "123456789X"])
+    def test_get_by_isbn(self, client, test_book, isbn):
+        """Книга находится по любому написанию ISBN, без аутентификации"""
+        response = client.get(f"/books/isbn/{isbn}")
+        assert response.status_code == 200
+        assert response.json() == test_book
+
+    def test_get_by_isbn_not_found(self, client, test_book):
+        """Корректный ISBN без книги"""
+        response = client.get("/books/isbn/9780306406157")
+        assert response.status_code == 404
+
+    def test_get_by_invalid_isbn(self, client):
+        """Неверная контрольная сумма - ошибка валидации"""
+        response = client.get("/books/isbn/9780306406158")
+        assert response.status_code == 422
+        assert response.json()["detail"] == "Invalid ISBN checksum"
+
+    def test_lookup(self, client, multiple_books):
+        """Результаты в порядке запроса, включая ненайденные и неверные ISBN"""
+        isbns = [multiple_books[2]["isbn"], "9780306406157", "not an isbn", multiple_books[0]["isbn"]]
+        response = client.post("/books/isbn:lookup", json={"isbns": isbns})
+        assert response.status_code == 200
+        assert response.json() == {"results": [
+            {"isbn": isbns[0], "canonical": isbns[0], "book": multiple_books[2]},
+            {"isbn": "9780306406157", "canonical": "9780306406157", "book": None},
+            {"isbn": "not an isbn", "canonical": None, "book": None},
+            {"isbn": isbns[3], "canonical": isbns[3], "book": multiple_books[0]},
+        ]}
+
+    def test_lookup_batch_limit(self, client):
+        """Размер пакета ограничен ISBN_LOOKUP_MAX_BATCH"""
+        response = client.post("/books/isbn:lookup", json={"isbns": ["9780306406157"] * (ISBN_LOOKUP_MAX_BATCH + 1)})
+        assert response.status_code == 422
+        response = client.post("/books/isbn:lookup", json={"isbns": []})
+        assert response.status_code == 422
+
+
+def test_migration_canonicalizes_existing_isbns():
+    """Миграция переписывает ISBN пачками, пропуская неверные и конфликтующие"""
+    migration = load_migration("8c4f2b7d1e63_canonicalize_book_isbns.py")
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.connect() as conn:
+        conn.execute(text("CREATE TABLE books (id INTEGER PRIMARY KEY, isbn VARCHAR UNIQUE)"))
+        conn.execute(text("INSERT INTO books (id, isbn) VALUES (:id, :isbn)"), [
+            {"id": 1, "isbn": "0-306-40615-2"},
+            {"id": 2, "isbn": "9780306406157"},  # то же, что книга 1
+            {"id": 3, "isbn": "978-1-234-56789-7"},
+            {"id": 4, "isbn": "978-1234567890"},  # неверная контрольная сумма
+            {"id": 5, "isbn": None},
+            {"id": 6, "isbn": "080442957X"},
+            {"id": 7, "isbn": "0-8044-2957-X"},  # то же, что книга 6
+        ])
+        conn.commit()
+
+        result = Backfill("books_isbn_isbn13", "books", migration.canonicalize_chunk, batch_size=3, pause=0).run(conn)
+        isbns = dict(conn.execute(text("SELECT id, isbn FROM books")).all())
+    engine.dispose()
+
+    assert result.rows == 2
+    assert isbns == {
+        1: "0-306-40615-2",
+        2: "9780306406157",
+        3: "9781234567897",
+        4: "978-1234567890",
+        5: None,
+        6: "9780804429573",
+        7: "0-8044-2957-X",
+    }
@@ -0,0 +1,92 @@
+"""
+Тесты эндпоинта /metrics
+tests/test_metrics.py
+"""
+from app.monitoring.metrics import Counter, Histogram, RatePerMinute
+
+
+def sample(text, line_prefix):
+    """Значение первой строки метрики с указанным префиксом"""
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+class TestMetricsEndpoint:
+    """Тесты /metrics"""
+
+    def test_prometheus_format(self, client):
+        """Ответ в текстовом формате Prometheus"""
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+
+    def test_requests_labelled_by_route_template(self, client, test_book):
+        """Запросы группируются по шаблону маршрута, а не по конкретному пути"""
+        before = sample(
+            client.get("/metrics").text,
+            'http_requests_total{method="GET",route="/books/{book_id}",status="200"}',
+        ) or 0
+        client.get(f"/books/{test_book['id']}")
+        client.get(f"/books/{test_book['id']}")
+        text = client.get("/metrics").text
+        assert sample(text, 'http_requests_total{method="GET",route="/books/{book_id}",status="200"}') == before + 2
+        assert f'route="/books/{test_book["id"]}"' not in text
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/books/{book_id}",status="200",le="+Inf"}' in text
+
+    def test_unmatched_route(self, client):
+        """Неизвестные пути не создают новых серий"""
+        client.get("/no-such-page-12345")
+        text = client.get("/metrics").text
+        assert 'route="<unmatched>",status="404"' in text
+        assert "no-such-page-12345" not in text
+
+    def test_runtime_gauges(self, client):
+        """Пул потоков и пул соединений отражаются в метриках"""
+        text = client.get("/metrics").text
+        assert sample(text, "threadpool_max_threads") > 0
+        assert sample(text, "http_requests_in_flight") == 1
+        assert "# TYPE db_pool_checked_out gauge" in text
+
+    def test_business_counters(self, client, auth_headers, borrowed_book):
+        """Выдачи и возвраты считаются"""
+        before = sample(client.get("/metrics").text, "library_returns_total")
+        client.post(
+            "/borrows/return",
+            json={"book_id": borrowed_book["book"]["id"], "reader_id": borrowed_book["reader"]["id"]},
+            headers=auth_headers,
+        )
+        text = client.get("/metrics").text
+        assert sample(text, "library_returns_total") == before + 1
+        assert sample(text, "library_returns_per_minute") >= 1
+        assert sample(text, "library_borrows_per_minute") >= 1
+
+
+class TestPrimitives:
+    """Тесты счетчиков и гистограмм"""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Бакеты гистограммы накопительные"""
+        histogram = Histogram("latency", "test", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.labels("/x").observe(value)
+        lines = histogram.collect()
+        assert 'latency_bucket{route="/x",le="0.1"} 1' in lines
+        assert 'latency_bucket{route="/x",le="1"} 3' in lines
+        assert 'latency_bucket{route="/x",le="+Inf"} 4' in lines
+        assert 'latency_count{route="/x"} 4' in lines
+
+    def test_label_values_are_escaped(self):
+        """Кавычки в значениях меток экранируются"""
+        counter = Counter("events_total", "test", ("name",))
+        counter.labels('say "hi"').inc()
+        assert 'events_total{name="say \\"hi\\""} 1' in counter.collect()
+
+    def test_rate_per_minute(self):
+        """Скользящее окно считает события за минуту"""
+        rate = RatePerMinute("events_per_minute", "test")
+        for _ in range(3):
+            rate.mark()
+        assert "events_per_minute 3" in rate.collect()
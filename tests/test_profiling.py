@@ -0,0 +1,116 @@
+"""
+Тесты профилирования запросов
+tests/test_profiling.py
+"""
+import time
+
+import pytest
+from starlette.middleware import Middleware
+
+from app.main import app
+from app.monitoring import profiling
+from app.monitoring.profiling import ProfileStore, ProfilingMiddleware, SamplingProfiler
+
+
+@pytest.fixture
+def profile_store(tmp_path, monkeypatch):
+    """
+    Хранилище профилей во временном каталоге
+    """
+    store = ProfileStore(str(tmp_path / "profiles"), max_files=3)
+    monkeypatch.setattr(profiling, "profile_store", store)
+    monkeypatch.setattr("app.api.debug.profile_store", store)
+    return store
+
+
+@pytest.fixture
+def profiled_app(profile_store):
+    """
+    Подключает ProfilingMiddleware к приложению на время теста
+    """
+    def install(sample_percent=0):
+        app.user_middleware.insert(
+            0, Middleware(ProfilingMiddleware, store=profile_store, sample_percent=sample_percent)
+        )
+        app.middleware_stack = None
+
+    yield install
+    app.user_middleware[:] = [m for m in app.user_middleware if m.cls is not ProfilingMiddleware]
+    app.middleware_stack = None
+
+
+class TestOnDemandProfiling:
+    """Тесты профилирования по запросу"""
+
+    def test_profile_requested_by_active_user(self, client, auth_headers, profiled_app, test_book):
+        """Активный пользователь получает идентификатор профиля"""
+        profiled_app()
+        response = client.get("/books/?__profile=1", headers=auth_headers)
+        assert response.status_code == 200
+        profile_id = response.headers["x-profile-id"]
+
+        profile = client.get(f"/debug/profiles/{profile_id}", headers=auth_headers)
+        assert profile.status_code == 200
+        listed = client.get("/debug/profiles", headers=auth_headers).json()
+        assert listed[0]["id"] == profile_id
+        assert listed[0]["method"] == "GET"
+
+    def test_header_trigger(self, client, auth_headers, profiled_app):
+        """Профилирование включается и заголовком"""
+        profiled_app()
+        response = client.get("/books/", headers={**auth_headers, "X-Profile": "1"})
+        assert "x-profile-id" in response.headers
+
+    def test_anonymous_request_is_rejected(self, client, profiled_app, profile_store):
+        """Без авторизации профилирование запрещено"""
+        profiled_app()
+        response = client.get("/books/?__profile=1")
+        assert response.status_code == 403
+        assert profile_store.list() == []
+
+    def test_unprofiled_request_untouched(self, client, profiled_app):
+        """Обычные запросы не профилируются"""
+        profiled_app()
+        assert "x-profile-id" not in client.get("/books/").headers
+
+    def test_sampling(self, client, profiled_app, profile_store):
+        """При 100% выборке профилируется каждый запрос"""
+        profiled_app(sample_percent=100)
+        client.get("/books/")
+        client.get("/books/")
+        assert len(profile_store.list()) == 2
+
+    def test_profiles_require_auth(self, client, profile_store):
+        """Просмотр профилей доступен только авторизованным"""
+        assert client.get("/debug/profiles").status_code == 403
+
+
+class TestProfiler:
+    """Тесты профилировщика и хранилища"""
+
+    def test_folded_stacks(self):
+        """Стеки записываются в свернутом формате для flamegraph"""
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        deadline = time.perf_counter() + 0.1
+        while time.perf_counter() < deadline:
+            sum(range(1000))
+        profiler.stop()
+        lines = profiler.folded().splitlines()
+        assert profiler.samples > 0
+        assert any("test_folded_stacks" in line for line in lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        assert ";" in stack and int(count) > 0
+
+    def test_rotation(self, profile_store):
+        """Хранятся только последние max_files профилей"""
+        ids = [profile_store.save("GET", f"/books/{i}", "main 1\n") for i in range(5)]
+        assert [p["id"] for p in profile_store.list()] == ids[:1:-1]
+        assert profile_store.read(ids[0]) is None
+        assert profile_store.read(ids[-1]) == "main 1\n"
+
+    def test_list_keeps_original_path(self, profile_store):
+        """Путь возвращается как есть, с дефисами и двоеточиями"""
+        profile_store.save("POST", "/books/isbn:lookup", "main 1\n")
+        profile_store.save("GET", "/static/app-v2.js", "main 1\n")
+        assert [p["path"] for p in profile_store.list()] == ["/static/app-v2.js", "/books/isbn:lookup"]
@@ -0,0 +1,143 @@
+"""
+Тесты бюджетов SQL-запросов для горячих эндпоинтов
+tests/test_query_budgets.py
+"""
+import pytest
+
+from tests.conftest import QUERY_BUDGETS
+
+
+class TestReadBudgets:
+    """Бюджеты эндпоинтов чтения"""
+
+    def test_current_user(self, client, auth_headers, query_budget):
+        """get_current_user выполняет один запрос"""
+        with query_budget("GET", "/auth/me"):
+            response = client.get("/auth/me", headers=auth_headers)
+        assert response.status_code == 200
+
+    def test_current_user_cached(self, client, auth_headers, query_counter):
+        """Повторный запрос с тем же токеном обходится без обращения к БД"""
+        client.get("/auth/me", headers=auth_headers)
+        query_counter.reset()
+        response = client.get("/auth/me", headers=auth_headers)
+        assert response.status_code == 200
+        assert query_counter.count == 0
+
+    def test_get_books(self, client, multiple_books, query_budget):
+        """Список книг не зависит от количества строк"""
+        with query_budget("GET", "/books/"):
+            response = client.get("/books/")
+        assert response.status_code == 200
+        assert len(response.json()) == len(multiple_books)
+
+    def test_get_book(self, client, test_book, query_budget):
+        """Получение книги по ID"""
+        with query_budget("GET", "/books/{book_id}"):
+            response = client.get(f"/books/{test_book['id']}")
+        assert response.status_code == 200
+
+    def test_get_book_by_isbn(self, client, test_book, query_budget):
+        """Поиск книги по ISBN"""
+        with query_budget("GET", "/books/isbn/{isbn}"):
+            response = client.get("/books/isbn/978-1-234-56789-7")
+        assert response.status_code == 200
+
+    def test_lookup_isbns(self, client, multiple_books, query_budget):
+        """Пакетный поиск по ISBN - один запрос на любой размер пакета"""
+        with query_budget("POST", "/books/isbn:lookup"):
+            response = client.post("/books/isbn:lookup", json={"isbns": [book["isbn"] for book in multiple_books]})
+        assert response.status_code == 200
+
+    def test_get_readers(self, client, test_reader, query_budget):
+        """Список читателей не зависит от количества строк"""
+        with query_budget("GET", "/readers/"):
+            response = client.get("/readers/")
+        assert response.status_code == 200
+
+    def test_search_readers(self, client, auth_headers, test_reader, query_budget):
+        """Поиск читателей"""
+        with query_budget("GET", "/readers/search"):
+            response = client.get("/readers/search", params={"q": "test"}, headers=auth_headers)
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+
+    def test_get_all_borrows(self, client, borrowed_book, query_budget):
+        """Список выдач"""
+        with query_budget("GET", "/borrows/"):
+            response = client.get("/borrows/")
+        assert response.status_code == 200
+
+    def test_reader_borrowed_books(self, client, borrowed_book, query_budget):
+        """Книги на руках у читателя"""
+        reader_id = borrowed_book["reader"]["id"]
+        with query_budget("GET", "/borrows/reader/{reader_id}/borrowed"):
+            response = client.get(f"/borrows/reader/{reader_id}/borrowed")
+        assert response.status_code == 200
+
+
+class TestWriteBudgets:
+    """Бюджеты эндпоинтов записи"""
+
+    def test_register(self, client, query_budget):
+        """Регистрация - одна вставка без предварительной проверки email"""
+        with query_budget("POST", "/auth/register"):
+            response = client.post("/auth/register", json={"email": "budget@example.com", "password": "password123"})
+        assert response.status_code == 200
+
+    def test_create_book(self, client, auth_headers, query_budget):
+        """Создание книги"""
+        with query_budget("POST", "/books/"):
+            response = client.post(
+                "/books/",
+                json={"title": "Budget Book", "author": "Budget Author", "isbn": "9780134685991"},
+                headers=auth_headers,
+            )
+        assert response.status_code == 200
+
+    def test_create_reader(self, client, auth_headers, query_budget):
+        """Создание читателя"""
+        with query_budget("POST", "/readers/"):
+            response = client.post(
+                "/readers/",
+                json={"name": "Budget Reader", "email": "budget@example.com"},
+                headers=auth_headers,
+            )
+        assert response.status_code == 200
+
+    def test_borrow_book(self, client, auth_headers, test_book, test_reader, query_budget):
+        """Выдача книги"""
+        with query_budget("POST", "/borrows/borrow"):
+            response = client.post(
+                "/borrows/borrow",
+                json={"book_id": test_book["id"], "reader_id": test_reader["id"]},
+                headers=auth_headers,
+            )
+        assert response.status_code == 200
+
+    def test_return_book(self, client, auth_headers, borrowed_book, query_budget):
+        """Возврат книги"""
+        with query_budget("POST", "/borrows/return"):
+            response = client.post(
+                "/borrows/return",
+                json={
+                    "book_id": borrowed_book["book"]["id"],
+                    "reader_id": borrowed_book["reader"]["id"],
+                },
+                headers=auth_headers,
+            )
+        assert response.status_code == 200
+
+
+class TestBudgetEnforcement:
+    """Проверка самого механизма бюджетов"""
+
+    def test_exceeded_budget_names_sql(self, client, multiple_books, query_budget, monkeypatch):
+        """Превышение бюджета валит тест и показывает выполненный SQL"""
+        monkeypatch.setitem(QUERY_BUDGETS, ("GET", "/books/"), 0)
+        with pytest.raises(pytest.fail.Exception) as exc_info:
+            with query_budget("GET", "/books/"):
+                client.get("/books/")
+        message = str(exc_info.value)
+        assert "budget is 0" in message
+        assert "FROM books" in message
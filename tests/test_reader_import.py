@@ -0,0 +1,170 @@
+"""
+Тесты массового импорта читателей
+tests/test_reader_import.py
+"""
+import json
+
+import anyio
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app import reader_import
+from app.api import readers
+from tests.conftest import create_reader
+
+NDJSON = {"Content-Type": "application/x-ndjson"}
+CSV = {"Content-Type": "text/csv"}
+
+
+def ndjson(*records):
+    return "\n".join(record if isinstance(record, str) else json.dumps(record) for record in records) + "\n"
+
+
+def import_readers(client, auth_headers, body, content_type, mode=None):
+    params = {"mode": mode} if mode else {}
+    response = client.post(
+        "/readers/bulk", content=body, params=params, headers={**auth_headers, **content_type},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def all_readers(client):
+    return {reader["email"]: reader["name"] for reader in client.get("/readers/").json()}
+
+
+class TestReaderImport:
+    """POST /readers/bulk"""
+
+    def test_ndjson_inserts_and_rejects(self, client, auth_headers):
+        """Корректные строки вставляются, некорректные считаются отклоненными"""
+        body = ndjson(
+            {"name": "Ann Lee", "email": "ann@example.com"},
+            "not json",
+            {"name": "Bob 2", "email": "bob@example.com"},
+            "",
+            [1, 2],
+            {"name": "Cid Moss", "email": "cid@example.com"},
+        )
+        result = import_readers(client, auth_headers, body, NDJSON)
+
+        assert {key: result[key] for key in ("inserted", "updated", "skipped", "rejected")} == {
+            "inserted": 2, "updated": 0, "skipped": 0, "rejected": 3,
+        }
+        assert [error["line"] for error in result["errors"]] == [2, 3, 5]
+        assert result["errors"][0]["error"] == "Invalid JSON"
+        assert result["errors"][1]["error"] == "name: Value error, Name contains invalid characters"
+        assert all_readers(client) == {"ann@example.com": "Ann Lee", "cid@example.com": "Cid Moss"}
+
+    def test_csv(self, client, auth_headers):
+        """CSV с заголовком, колонки в любом порядке, кавычки и CRLF"""
+        body = "\ufeffEmail,Name\r\nann@example.com,\"  Ann O'Neil  \"\r\nbob@example.com\r\ncid@example.com,Cid Moss\r\n"
+        result = import_readers(client, auth_headers, body.encode(), CSV)
+
+        assert (result["inserted"], result["rejected"]) == (2, 1)
+        assert result["errors"] == [{"line": 3, "error": "Expected 2 fields, got 1"}]
+        assert all_readers(client) == {"ann@example.com": "Ann O'Neil", "cid@example.com": "Cid Moss"}
+
+    def test_skip_mode_keeps_existing(self, client, auth_headers, test_reader):
+        """По умолчанию существующие email пропускаются"""
+        body = ndjson(
+            {"name": "Renamed Reader", "email": test_reader["email"]},
+            {"name": "New Reader", "email": "new@example.com"},
+            {"name": "Second Name", "email": "new@example.com"},
+        )
+        result = import_readers(client, auth_headers, body, NDJSON)
+
+        assert (result["inserted"], result["updated"], result["skipped"]) == (1, 0, 2)
+        assert all_readers(client) == {test_reader["email"]: test_reader["name"], "new@example.com": "New Reader"}
+
+    def test_update_mode_renames_existing(self, client, auth_headers, test_reader):
+        """В режиме update существующие читатели получают новое имя, id сохраняется"""
+        body = ndjson(
+            {"name": "Renamed Reader", "email": test_reader["email"]},
+            {"name": "New Reader", "email": "new@example.com"},
+            {"name": "Second Name", "email": "new@example.com"},
+        )
+        result = import_readers(client, auth_headers, body, NDJSON, mode="update")
+
+        assert (result["inserted"], result["updated"], result["skipped"]) == (1, 2, 0)
+        assert all_readers(client) == {test_reader["email"]: "Renamed Reader", "new@example.com": "Second Name"}
+        assert client.get(f"/readers/{test_reader['id']}").json()["name"] == "Renamed Reader"
+
+    def test_chunks(self, client, auth_headers, monkeypatch):
+        """Импорт идет пачками; повторы между пачками обрабатываются базой"""
+        monkeypatch.setattr(readers, "READER_IMPORT_CHUNK_SIZE", 3)
+        records = [{"name": "Chunk Reader", "email": f"reader{i}@example.com"} for i in range(10)]
+        records.append({"name": "Repeated Reader", "email": "reader0@example.com"})
+        result = import_readers(client, auth_headers, ndjson(*records), NDJSON, mode="update")
+
+        assert (result["inserted"], result["updated"], result["rejected"]) == (10, 1, 0)
+        assert len(all_readers(client)) == 10
+        assert all_readers(client)["reader0@example.com"] == "Repeated Reader"
+
+    def test_oversized_line_is_rejected(self, client, auth_headers, monkeypatch):
+        """Слишком длинная строка отклоняется, импорт продолжается"""
+        monkeypatch.setattr(reader_import, "MAX_LINE_BYTES", 100)
+        body = ndjson(
+            {"name": "Ann Lee", "email": "ann@example.com"},
+            {"name": "A" * 200, "email": "long@example.com"},
+            {"name": "Cid Moss", "email": "cid@example.com"},
+        )
+        result = import_readers(client, auth_headers, body, NDJSON)
+
+        assert (result["inserted"], result["rejected"]) == (2, 1)
+        assert result["errors"] == [{"line": 2, "error": "Line is longer than 100 bytes"}]
+
+    def test_oversized_line_across_chunks(self, monkeypatch):
+        """Длинная строка, пришедшая несколькими кусками, пропускается до перевода строки"""
+        monkeypatch.setattr(reader_import, "MAX_LINE_BYTES", 10)
+
+        async def chunks():
+            for chunk in (b"ok\n" + b"x" * 8, b"x" * 8, b"x" * 8, b"\nnext\n", b"y" * 20):
+                yield chunk
+
+        async def read():
+            return [line async for line in reader_import.read_lines(chunks())]
+
+        lines = anyio.run(read)
+        assert lines == [(1, b"ok"), (2, None), (3, b"next"), (4, None)]
+
+    def test_failed_chunk_is_rolled_back_and_reported(self, client, auth_headers, monkeypatch):
+        """Ошибка БД откатывает пачку, ее строки отклоняются, следующие пачки пишутся"""
+        monkeypatch.setattr(readers, "READER_IMPORT_CHUNK_SIZE", 2)
+        write = reader_import.ReaderImport.write
+        calls = []
+
+        def failing_second_write(importer, rows):
+            calls.append(rows)
+            if len(calls) == 2:
+                importer.db.execute(importer.statement, list(rows.values()))
+                raise OperationalError("INSERT INTO readers", {}, Exception("disk I/O error"))
+            return write(importer, rows)
+
+        monkeypatch.setattr(reader_import.ReaderImport, "write", failing_second_write)
+        records = [{"name": "Chunk Reader", "email": f"reader{i}@example.com"} for i in range(6)]
+        result = import_readers(client, auth_headers, ndjson(*records), NDJSON)
+
+        assert (result["inserted"], result["rejected"]) == (4, 2)
+        assert result["errors"] == [{"line": 3, "error": "Lines 3-4 were not written: database error"}]
+        assert sorted(all_readers(client)) == [f"reader{i}@example.com" for i in (0, 1, 4, 5)]
+
+    def test_existing_create_endpoint_still_conflicts(self, client, auth_headers):
+        """Импортированные читатели защищены уникальным email"""
+        import_readers(client, auth_headers, ndjson({"name": "Ann Lee", "email": "ann@example.com"}), NDJSON)
+        response = create_reader(client, auth_headers, name="Ann Lee", email="ann@example.com")
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize("body, content_type, status_code", [
+        ("name,email\n", {"Content-Type": "application/json"}, 415),
+        ("name;email\nAnn Lee;ann@example.com\n", CSV, 400),
+    ])
+    def test_bad_request(self, client, auth_headers, body, content_type, status_code):
+        """Неподдерживаемый тип и CSV без нужных колонок"""
+        response = client.post("/readers/bulk", content=body, headers={**auth_headers, **content_type})
+        assert response.status_code == status_code
+
+    def test_requires_authentication(self, client):
+        """Импорт доступен только сотрудникам"""
+        response = client.post("/readers/bulk", content=ndjson({"name": "Ann Lee", "email": "ann@example.com"}), headers=NDJSON)
+        assert response.status_code in [401, 403]
@@ -0,0 +1,47 @@
+"""
+Тесты карточки читателя
+tests/test_reader_profile.py
+"""
+from tests.conftest import borrow_book, return_book
+
+
+class TestReaderProfile:
+    """GET /readers/{reader_id}/profile"""
+
+    def test_profile_with_open_loans(self, client, auth_headers, test_reader, multiple_books):
+        """Читатель, его открытые выдачи и данные книг, возвращенные книги не попадают"""
+        for book in multiple_books[:3]:
+            assert borrow_book(client, auth_headers, book["id"], test_reader["id"]).status_code == 200
+        assert return_book(client, auth_headers, multiple_books[1]["id"], test_reader["id"]).status_code == 200
+
+        response = client.get(f"/readers/{test_reader['id']}/profile")
+        assert response.status_code == 200
+        profile = response.json()
+        assert {key: profile[key] for key in ("id", "name", "email")} == test_reader
+
+        loans = profile["loans"]
+        assert [loan["book_id"] for loan in loans] == [multiple_books[0]["id"], multiple_books[2]["id"]]
+        assert all(loan["reader_id"] == test_reader["id"] and loan["return_date"] is None for loan in loans)
+        assert loans[0]["book"] == client.get(f"/books/{multiple_books[0]['id']}").json()
+
+    def test_profile_without_loans(self, client, test_reader):
+        """Читатель без выдач"""
+        response = client.get(f"/readers/{test_reader['id']}/profile")
+        assert response.status_code == 200
+        assert response.json()["loans"] == []
+
+    def test_profile_not_found(self, client):
+        """Несуществующий читатель"""
+        response = client.get("/readers/99999/profile")
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Reader not found"
+
+    def test_query_count_does_not_grow_with_loans(self, client, auth_headers, test_reader, multiple_books, query_budget):
+        """Карточка с тремя выдачами строится за два запроса"""
+        for book in multiple_books[:3]:
+            assert borrow_book(client, auth_headers, book["id"], test_reader["id"]).status_code == 200
+
+        with query_budget("GET", "/readers/{reader_id}/profile"):
+            response = client.get(f"/readers/{test_reader['id']}/profile")
+        assert response.status_code == 200
+        assert len(response.json()["loans"]) == 3
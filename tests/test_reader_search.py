@@ -0,0 +1,98 @@
+"""
+Тесты поиска читателей по префиксу имени и email
+tests/test_reader_search.py
+"""
+import pytest
+from sqlalchemy import or_, select
+
+from app import models
+from app.api.readers import READER_COLUMNS, prefix_match
+from tests.conftest import create_reader
+
+
+@pytest.fixture
+def readers(client, auth_headers):
+    """
+    Читатели с похожими именами и адресами
+    """
+    people = [
+        ("John Smith", "jsmith@example.com"),
+        ("Joanna Brown", "joanna@example.com"),
+        ("Mary Johnson", "mary@example.com"),
+        ("Bob Jones", "Jo.Bob@Example.org"),
+        ("Alice Walker", "alice@example.com"),
+    ]
+    created = {}
+    for name, email in people:
+        response = create_reader(client, auth_headers, name=name, email=email)
+        assert response.status_code == 200
+        created[name] = response.json()
+    return created
+
+
+def search(client, auth_headers, **params):
+    response = client.get("/readers/search", params=params, headers=auth_headers)
+    assert response.status_code == 200
+    return [reader["name"] for reader in response.json()]
+
+
+class TestReaderSearch:
+    """GET /readers/search"""
+
+    def test_name_and_email_prefix(self, client, auth_headers, readers):
+        """Совпадение по началу имени или email без учета регистра, по алфавиту имен"""
+        assert search(client, auth_headers, q="JO") == ["Bob Jones", "Joanna Brown", "John Smith"]
+        assert search(client, auth_headers, q="mary@") == ["Mary Johnson"]
+        assert search(client, auth_headers, q="jsm") == ["John Smith"]
+
+    def test_prefix_only(self, client, auth_headers, readers):
+        """Подстрока в середине не совпадает"""
+        assert search(client, auth_headers, q="smith") == []
+        assert search(client, auth_headers, q="example") == []
+
+    def test_wildcards_are_literal(self, client, auth_headers, readers):
+        """Символы % и _ ищутся как есть"""
+        assert search(client, auth_headers, q="j%") == []
+        assert search(client, auth_headers, q="j_") == []
+
+    def test_pagination(self, client, auth_headers, readers):
+        """skip и limit по отсортированным результатам"""
+        assert search(client, auth_headers, q="jo", limit=2) == ["Bob Jones", "Joanna Brown"]
+        assert search(client, auth_headers, q="jo", skip=2, limit=2) == ["John Smith"]
+
+    def test_response_shape(self, client, auth_headers, readers):
+        """Ответ - список schemas.Reader"""
+        response = client.get("/readers/search", params={"q": "alice"}, headers=auth_headers)
+        assert response.json() == [readers["Alice Walker"]]
+
+    @pytest.mark.parametrize("params", [{}, {"q": "j"}, {"q": "  j "}, {"q": "jo", "limit": 101}])
+    def test_invalid_query(self, client, auth_headers, params):
+        """Запрос короче 2 символов или слишком большой limit"""
+        response = client.get("/readers/search", params=params, headers=auth_headers)
+        assert response.status_code == 422
+
+    def test_non_ascii_email(self, client, auth_headers, readers):
+        """В SQLite lower() меняет регистр только у ASCII: остальное ищется как записано"""
+        assert create_reader(client, auth_headers, name="Uwe Roth", email="Üwe@example.com").status_code == 200
+        assert search(client, auth_headers, q="ÜWE") == ["Uwe Roth"]
+
+    @pytest.mark.parametrize("q", ["j\U0010ffff", "\U0010ffff\U0010ffff"])
+    def test_last_code_point(self, client, auth_headers, readers, q):
+        """Префикс, оканчивающийся на U+10FFFF, не ломает верхнюю границу диапазона"""
+        assert search(client, auth_headers, q=q) == []
+
+    def test_requires_authentication(self, client, readers):
+        """Поиск доступен только сотрудникам"""
+        response = client.get("/readers/search", params={"q": "jo"})
+        assert response.status_code in [401, 403]
+
+    def test_uses_indexes(self, db_session):
+        """SQLite выполняет поиск по индексам lower(name) и lower(email)"""
+        query = select(*READER_COLUMNS).where(or_(
+            prefix_match(models.Reader.name, "jo", "sqlite"),
+            prefix_match(models.Reader.email, "jo", "sqlite"),
+        ))
+        compiled = query.compile(db_session.get_bind(), compile_kwargs={"literal_binds": True})
+        plan = " ".join(row[3] for row in db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}"))
+        assert "ix_readers_name_lower" in plan
+        assert "ix_readers_email_lower" in plan
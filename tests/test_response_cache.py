@@ -0,0 +1,128 @@
+"""
+Тесты кэширования публичных GET-эндпоинтов
+tests/test_response_cache.py
+"""
+import time
+
+from app.config import RESPONSE_CACHE_CDN_TTL_SECONDS
+from app.middleware.cache import CachedResponse, ResponseCache, ResponseCacheMiddleware, response_cache
+
+
+class TestCacheHeaders:
+    """Тесты заголовков кэширования"""
+
+    def test_book_list_headers(self, client, test_book):
+        """Список книг кэшируется CDN и браузером"""
+        response = client.get("/books/")
+        assert response.status_code == 200
+        assert f"s-maxage={int(RESPONSE_CACHE_CDN_TTL_SECONDS)}" in response.headers["cache-control"]
+        assert response.headers["cache-control"].startswith("public")
+        assert response.headers["surrogate-key"] == "books:list"
+
+    def test_book_surrogate_key(self, client, test_book):
+        """Книга помечается своим ключом"""
+        response = client.get(f"/books/{test_book['id']}")
+        assert response.headers["surrogate-key"] == f"book:{test_book['id']}"
+
+    def test_errors_are_not_cached(self, client):
+        """404 не получает заголовков кэширования и не сохраняется"""
+        response = client.get("/books/999999")
+        assert response.status_code == 404
+        assert "cache-control" not in response.headers
+        assert len(response_cache) == 0
+
+    def test_private_endpoints_untouched(self, client, auth_headers):
+        """Эндпоинты вне правил не кэшируются"""
+        response = client.get("/auth/me", headers=auth_headers)
+        assert "surrogate-key" not in response.headers
+
+
+class TestInProcessStore:
+    """Тесты хранилища ответов"""
+
+    def test_hit_skips_database(self, client, test_book, query_counter):
+        """Повторный запрос отдается из кэша без обращения к БД"""
+        first = client.get(f"/books/{test_book['id']}")
+        query_counter.reset()
+        second = client.get(f"/books/{test_book['id']}")
+        assert second.headers["x-cache"] == "HIT"
+        assert second.json() == first.json()
+        assert query_counter.count == 0
+        assert response_cache.hit_ratio == 0.5
+
+    def test_update_purges_book_and_list(self, client, auth_headers, test_book):
+        """Изменение книги сбрасывает ее страницу и список"""
+        client.get("/books/")
+        client.get(f"/books/{test_book['id']}")
+        client.put(f"/books/{test_book['id']}", json={"title": "Renamed"}, headers=auth_headers)
+
+        book = client.get(f"/books/{test_book['id']}")
+        books = client.get("/books/")
+        assert "x-cache" not in book.headers
+        assert book.json()["title"] == "Renamed"
+        assert books.json()[0]["title"] == "Renamed"
+
+    def test_create_purges_list(self, client, auth_headers, test_book):
+        """Новая книга сразу видна в списке"""
+        assert len(client.get("/books/").json()) == 1
+        client.post(
+            "/books/",
+            json={"title": "Second Book", "author": "Second Author", "copies": 1},
+            headers=auth_headers,
+        )
+        assert len(client.get("/books/").json()) == 2
+
+    def test_borrow_purges_copies(self, client, auth_headers, test_book, test_reader):
+        """Выдача книги обновляет количество экземпляров в кэше"""
+        copies = client.get(f"/books/{test_book['id']}").json()["copies"]
+        client.post(
+            "/borrows/borrow",
+            json={"book_id": test_book["id"], "reader_id": test_reader["id"]},
+            headers=auth_headers,
+        )
+        assert client.get(f"/books/{test_book['id']}").json()["copies"] == copies - 1
+
+    def test_encodings_cached_separately(self, client, multiple_books):
+        """Сжатый и несжатый варианты хранятся отдельно"""
+        client.get("/books/", headers={"Accept-Encoding": "identity"})
+        response = client.get("/books/", headers={"Accept-Encoding": "gzip"})
+        assert "x-cache" not in response.headers
+
+
+    def test_store_disabled_only_tags(self, client, test_book, monkeypatch):
+        """Без хранилища (несколько воркеров) ответы только помечаются заголовками"""
+        monkeypatch.setattr(ResponseCacheMiddleware, "store", False)
+        client.get(f"/books/{test_book['id']}")
+        response = client.get(f"/books/{test_book['id']}")
+        assert "x-cache" not in response.headers
+        assert response.headers["surrogate-key"] == f"book:{test_book['id']}"
+        assert len(response_cache) == 0
+
+
+class TestResponseCache:
+    """Тесты ResponseCache"""
+
+    def entry(self, *keys, ttl=60):
+        return CachedResponse(time.monotonic() + ttl, 200, [], b"{}", list(keys))
+
+    def test_purge_during_miss_is_not_stored(self):
+        """Ответ, начатый до инвалидации, не попадает в кэш"""
+        cache = ResponseCache()
+        generation = cache.generation
+        cache.purge("book:1")
+        assert cache.set(("/books/1",), self.entry("book:1"), generation) is False
+
+    def test_expired_entry_misses(self):
+        """Просроченная запись не отдается"""
+        cache = ResponseCache()
+        cache.set(("/books/1",), self.entry("book:1", ttl=-1), cache.generation)
+        assert cache.get(("/books/1",)) is None
+
+    def test_lru_eviction(self):
+        """При переполнении вытесняется самая старая запись"""
+        cache = ResponseCache(max_entries=2)
+        for book_id in (1, 2, 3):
+            cache.set((f"/books/{book_id}",), self.entry(f"book:{book_id}"), cache.generation)
+        assert cache.get(("/books/1",)) is None
+        assert cache.get(("/books/3",)) is not None
+        assert cache.purge("book:1") == 0
@@ -0,0 +1,86 @@
+"""
+Тесты быстрой JSON-сериализации ответов
+tests/test_serialization.py
+"""
+from datetime import datetime
+from typing import List
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app import schemas
+from app.main import app
+from app.responses import FastJSONResponse, dump_json, trusted_rows
+
+
+BORROWS = [
+    schemas.Borrow(id=1, book_id=1, reader_id=1, borrow_date=datetime(2024, 3, 1, 9, 15, 30, 123456)),
+    schemas.Borrow(
+        id=2,
+        book_id=2,
+        reader_id=1,
+        borrow_date=datetime(2024, 3, 1, 9, 15),
+        return_date=datetime(2024, 3, 15, 18, 0, 5),
+    ),
+]
+
+
+def test_borrow_datetimes_match_stdlib_response():
+    """Даты в schemas.Borrow сериализуются так же, как через JSONResponse"""
+    content = TypeAdapter(List[schemas.Borrow]).dump_python(BORROWS, mode="json")
+    expected = JSONResponse(content=content).body
+
+    assert FastJSONResponse(content=content).body == expected
+    assert dump_json(BORROWS) == expected
+
+
+def test_single_model_and_non_ascii():
+    """Модель сериализуется напрямую, не-ASCII символы не экранируются"""
+    book = schemas.Book(id=1, title="Война и мир", author="Лев Толстой")
+    expected = JSONResponse(content=book.model_dump(mode="json")).body
+    assert FastJSONResponse(content=book).body == expected
+
+
+def test_mixed_model_list():
+    """Список моделей разных типов сериализуется каждая по своей схеме"""
+    book = schemas.Book(id=1, title="Война и мир", author="Лев Толстой")
+    content = [book, BORROWS[1], {"total": 2}]
+    expected = JSONResponse(content=[book.model_dump(mode="json"), BORROWS[1].model_dump(mode="json"), {"total": 2}]).body
+    assert dump_json(content) == expected
+
+
+def test_application_uses_fast_response(client):
+    """FastJSONResponse - класс ответа по умолчанию"""
+    route = next(route for route in app.routes if getattr(route, "path", None) == "/books/")
+    assert route.response_class is FastJSONResponse
+
+    response = client.get("/books/")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == []
+
+
+def test_trusted_rows_match_response_model_output():
+    """trusted_rows дает те же байты, что и сериализация через response_model"""
+    rows = [borrow.model_dump() for borrow in BORROWS]
+    expected = FastJSONResponse(content=TypeAdapter(List[schemas.Borrow]).dump_python(BORROWS, mode="json")).body
+
+    response = trusted_rows(schemas.Borrow, rows)
+    assert response.body == expected
+    assert response.media_type == "application/json"
+
+
+def test_list_endpoints_keep_openapi_schema(client, multiple_books):
+    """Списки отдаются без повторной валидации, схема OpenAPI не меняется"""
+    schema = client.get("/openapi.json").json()
+    for path, model in (("/books/", "Book"), ("/readers/", "Reader"), ("/borrows/", "Borrow")):
+        content = schema["paths"][path]["get"]["responses"]["200"]["content"]["application/json"]
+        assert content["schema"] == {
+            "type": "array",
+            "items": {"$ref": f"#/components/schemas/{model}"},
+            "title": content["schema"]["title"],
+        }
+
+    books = client.get("/books/").json()
+    assert books == [schemas.Book(**book).model_dump(mode="json") for book in multiple_books]
+    assert list(books[0]) == list(schemas.Book.model_fields)
@@ -0,0 +1,58 @@
+"""
+Тесты инструментирования SQL-запросов
+tests/test_sql_instrumentation.py
+"""
+import logging
+
+from app.monitoring import sql
+
+
+class TestServerTiming:
+    """Тесты заголовка Server-Timing"""
+
+    def test_header_absent_when_disabled(self, client):
+        """Без включения инструментирования заголовка нет"""
+        response = client.get("/books/")
+        assert response.status_code == 200
+        assert "server-timing" not in response.headers
+
+    def test_header_reports_query_count(self, client, sql_instrumentation):
+        """Заголовок содержит время БД и количество запросов"""
+        response = client.get("/books/")
+        assert response.status_code == 200
+        timing = response.headers["server-timing"]
+        assert timing.startswith("db;dur=")
+        assert 'desc="1 queries"' in timing
+
+    def test_runtime_toggle(self, client, auth_headers):
+        """Инструментирование переключается через /debug/sql-instrumentation"""
+        response = client.put("/debug/sql-instrumentation", json={"enabled": True}, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json() == {"enabled": True}
+        assert "server-timing" in client.get("/books/").headers
+
+        response = client.put("/debug/sql-instrumentation", json={"enabled": False}, headers=auth_headers)
+        assert response.json() == {"enabled": False}
+        assert "server-timing" not in client.get("/books/").headers
+
+
+class TestQueryStats:
+    """Тесты агрегации статистики запросов"""
+
+    def test_slowest_and_repeated(self):
+        """Повторяющиеся запросы помечаются как возможный N+1"""
+        stats = sql.QueryStats()
+        for _ in range(6):
+            stats.record("SELECT * FROM borrows WHERE id = ?", 0.001)
+        stats.record("SELECT * FROM books", 0.010)
+
+        assert stats.count == 7
+        assert stats.slowest(1)[0][0] == "SELECT * FROM books"
+        assert stats.repeated(threshold=5) == [("SELECT * FROM borrows WHERE id = ?", 6)]
+
+    def test_n_plus_one_is_logged(self, client, sql_instrumentation, caplog, monkeypatch):
+        """Повторы одного запроса в рамках запроса попадают в лог"""
+        monkeypatch.setattr(sql, "SQL_N_PLUS_ONE_THRESHOLD", 1)
+        with caplog.at_level(logging.WARNING, logger="app.monitoring.sql"):
+            client.get("/books/")
+        assert any("Possible N+1" in record.message for record in caplog.records)
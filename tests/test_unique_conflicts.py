@@ -0,0 +1,100 @@
+"""
+Тесты конфликтов уникальности при создании пользователей, книг и читателей
+tests/test_unique_conflicts.py
+
+Обработчики сначала вставляют строку, а дубликат определяет уникальный
+индекс. Параллельные запросы с одним email или ISBN дают ровно одну
+успешную вставку и 400 для остальных, а не IntegrityError и 500.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app import models, schemas
+from app.api.auth import register_user
+from app.api.books import create_book
+from app.api.readers import create_reader
+from tests.conftest import TEST_USER_EMAIL
+from tests.conftest import create_book as post_book
+from tests.conftest import create_reader as post_reader
+
+THREADS = 6
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """
+    Файловая SQLite, общая для нескольких потоков
+    """
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'conflicts.db'}", connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    models.Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def race(session_factory, handler, payload):
+    """
+    Вызывает обработчик из нескольких потоков одновременно; возвращает коды ответов
+    """
+    barrier = threading.Barrier(THREADS)
+
+    def call(_):
+        with session_factory() as db:
+            barrier.wait()
+            try:
+                handler(payload, db=db)
+            except HTTPException as exc:
+                return exc.status_code, exc.detail
+            return 200, None
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        return list(executor.map(call, range(THREADS)))
+
+
+@pytest.mark.parametrize("handler, payload, model, detail", [
+    (
+        register_user,
+        schemas.UserCreate(email="race@example.com", password="password123"),
+        models.User,
+        "Email already registered",
+    ),
+    (
+        create_reader,
+        schemas.ReaderCreate(name="Race Reader", email="race@example.com"),
+        models.Reader,
+        "Reader with this email already exists",
+    ),
+    (
+        create_book,
+        schemas.BookCreate(title="Race Book", author="Race Author", isbn="9780306406157"),
+        models.Book,
+        "Book with this ISBN already exists",
+    ),
+])
+def test_concurrent_duplicates(session_factory, handler, payload, model, detail):
+    """Одна вставка проходит, остальные получают 400 с прежним сообщением"""
+    results = race(session_factory, handler, payload)
+
+    assert results.count((200, None)) == 1
+    assert results.count((400, detail)) == THREADS - 1
+    with session_factory() as db:
+        assert db.execute(select(func.count()).select_from(model)).scalar() == 1
+
+
+def test_session_usable_after_conflict(client, auth_headers, test_book, test_reader):
+    """После отклоненного дубликата тот же запрос с новыми данными проходит"""
+    assert post_book(client, auth_headers, isbn=test_book["isbn"]).status_code == 400
+    assert post_book(client, auth_headers, isbn="9780306406157").status_code == 200
+
+    assert post_reader(client, auth_headers, email=test_reader["email"]).status_code == 400
+    assert post_reader(client, auth_headers, email="other@example.com").status_code == 200
+
+    response = client.post("/auth/register", json={"email": TEST_USER_EMAIL, "password": "password123"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered"